@@ -1,14 +1,57 @@
 from django.contrib import admin
-from .models import Applicant, JobPosition
+from django.http import FileResponse, Http404
+from django.template.response import TemplateResponse
+from .models import Applicant, ApplicantProfile, JobPosition, ResumeExtraction, Tag
+from .profiling import load_report, report_ids, report_path
+
+class ApplicantProfileInline(admin.StackedInline):
+    model = ApplicantProfile
+    exclude = ('embedding',)
+    can_delete = False
 
 @admin.register(Applicant)
 class ApplicantAdmin(admin.ModelAdmin):
     list_display = ('name', 'email', 'job_position', 'current_stage', 'source', 'created_at')
     search_fields = ('name', 'email')
     list_filter = ('job_position', 'current_stage', 'source', 'created_at')
+    inlines = [ApplicantProfileInline]
 
 @admin.register(JobPosition)
 class JobPositionAdmin(admin.ModelAdmin):
     list_display = ('title', 'is_active', 'created_at')
     search_fields = ('title',)
     list_filter = ('is_active', 'created_at')
+
+@admin.register(Tag)
+class TagAdmin(admin.ModelAdmin):
+    list_display = ('name',)
+    search_fields = ('name',)
+
+@admin.register(ResumeExtraction)
+class ResumeExtractionAdmin(admin.ModelAdmin):
+    list_display = ('applicant', 'resume_file', 'status', 'pages', 'characters', 'extracted_at')
+    list_filter = ('status', 'extracted_at')
+    search_fields = ('resume_file', 'applicant__name', 'applicant__email')
+    raw_id_fields = ('applicant',)
+
+
+# Request profiles (ats.profiling) are files, not models; these views are routed
+# under /admin/profiles/ with admin.site.admin_view(), so only staff see them
+def profile_report_list(request):
+    reports = [report for report in map(load_report, report_ids()) if report is not None]
+    context = {**admin.site.each_context(request), 'title': 'Request profiles', 'reports': reports}
+    return TemplateResponse(request, 'admin/ats/profile_report_list.html', context)
+
+def profile_report_detail(request, report_id):
+    report = load_report(report_id)
+    if report is None:
+        raise Http404('No such profile report.')
+    context = {**admin.site.each_context(request), 'title': f"{report['method']} {report['path']}", 'report': report}
+    return TemplateResponse(request, 'admin/ats/profile_report_detail.html', context)
+
+def profile_report_download(request, report_id):
+    """The raw pstats file, for snakeviz, gprof2dot or pstats.Stats()."""
+    path = report_path(report_id, '.prof')
+    if path is None:
+        raise Http404('No such profile report.')
+    return FileResponse(open(path, 'rb'), as_attachment=True, filename=f'{report_id}.prof')
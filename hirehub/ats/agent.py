@@ -1,11 +1,31 @@
+import asyncio
 import requests
 import os
+import time
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from .metrics import llm_seconds, llm_tokens
 
-def get_ai_match_summary(job, applicant):
-    """
-    Uses the chat API to generate a qualitative summary of why an applicant
-    is a good match for a job.
-    """
+try:
+    import httpx
+except ImportError:  # optional; without it async callers run the requests version in threads
+    httpx = None
+
+API_URL = "https://api.atlascloud.ai/v1/chat/completions"
+
+def summary_timeout():
+    return getattr(settings, 'ATS_AI_SUMMARY_TIMEOUT', 60)
+
+def record_llm_call(started, payload=None):
+    """Observes the latency of a chat API call and the token usage in its JSON `payload`; None if it failed."""
+    llm_seconds.observe(time.perf_counter() - started, outcome='error' if payload is None else 'ok')
+    usage = (payload or {}).get('usage') or {}
+    for kind in ('prompt', 'completion'):
+        if usage.get(f'{kind}_tokens'):
+            llm_tokens.inc(usage[f'{kind}_tokens'], type=kind)
+
+def match_summary_request(job, applicant):
+    """The headers and JSON body of the chat API request summarizing `applicant` for `job`."""
 
     prompt = f"""
     You are an expert technical recruiter. Your task is to evaluate a candidate's resume for a specific job position.
@@ -28,7 +48,6 @@ def get_ai_match_summary(job, applicant):
     Now, provide your analysis.
     """
 
-    url = "https://api.atlascloud.ai/v1/chat/completions"
     headers = {
         "Content-Type": "application/json",
         "Authorization": f"Bearer {os.getenv('ATLASCLOUD_API_KEY')}" # Use environment variables!
@@ -39,12 +58,53 @@ def get_ai_match_summary(job, applicant):
         "temperature": 0.5,
         "max_tokens": 500,
     }
+    return headers, data
 
+def get_ai_match_summary(job, applicant):
+    """
+    Uses the chat API to generate a qualitative summary of why an applicant
+    is a good match for a job.
+    """
+    headers, data = match_summary_request(job, applicant)
+    started = time.perf_counter()
     try:
-        response = requests.post(url, headers=headers, json=data)
+        response = requests.post(API_URL, headers=headers, json=data, timeout=summary_timeout())
         response.raise_for_status() # Raise an exception for bad status codes
-        # Assuming the response json is like {'choices': [{'message': {'content': '...'}}]}
-        content = response.json()['choices'][0]['message']['content']
-        return content
+        payload = response.json()
     except requests.exceptions.RequestException as e:
+        record_llm_call(started)
+        return f"Error communicating with AI agent: {e}"
+    record_llm_call(started, payload)
+    # Assuming the response json is like {'choices': [{'message': {'content': '...'}}]}
+    content = payload['choices'][0]['message']['content']
+    return content
+
+async def aget_ai_match_summary(job, applicant, client=None):
+    """
+    get_ai_match_summary() for async views: the request is awaited with httpx, so the
+    event loop serves other requests meanwhile. `client` is an httpx.AsyncClient to reuse.
+    """
+    if httpx is None:
+        return await sync_to_async(get_ai_match_summary, thread_sensitive=False)(job, applicant)
+    if client is None:
+        async with httpx.AsyncClient(timeout=summary_timeout()) as client:
+            return await aget_ai_match_summary(job, applicant, client)
+
+    headers, data = match_summary_request(job, applicant)
+    started = time.perf_counter()
+    try:
+        response = await client.post(API_URL, headers=headers, json=data)
+        response.raise_for_status()
+    except httpx.HTTPError as e:
+        record_llm_call(started)
         return f"Error communicating with AI agent: {e}"
+    payload = response.json()
+    record_llm_call(started, payload)
+    return payload['choices'][0]['message']['content']
+
+async def aget_ai_match_summaries(job, applicants):
+    """The summaries of `applicants` for `job`, in order, requested concurrently."""
+    if httpx is None:
+        return await asyncio.gather(*(aget_ai_match_summary(job, applicant) for applicant in applicants))
+    async with httpx.AsyncClient(timeout=summary_timeout()) as client:
+        return await asyncio.gather(*(aget_ai_match_summary(job, applicant, client) for applicant in applicants))
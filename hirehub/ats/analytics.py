@@ -0,0 +1,257 @@
+# ats/analytics.py
+import datetime
+from collections import Counter, defaultdict
+from django.db import transaction
+from django.db.models import Case, Count, Max, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce, TruncDate, TruncWeek
+from django.utils import timezone
+from .models import (
+    Applicant, ApplicantStageEvent, ApplicantTombstone, FunnelDailyRollup, HireDailyRollup, RollupRefresh,
+)
+
+# The pipeline in STAGE_CHOICES order; an applicant's furthest stage is the highest one
+# they have entered. Rejected is an exit, not progress.
+PIPELINE_STAGES = [stage for stage, _ in Applicant.STAGE_CHOICES if stage != 'Rejected']
+# Source effectiveness counts applicants who got at least this far
+INTERVIEW_STAGE = 'Interview Stage'
+OFFER_STAGE = 'Offer Extended'
+HIRED_STAGE = 'Hired'
+
+# Incremental refreshes re-read this much before the previous run started, so rows
+# written by transactions that committed late are not missed; recomputing is idempotent
+REFRESH_OVERLAP = datetime.timedelta(minutes=5)
+# Longest span of days recomputed in one transaction
+REFRESH_BATCH_DAYS = 31
+
+
+def day_start(day):
+    return timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
+
+
+def applicant_days(queryset, field='created_at'):
+    return set(queryset.annotate(day=TruncDate(field)).values_list('day', flat=True).distinct())
+
+
+def touched_days(since):
+    """Application days of the applicants written or deleted since `since`."""
+    days = applicant_days(Applicant.objects.filter(updated_at__gte=since))
+    days |= applicant_days(
+        ApplicantTombstone.objects.filter(deleted_at__gte=since, applicant_created_at__isnull=False),
+        'applicant_created_at',
+    )
+    return days
+
+
+def all_days():
+    """Every application day, plus rolled-up days that may no longer have applicants."""
+    days = applicant_days(Applicant.objects.all())
+    days.update(FunnelDailyRollup.objects.values_list('day', flat=True).distinct())
+    days.update(HireDailyRollup.objects.values_list('day', flat=True).distinct())
+    return days
+
+
+def batch_days(days):
+    """Sorted days split into runs spanning at most REFRESH_BATCH_DAYS."""
+    batch = []
+    for day in sorted(days):
+        if batch and (day - batch[0]).days >= REFRESH_BATCH_DAYS:
+            yield batch
+            batch = []
+        batch.append(day)
+    if batch:
+        yield batch
+
+
+def rollup_days(days):
+    """Recomputes the funnel and hire rollups of the given days from applicants and stage events."""
+    applicants = (
+        Applicant.objects
+        .filter(created_at__gte=day_start(days[0]), created_at__lt=day_start(days[-1] + datetime.timedelta(days=1)))
+        .annotate(day=TruncDate('created_at'))
+        .filter(day__in=days)
+    )
+    rank = Case(*[When(to_stage=stage, then=Value(number)) for number, stage in enumerate(PIPELINE_STAGES)])
+    furthest_rank = (
+        ApplicantStageEvent.objects.filter(applicant=OuterRef('pk'))
+        .values('applicant').annotate(rank=Max(rank)).values('rank')
+    )
+    funnel = (
+        applicants.annotate(furthest=Coalesce(Subquery(furthest_rank), Value(0)))
+        .values_list('day', 'job_position_id', 'source', 'furthest')
+        .annotate(applicants=Count('pk'))
+        .order_by()
+    )
+    first_hire = (
+        ApplicantStageEvent.objects.filter(applicant=OuterRef('pk'), to_stage=HIRED_STAGE).order_by('at').values('at')[:1]
+    )
+    hires = Counter(
+        (day, job_position_id, source, max((hired_at - created_at).days, 0))
+        for day, job_position_id, source, created_at, hired_at in (
+            applicants.annotate(hired_at=Subquery(first_hire)).filter(hired_at__isnull=False)
+            .values_list('day', 'job_position_id', 'source', 'created_at', 'hired_at')
+        )
+    )
+
+    with transaction.atomic():
+        FunnelDailyRollup.objects.filter(day__in=days).delete()
+        HireDailyRollup.objects.filter(day__in=days).delete()
+        FunnelDailyRollup.objects.bulk_create([
+            FunnelDailyRollup(
+                day=day, job_position_id=job_position_id, source=source,
+                furthest_stage=PIPELINE_STAGES[furthest], applicants=count,
+            )
+            for day, job_position_id, source, furthest, count in funnel
+        ])
+        HireDailyRollup.objects.bulk_create([
+            HireDailyRollup(day=day, job_position_id=job_position_id, source=source, days_to_hire=days_to_hire, hires=count)
+            for (day, job_position_id, source, days_to_hire), count in hires.items()
+        ])
+
+
+def refresh_rollups(full=False, since=None, progress=None):
+    """
+    Brings the daily rollups up to date. Incrementally, only the application days of
+    applicants written or deleted since the previous run (or since `since`) are
+    recomputed; the first run and full=True recompute every day. `progress` is
+    called with (days done, days total). Returns the number of days recomputed.
+    """
+    started = timezone.now()
+    previous = RollupRefresh.objects.first()
+    if since is None and previous is not None:
+        since = previous.started_at - REFRESH_OVERLAP
+    full = full or since is None
+    days = all_days() if full else touched_days(since)
+
+    done = 0
+    for batch in batch_days(days):
+        rollup_days(batch)
+        done += len(batch)
+        if progress:
+            progress(done, len(days))
+    RollupRefresh.objects.create(started_at=started, full=full, days=len(days))
+    return len(days)
+
+
+def median_from_histogram(histogram):
+    """Median of the values in a {value: count} histogram; None when it is empty."""
+    total = sum(histogram.values())
+    if not total:
+        return None
+    # Positions of the middle value (odd total) or two values (even) when expanded in order
+    middle_positions = sorted({(total - 1) // 2, total // 2})
+    middle, seen = [], 0
+    for value in sorted(histogram):
+        count = histogram[value]
+        middle += [value for position in middle_positions if seen <= position < seen + count]
+        seen += count
+    return sum(middle) / len(middle)
+
+
+def reached_counts(by_furthest):
+    """{furthest stage: applicants} -> [(stage, applicants who reached at least that stage)]."""
+    reached, running = [], 0
+    for stage in reversed(PIPELINE_STAGES):
+        running += by_furthest.get(stage, 0)
+        reached.append((stage, running))
+    return reached[::-1]
+
+
+def pipeline_analytics_queries(start, end, job_position_id=None, source=None):
+    """The grouped rollup queries behind pipeline_analytics(): funnel, hires and weekly volume."""
+    filters = {'day__gte': start, 'day__lte': end}
+    if job_position_id:
+        filters['job_position_id'] = job_position_id
+    if source:
+        filters['source'] = source
+    return (
+        FunnelDailyRollup.objects.filter(**filters)
+        .values_list('source', 'furthest_stage').annotate(applicants=Sum('applicants')).order_by(),
+        HireDailyRollup.objects.filter(**filters)
+        .values_list('source', 'days_to_hire').annotate(hires=Sum('hires')).order_by(),
+        FunnelDailyRollup.objects.filter(**filters)
+        .annotate(week=TruncWeek('day'))
+        .values_list('job_position_id', 'job_position__title', 'week')
+        .annotate(applicants=Sum('applicants'))
+        .order_by('job_position_id', 'week'),
+    )
+
+
+def pipeline_analytics(start, end, job_position_id=None, source=None):
+    """
+    Funnel conversion, time to hire, source effectiveness and weekly volume per
+    position for the applicants who applied between `start` and `end` (dates,
+    inclusive), read from the daily rollups with a few grouped queries.
+    """
+    rows = [list(query) for query in pipeline_analytics_queries(start, end, job_position_id, source)]
+    return pipeline_report(start, end, *rows)
+
+
+async def apipeline_analytics(start, end, job_position_id=None, source=None):
+    """pipeline_analytics() for async views."""
+    rows = []
+    for query in pipeline_analytics_queries(start, end, job_position_id, source):
+        rows.append([row async for row in query])
+    return pipeline_report(start, end, *rows)
+
+
+def pipeline_report(start, end, funnel_rows, hire_rows, weekly_rows):
+    """Builds the pipeline_analytics() report from the rows of pipeline_analytics_queries()."""
+    by_source = defaultdict(dict)
+    for row_source, stage, count in funnel_rows:
+        by_source[row_source][stage] = count
+    hire_days = defaultdict(Counter)
+    for row_source, days_to_hire, count in hire_rows:
+        hire_days[row_source][days_to_hire] += count
+
+    by_furthest = Counter()
+    for counts in by_source.values():
+        by_furthest.update(counts)
+    reached = reached_counts(by_furthest)
+    applied = reached[0][1]
+    funnel = []
+    previous = applied
+    for stage, count in reached:
+        funnel.append({
+            'stage': stage,
+            'applicants': count,
+            'conversion': round(count / applied, 4) if applied else None,
+            'step_conversion': round(count / previous, 4) if previous else None,
+        })
+        previous = count
+
+    all_hire_days = Counter()
+    for counts in hire_days.values():
+        all_hire_days.update(counts)
+
+    sources = []
+    for value, label in Applicant.SOURCE_CHOICES:
+        source_reached = dict(reached_counts(by_source.get(value, {})))
+        applicants = source_reached[PIPELINE_STAGES[0]]
+        hired = source_reached[HIRED_STAGE]
+        sources.append({
+            'source': value,
+            'label': label,
+            'applicants': applicants,
+            'interviewed': source_reached[INTERVIEW_STAGE],
+            'offered': source_reached[OFFER_STAGE],
+            'hired': hired,
+            'hire_rate': round(hired / applicants, 4) if applicants else None,
+            'median_days_to_hire': median_from_histogram(hire_days.get(value, {})),
+        })
+
+    positions = {}
+    for job_position_id, title, week, count in weekly_rows:
+        position = positions.setdefault(job_position_id, {'job_position': job_position_id, 'title': title, 'weeks': []})
+        position['weeks'].append({'week': week, 'applicants': count})
+
+    return {
+        'start': start,
+        'end': end,
+        'funnel': funnel,
+        'time_to_hire': {
+            'hires': sum(all_hire_days.values()),
+            'median_days': median_from_histogram(all_hire_days),
+        },
+        'sources': sources,
+        'positions': list(positions.values()),
+    }
@@ -1,4 +1,6 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_migrate
 
 
 class AtsConfig(AppConfig):
@@ -7,3 +9,7 @@ class AtsConfig(AppConfig):
 
     def ready(self):
         import ats.signals
+        from ats.metrics import install_query_wrapper
+        from ats.filters import verify_search_triggers
+        connection_created.connect(install_query_wrapper)
+        post_migrate.connect(verify_search_triggers, sender=self)
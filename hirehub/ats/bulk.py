@@ -0,0 +1,300 @@
+# ats/bulk.py
+from collections import Counter
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Count, DateTimeField, Value
+from django.utils import timezone
+from .embeddings import generate_applicant_embedding_text, get_embeddings
+from .facets import invalidate_applicant_facets
+from .models import Applicant, ApplicantProfile, ApplicantStageEvent
+from .tags import sync_tags_many
+
+# Rows per INSERT/UPDATE statement
+BULK_CHUNK_SIZE = getattr(settings, 'ATS_BULK_CHUNK_SIZE', 500)
+
+
+def embed_applicants(applicants):
+    """Fills in the embeddings of applicants with resume text using a single encode call."""
+    applicants = [applicant for applicant in applicants if applicant.resume_text]
+    if not applicants:
+        return
+    vectors = get_embeddings(generate_applicant_embedding_text(applicant) for applicant in applicants)
+    for applicant, vector in zip(applicants, vectors):
+        applicant.embedding = vector
+    ApplicantProfile.objects.bulk_update(
+        [applicant.get_profile() for applicant in applicants], ['embedding'], batch_size=BULK_CHUNK_SIZE
+    )
+
+
+def record_stage_events(applicants, at):
+    """
+    Appends an ApplicantStageEvent for each saved applicant whose current_stage differs
+    from the stored one (Applicant._stored_stage): new applicants get their starting
+    stage at created_at, changed ones the move at `at`. For bulk writes, which send no
+    post_save; see ats.signals.record_stage_event.
+    """
+    events = [
+        ApplicantStageEvent(
+            applicant_id=applicant.pk,
+            from_stage=applicant._stored_stage or '',
+            to_stage=applicant.current_stage,
+            at=applicant.created_at if applicant._stored_stage is None else at,
+        )
+        for applicant in applicants if applicant.current_stage != applicant._stored_stage
+    ]
+    ApplicantStageEvent.objects.bulk_create(events, batch_size=BULK_CHUNK_SIZE)
+    for applicant in applicants:
+        applicant._stored_stage = applicant.current_stage
+
+
+def create_profiles(applicants):
+    """Inserts the ApplicantProfile rows of just bulk-created applicants."""
+    profiles = [applicant.get_profile() for applicant in applicants]
+    ApplicantProfile.objects.bulk_create(profiles, batch_size=BULK_CHUNK_SIZE)
+
+
+def update_profiles(applicants, rows):
+    """Writes the profile fields named in `rows` (the changed names of each applicant) with bulk_update."""
+    fields = set()
+    profiles = []
+    for applicant, names in zip(applicants, rows):
+        changed = set(names) & set(Applicant.PROFILE_FIELDS)
+        if changed:
+            fields.update(changed)
+            profiles.append(applicant.get_profile())
+    if profiles:
+        ApplicantProfile.objects.bulk_update(profiles, sorted(fields), batch_size=BULK_CHUNK_SIZE)
+
+
+def bulk_create_applicants(rows):
+    """
+    Inserts applicants from validated serializer data in chunks. bulk_create sends no
+    post_save, so the work of the ats.signals receivers is done here once per batch.
+    """
+    applicants = [Applicant(**attrs) for attrs in rows]
+    with transaction.atomic():
+        Applicant.objects.bulk_create(applicants, batch_size=BULK_CHUNK_SIZE)
+        create_profiles(applicants)
+        record_stage_events(applicants, timezone.now())
+        sync_tags_many(applicants)
+        embed_applicants(applicants)
+    invalidate_applicant_facets()
+    return applicants
+
+
+def bulk_update_applicants(applicants, rows):
+    """
+    Applies validated partial-update data to the matching applicants and writes them
+    with bulk_update in chunks. Tags and embeddings are refreshed only for the rows
+    that changed `tags` or `resume_text`.
+    """
+    now = timezone.now()
+    fields = {'updated_at', 'last_status_update'}  # auto_now is not applied by bulk_update
+    for applicant, attrs in zip(applicants, rows):
+        for name, value in attrs.items():
+            setattr(applicant, name, value)
+        applicant.updated_at = applicant.last_status_update = now
+        fields.update(attrs)
+
+    with transaction.atomic():
+        Applicant.objects.bulk_update(
+            applicants, sorted(fields - set(Applicant.PROFILE_FIELDS)), batch_size=BULK_CHUNK_SIZE
+        )
+        update_profiles(applicants, rows)
+        record_stage_events(applicants, now)
+        sync_tags_many([applicant for applicant, attrs in zip(applicants, rows) if 'tags' in attrs])
+        embed_applicants([applicant for applicant, attrs in zip(applicants, rows) if 'resume_text' in attrs])
+    invalidate_applicant_facets()
+    return applicants
+
+
+def applicant_key(attrs):
+    """The (email, job_position id) pair an applicant row is unique on."""
+    job_position = attrs.get('job_position')
+    return attrs.get('email'), job_position.pk if job_position is not None else None
+
+
+def field_value(source, name):
+    """A comparable value of an Applicant field from an instance or from validated data."""
+    if name in Applicant.PROFILE_FIELDS:
+        return source.get(name) if isinstance(source, dict) else getattr(source, name)
+    field = Applicant._meta.get_field(name)
+    if not isinstance(source, dict):
+        return getattr(source, field.attname) # The FK id, without loading the relation
+    value = source.get(name)
+    return getattr(value, 'pk', value) if field.is_relation else value
+
+
+def upsert_applicants(rows, embed=True):
+    """
+    Idempotent ingest of validated serializer data keyed on (email, job_position).
+
+    Existing applicants are read in one query and compared first: rows that change
+    nothing are skipped, so replaying an import writes nothing. The rest go through
+    bulk_create(update_conflicts=True), i.e. INSERT ... ON CONFLICT DO UPDATE, which
+    overwrites only the fields some row changed and also absorbs rows inserted
+    concurrently. Rows without a position cannot conflict in the database (NULLs are
+    distinct), so their changes to existing applicants use bulk_update instead.
+
+    With embed=False, embeddings are not computed; those of applicants whose resume
+    text changed are cleared for a later embed_missing_applicants() pass.
+
+    Returns (applicant, outcome) pairs in input order, outcome being 'created',
+    'updated' or 'unchanged'.
+    """
+    emails = {attrs['email'] for attrs in rows}
+    existing = {
+        (applicant.email, applicant.job_position_id): applicant
+        for applicant in Applicant.objects.filter(email__in=emails)
+        .select_related('profile').defer('profile__embedding').order_by('id')
+    }
+
+    results, upserts, position_less_updates = [], [], []
+    changed_fields = set()
+    for attrs in rows:
+        current = existing.get(applicant_key(attrs))
+        if current is None:
+            applicant = Applicant(**attrs)
+            upserts.append(applicant)
+            results.append([applicant, 'created', set(attrs), None])
+            continue
+
+        changes = {
+            name: value for name, value in attrs.items()
+            if field_value(current, name) != field_value(attrs, name)
+        }
+        if not changes:
+            results.append([current, 'unchanged', set(), None])
+            continue
+        changed_fields.update(changes)
+        for name, value in changes.items():
+            setattr(current, name, value)
+        if current.job_position_id is None:
+            position_less_updates.append(current)
+            results.append([current, 'updated', set(changes), None])
+        else:
+            # A fresh instance carrying the merged values; ON CONFLICT finds the row
+            applicant = Applicant(**{
+                field.attname: getattr(current, field.attname)
+                for field in Applicant._meta.concrete_fields
+                if not field.primary_key and field.attname in current.__dict__
+            })
+            applicant._stored_stage = current._stored_stage
+            upserts.append(applicant)
+            # Its profile (already changed above) is attached once the upsert gives it a pk
+            results.append([applicant, 'updated', set(changes), current.profile])
+
+    timestamps = {'updated_at', 'last_status_update'}
+    # Profile fields are written to ApplicantProfile; changing one still bumps the timestamps
+    changed_fields -= set(Applicant.PROFILE_FIELDS)
+    now = timezone.now()
+    with transaction.atomic():
+        if upserts:
+            Applicant.objects.bulk_create(
+                upserts,
+                batch_size=BULK_CHUNK_SIZE,
+                update_conflicts=True,
+                unique_fields=['email', 'job_position'],
+                update_fields=sorted(changed_fields | timestamps) if changed_fields else sorted(timestamps),
+            )
+        if position_less_updates:
+            for applicant in position_less_updates:
+                applicant.updated_at = applicant.last_status_update = now
+            Applicant.objects.bulk_update(
+                position_less_updates, sorted(changed_fields | timestamps), batch_size=BULK_CHUNK_SIZE
+            )
+
+        for result in results:
+            if result[3] is not None:
+                result[0].profile = result[3]
+        written = [(applicant, outcome, fields) for applicant, outcome, fields, _ in results if outcome != 'unchanged']
+        create_profiles([applicant for applicant, outcome, _ in written if outcome == 'created'])
+        updated = [(applicant, fields) for applicant, outcome, fields in written if outcome == 'updated']
+        update_profiles([applicant for applicant, _ in updated], [fields for _, fields in updated])
+        record_stage_events([applicant for applicant, _, _ in written], now)
+        sync_tags_many([applicant for applicant, _, fields in written if 'tags' in fields])
+        if embed:
+            embed_applicants([applicant for applicant, _, fields in written if 'resume_text' in fields])
+        else:
+            stale = [
+                applicant.pk for applicant, outcome, fields in written
+                if outcome == 'updated' and 'resume_text' in fields
+            ]
+            ApplicantProfile.objects.filter(pk__in=stale).update(embedding=None)
+    if upserts or position_less_updates:
+        invalidate_applicant_facets()
+    return [(applicant, outcome) for applicant, outcome, _, _ in results]
+
+
+def embed_missing_applicants(batch_size=256, progress=None):
+    """
+    Batched embedding pass for applicants with resume text but no embedding, e.g. after
+    an import. Walks the table by id, one encode call per batch; `progress` is called
+    with the running count. Safe to interrupt and re-run. Returns the number embedded.
+    """
+    done, last_id = 0, 0
+    pending = (
+        Applicant.objects.filter(profile__embedding__isnull=True).exclude(profile__resume_text='')
+        .select_related('profile').only('id', 'profile__resume_text')
+    )
+    while True:
+        batch = list(pending.filter(id__gt=last_id).order_by('id')[:batch_size])
+        if not batch:
+            return done
+        embed_applicants(batch)
+        done += len(batch)
+        last_id = batch[-1].pk
+        if progress:
+            progress(done)
+
+
+def transition_applicants(queryset, stage, dry_run=False):
+    """
+    Moves every applicant in `queryset` whose current stage allows it (see
+    Applicant.STAGE_TRANSITIONS) to `stage`, without loading models or sending save
+    signals. The selection is locked first (SELECT ... FOR UPDATE of the ids and
+    stages), so no concurrent save or transition can change a stage before it is
+    recorded; then each BULK_CHUNK_SIZE moving rows get one INSERT ... SELECT of
+    their stage events and one UPDATE. Returns the counts of the selection:
+    {'matched': 12, 'updated': 9, 'unchanged': 2, 'not_allowed': {'Hired': 1}}
+    """
+    sources = [source for source, targets in Applicant.STAGE_TRANSITIONS.items() if stage in targets]
+    if dry_run:
+        by_stage = dict(
+            queryset.order_by().values_list('current_stage').annotate(count=Count('pk', distinct=True))
+        )
+        updated = sum(count for source, count in by_stage.items() if source in sources)
+    else:
+        with transaction.atomic():
+            # By id, in id order: the selection may join tags, and lockers must not deadlock
+            locked = list(
+                Applicant.objects.filter(pk__in=queryset.values('pk')).order_by('pk')
+                .select_for_update().values_list('pk', 'current_stage')
+            )
+            by_stage = dict(Counter(current for _, current in locked))
+            moving_ids = [pk for pk, current in locked if current in sources]
+            now = timezone.now()
+            for start in range(0, len(moving_ids), BULK_CHUNK_SIZE):
+                moving = Applicant.objects.filter(pk__in=moving_ids[start:start + BULK_CHUNK_SIZE])
+                events_sql, events_params = moving.order_by().values_list(
+                    'pk', 'current_stage', Value(stage), Value(now, output_field=DateTimeField())
+                ).query.sql_with_params()
+                with connections[queryset.db].cursor() as cursor:
+                    cursor.execute(
+                        f'INSERT INTO {ApplicantStageEvent._meta.db_table} (applicant_id, from_stage, to_stage, at) '
+                        f'{events_sql}',
+                        events_params,
+                    )
+                # update() skips auto_now, so the delta-sync and ETag timestamps are set here
+                moving.update(current_stage=stage, updated_at=now, last_status_update=now)
+            updated = len(moving_ids)
+    if updated and not dry_run:
+        invalidate_applicant_facets()
+    return {
+        'matched': sum(by_stage.values()),
+        'updated': updated,
+        'unchanged': by_stage.get(stage, 0),
+        'not_allowed': {
+            source: count for source, count in sorted(by_stage.items()) if source != stage and source not in sources
+        },
+    }
@@ -1,11 +1,21 @@
 from sentence_transformers import SentenceTransformer
+from .metrics import embedding_batch_size, embedding_seconds
 
 # Load the model only once when the application starts
 # This model creates 384-dimensional vectors
 model = SentenceTransformer('all-MiniLM-L6-v2')
 
 def get_embedding(text):
-    return model.encode(text)
+    embedding_batch_size.observe(1)
+    with embedding_seconds.time():
+        return model.encode(text)
+
+def get_embeddings(texts):
+    """Encodes many texts with one call, letting the model batch them internally."""
+    texts = list(texts)
+    embedding_batch_size.observe(len(texts))
+    with embedding_seconds.time():
+        return list(model.encode(texts))
 
 def generate_job_embedding_text(job_position):
     """Combines the most relevant fields for a job into a single string."""
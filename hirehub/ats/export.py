@@ -0,0 +1,108 @@
+# ats/export.py
+import csv
+import datetime
+import json
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+# Export column -> ORM path read with values_list(); the default column order
+EXPORT_COLUMNS = {
+    'id': 'id',
+    'name': 'name',
+    'email': 'email',
+    'phone': 'phone',
+    'job_position': 'job_position_id',
+    'job_position_title': 'job_position__title',
+    'current_stage': 'current_stage',
+    'source': 'source',
+    'tags': 'tags',
+    'resume_file': 'resume_file',
+    'resume_text': 'profile__resume_text',
+    'interviewers': 'interviewers',
+    'interview_dates': 'interview_dates',
+    'comments_ta': 'profile__comments_ta',
+    'comments_initial_call': 'profile__comments_initial_call',
+    'comments_evaluation': 'profile__comments_evaluation',
+    'overall_feedback': 'profile__overall_feedback',
+    'final_decision': 'final_decision',
+    'created_at': 'created_at',
+    'updated_at': 'updated_at',
+    'last_status_update': 'last_status_update',
+}
+
+# Rows fetched per database round trip, and rows per chunk written to the client
+EXPORT_CHUNK_SIZE = getattr(settings, 'ATS_EXPORT_CHUNK_SIZE', 2000)
+EXPORT_WRITE_ROWS = 500
+
+# Leading characters that make a spreadsheet read a CSV cell as a formula
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def resolve_export_columns(requested):
+    """Validates a ?fields= selection, keeping the caller's order; all columns if empty."""
+    if not requested:
+        return list(EXPORT_COLUMNS)
+    unknown = [column for column in requested if column not in EXPORT_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(EXPORT_COLUMNS)}.")
+    return list(dict.fromkeys(requested))
+
+
+def export_rows(queryset, columns):
+    """Plain tuples in primary-key order, fetched in chunks so memory stays flat."""
+    paths = [EXPORT_COLUMNS[column] for column in columns]
+    return queryset.order_by('id').values_list(*paths).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+
+def batched(lines, size=EXPORT_WRITE_ROWS):
+    """Joins encoded lines into larger chunks; one write per row is slow for the server."""
+    buffer = []
+    for line in lines:
+        buffer.append(line)
+        if len(buffer) >= size:
+            yield ''.join(buffer)
+            buffer = []
+    if buffer:
+        yield ''.join(buffer)
+
+
+class Echo:
+    """A file-like object whose write() returns the line, so csv.writer can feed a generator."""
+
+    def write(self, value):
+        return value
+
+
+def csv_cell(value):
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    # Applicant-supplied text such as "=HYPERLINK(...)" stays text when the export is opened
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def csv_lines(columns, rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow([csv_cell(value) for value in row])
+
+
+def ndjson_lines(columns, rows):
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for row in rows:
+        yield encoder.encode(dict(zip(columns, row))) + '\n'
+
+
+EXPORT_FORMATS = {
+    # format -> (line generator, content type)
+    'csv': (csv_lines, 'text/csv; charset=utf-8'),
+    'ndjson': (ndjson_lines, 'application/x-ndjson; charset=utf-8'),
+}
+
+
+def stream_export(queryset, columns, export_format):
+    """Returns (iterator of text chunks, content type) for a StreamingHttpResponse."""
+    lines, content_type = EXPORT_FORMATS[export_format]
+    return batched(lines(columns, export_rows(queryset, columns))), content_type
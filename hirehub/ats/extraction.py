@@ -0,0 +1,156 @@
+# ats/extraction.py
+# Plain-text extraction from resume files. Runs in ats.resumes' worker processes, so
+# nothing here touches models or the database: a local file path in, text out.
+import re
+import shutil
+import signal
+import subprocess
+import threading
+import zipfile
+from contextlib import contextmanager
+from xml.etree import ElementTree
+
+try:
+    import pypdf
+except ImportError:  # optional; PDF resumes are recorded as unsupported
+    pypdf = None
+
+WORD_NAMESPACE = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+# Control characters other than tab and newline; PostgreSQL text cannot store NUL
+re_control_chars = re.compile(r'[\x00-\x08\x0b-\x1f\x7f]')
+re_inline_space = re.compile(r'[ \t\r\f\v\xa0]+')
+re_blank_lines = re.compile(r'\n{3,}')
+
+
+class ExtractionError(Exception):
+    status = 'failed'
+
+
+class UnsupportedResume(ExtractionError):
+    status = 'unsupported'
+
+
+class ResumeTooLarge(ExtractionError):
+    status = 'too_large'
+
+
+class ExtractionTimeout(ExtractionError):
+    status = 'timeout'
+
+
+@contextmanager
+def time_limit(seconds):
+    """
+    Raises ExtractionTimeout in the block after `seconds`, via SIGALRM. Only the main
+    thread of a process can take signals, which is where pool workers run jobs;
+    elsewhere the caller's own wait timeout is the only limit.
+    """
+    if not seconds or not hasattr(signal, 'setitimer') or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def expire(signum, frame):
+        raise ExtractionTimeout(f'Extraction took longer than {seconds}s')
+
+    previous = signal.signal(signal.SIGALRM, expire)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def clean_text(text, max_chars):
+    text = re_control_chars.sub('', text)
+    lines = (re_inline_space.sub(' ', line).strip() for line in text.split('\n'))
+    return re_blank_lines.sub('\n\n', '\n'.join(lines)).strip()[:max_chars]
+
+
+def extract_pdf(path, max_pages, max_chars, timeout):
+    if pypdf is None:
+        raise UnsupportedResume('PDF extraction needs the pypdf package')
+    try:
+        reader = pypdf.PdfReader(path)
+        total = len(reader.pages)
+        parts, length, read = [], 0, 0
+        for page in reader.pages[:max_pages]:
+            text = page.extract_text() or ''
+            parts.append(text)
+            length += len(text)
+            read += 1
+            if length >= max_chars:
+                break
+    except pypdf.errors.PyPdfError as exc:
+        raise ExtractionError(f'Unreadable PDF: {exc}')
+    return '\n\n'.join(parts), read, total
+
+
+def extract_docx(path, max_pages, max_chars, timeout):
+    # document.xml holds the body text: <w:t> runs inside <w:p> paragraphs
+    parts, length = [], 0
+    try:
+        with zipfile.ZipFile(path) as archive, archive.open('word/document.xml') as document:
+            for _, element in ElementTree.iterparse(document):
+                tag = element.tag
+                if tag == WORD_NAMESPACE + 't':
+                    parts.append(element.text or '')
+                    length += len(element.text or '')
+                elif tag == WORD_NAMESPACE + 'tab':
+                    parts.append('\t')
+                elif tag in (WORD_NAMESPACE + 'br', WORD_NAMESPACE + 'cr'):
+                    parts.append('\n')
+                elif tag == WORD_NAMESPACE + 'p':
+                    parts.append('\n')
+                    # Finished paragraphs are not needed any more; keeps memory flat
+                    element.clear()
+                if length >= max_chars:
+                    break
+    except (zipfile.BadZipFile, KeyError, ElementTree.ParseError) as exc:
+        raise ExtractionError(f'Unreadable DOCX: {exc}')
+    return ''.join(parts), None, None
+
+
+def extract_doc(path, max_pages, max_chars, timeout):
+    # Legacy binary Word files are converted by antiword, when it is installed
+    antiword = shutil.which('antiword')
+    if antiword is None:
+        raise UnsupportedResume('DOC extraction needs the antiword program')
+    try:
+        result = subprocess.run([antiword, path], capture_output=True, timeout=timeout or None)
+    except subprocess.TimeoutExpired:
+        raise ExtractionTimeout(f'Extraction took longer than {timeout}s')
+    if result.returncode:
+        raise ExtractionError(f'antiword failed: {result.stderr.decode("utf-8", "replace").strip()}')
+    return result.stdout.decode('utf-8', 'replace'), None, None
+
+
+def extract_plain(path, max_pages, max_chars, timeout):
+    with open(path, 'rb') as handle:
+        # UTF-8 needs at most 4 bytes per character
+        return handle.read(max_chars * 4).decode('utf-8', 'replace'), None, None
+
+
+EXTRACTORS = {
+    '.pdf': extract_pdf,
+    '.docx': extract_docx,
+    '.doc': extract_doc,
+    '.txt': extract_plain,
+}
+
+
+def extract_text(path, extension, max_pages, max_chars, timeout):
+    """
+    Extracts the text of the resume at `path` (a local file) by its `extension`.
+    Reads at most `max_pages` PDF pages and returns at most `max_chars` characters:
+    {'text': '...', 'pages': 2, 'total_pages': 2}, the page counts None for formats
+    without pages. Raises an ExtractionError subclass when the file cannot be read
+    or takes longer than `timeout` seconds.
+    """
+    extractor = EXTRACTORS.get(extension.lower())
+    if extractor is None:
+        raise UnsupportedResume(f'No text extractor for {extension or "files without an extension"}')
+    with time_limit(timeout):
+        text, pages, total_pages = extractor(path, max_pages, max_chars, timeout)
+    return {'text': clean_text(text, max_chars), 'pages': pages, 'total_pages': total_pages}
@@ -0,0 +1,138 @@
+# ats/facets.py
+import hashlib
+import json
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from .models import Applicant, JobPosition, Tag
+
+FACETS_CACHE_VERSION_KEY = 'ats:facets:version'
+
+# Facet name -> (grouping column, optional label column)
+FACET_COLUMNS = {
+    'stage': ('a.current_stage', None),
+    'source': ('a.source', None),
+    'job_position': ('a.job_position_id', 'jp.title'),
+    'tag': ('t.name', None),
+}
+
+
+def _facets_sql(vendor, applicant_ids_sql):
+    """
+    Builds one aggregate statement over the filtered applicants. PostgreSQL uses
+    GROUPING SETS; other databases get the equivalent UNION ALL of GROUP BYs.
+    Every row is (facet, value, label, count); the facet '' row is the total.
+    """
+    applicant = Applicant._meta.db_table
+    through = Applicant.normalized_tags.through._meta.db_table
+    from_clause = (
+        f'FROM {applicant} a '
+        f'LEFT JOIN {JobPosition._meta.db_table} jp ON jp.id = a.job_position_id '
+        f'LEFT JOIN {through} tl ON tl.applicant_id = a.id '
+        f'LEFT JOIN {Tag._meta.db_table} t ON t.id = tl.tag_id '
+        f'WHERE a.id IN ({applicant_ids_sql})'
+    )
+
+    if vendor == 'postgresql':
+        facet_case = ' '.join(
+            f"WHEN GROUPING({column}) = 0 THEN '{facet}'" for facet, (column, _) in FACET_COLUMNS.items()
+        )
+        value_case = ' '.join(
+            f'WHEN GROUPING({column}) = 0 THEN CAST({column} AS TEXT)' for column, _ in FACET_COLUMNS.values()
+        )
+        grouping_sets = ', '.join(
+            f'({column}, {label})' if label else f'({column})' for column, label in FACET_COLUMNS.values()
+        )
+        return (
+            f"SELECT CASE {facet_case} ELSE '' END, CASE {value_case} END, MAX(jp.title), "
+            f'COUNT(DISTINCT a.id) {from_clause} GROUP BY GROUPING SETS ({grouping_sets}, ())'
+        ), 1
+
+    selects = [f"SELECT '', NULL, NULL, COUNT(DISTINCT a.id) {from_clause}"]
+    for facet, (column, label) in FACET_COLUMNS.items():
+        selects.append(
+            f"SELECT '{facet}', CAST({column} AS TEXT), {label or 'NULL'}, COUNT(DISTINCT a.id) "
+            f'{from_clause} GROUP BY {column}{", " + label if label else ""}'
+        )
+    return ' UNION ALL '.join(selects), len(selects)
+
+
+def compute_applicant_facets(queryset):
+    """
+    Counts the applicants in `queryset` per stage, source, job position and tag with a
+    single grouped query. Every stage and source choice is listed, with 0 if unused.
+    """
+    connection = connections[queryset.db]
+    ids_sql, ids_params = queryset.order_by().values('id').query.sql_with_params()
+    sql, repeat = _facets_sql(connection.vendor, ids_sql)
+
+    facets = {facet: {} for facet in FACET_COLUMNS}
+    total = 0
+    with connection.cursor() as cursor:
+        cursor.execute(sql, list(ids_params) * repeat)
+        for facet, value, label, count in cursor.fetchall():
+            if not facet:
+                total = count
+            elif value is not None:
+                facets[facet][value] = (label, count)
+
+    def choice_counts(facet, choices):
+        return [{'value': value, 'label': label, 'count': facets[facet].get(value, (None, 0))[1]} for value, label in choices]
+
+    return {
+        'count': total,
+        'stage': choice_counts('stage', Applicant.STAGE_CHOICES),
+        'source': choice_counts('source', Applicant.SOURCE_CHOICES),
+        'job_position': sorted(
+            ({'value': int(value), 'label': label, 'count': count} for value, (label, count) in facets['job_position'].items()),
+            key=lambda row: (-row['count'], row['value']),
+        ),
+        'tag': sorted(
+            ({'value': value, 'label': value, 'count': count} for value, (_, count) in facets['tag'].items()),
+            key=lambda row: (-row['count'], row['value']),
+        ),
+    }
+
+
+def _facets_cache_key(params, version):
+    digest = hashlib.sha1(json.dumps(params, sort_keys=True).encode('utf-8')).hexdigest()
+    return f'ats:facets:{version}:{digest}'
+
+
+def get_applicant_facets(queryset, params):
+    """
+    Cached compute_applicant_facets(). `params` identifies the filter set; entries live
+    for ATS_FACETS_CACHE_TIMEOUT seconds and are dropped on any applicant write.
+    """
+    key = _facets_cache_key(params, cache.get(FACETS_CACHE_VERSION_KEY, 0))
+    facets = cache.get(key)
+    if facets is None:
+        facets = compute_applicant_facets(queryset)
+        cache.set(key, facets, getattr(settings, 'ATS_FACETS_CACHE_TIMEOUT', 30))
+    return facets
+
+
+async def aget_applicant_facets(queryset, params):
+    """
+    get_applicant_facets() for async views. The statement is raw SQL, which has no
+    async interface, so it runs in the ORM's thread with sync_to_async.
+    """
+    key = _facets_cache_key(params, await cache.aget(FACETS_CACHE_VERSION_KEY, 0))
+    facets = await cache.aget(key)
+    if facets is None:
+        facets = await sync_to_async(compute_applicant_facets)(queryset)
+        await cache.aset(key, facets, getattr(settings, 'ATS_FACETS_CACHE_TIMEOUT', 30))
+    return facets
+
+
+def invalidate_applicant_facets():
+    """
+    Moves every cached facet entry out of reach by bumping the key version. This only
+    reaches other processes through a shared cache (REDIS_URL); with the per-process
+    fallback they keep their entries until ATS_FACETS_CACHE_TIMEOUT.
+    """
+    try:
+        cache.incr(FACETS_CACHE_VERSION_KEY)
+    except ValueError:
+        cache.set(FACETS_CACHE_VERSION_KEY, 1, None)
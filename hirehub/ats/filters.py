@@ -0,0 +1,154 @@
+# ats/filters.py
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.core.management.base import CommandError
+from django.db import connections
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Greatest
+from .tags import filter_by_tags
+
+# Sort keys accepted from the dashboard and the API. Anything else is rejected
+# instead of being passed straight into order_by().
+APPLICANT_ORDERING_FIELDS = (
+    'id', 'name', 'email', 'current_stage', 'source',
+    'created_at', 'updated_at', 'last_status_update',
+)
+DEFAULT_APPLICANT_ORDERING = '-created_at'
+
+# Sort keys usable with keyset (cursor) pagination. Each one is backed by a
+# composite (field, id) index on Applicant so a page is a single index range scan.
+APPLICANT_CURSOR_ORDERING_FIELDS = ('id', 'created_at', 'updated_at', 'name')
+
+# Ordering value that sorts search results by similarity instead of a column
+RELEVANCE_ORDERING = 'relevance'
+
+# SQLite FTS5 trigram table maintained by migration 0008; trigrams need 3+ characters
+APPLICANT_SEARCH_TABLE = 'ats_applicant_search'
+TRIGRAM_MIN_LENGTH = 3
+# The triggers keeping that table in sync. SQLite drops them whenever a migration
+# rebuilds ats_applicant, so such migrations must reinstall them (as 0013 does).
+APPLICANT_SEARCH_TRIGGERS = ('ats_applicant_search_ai', 'ats_applicant_search_ad', 'ats_applicant_search_au')
+
+
+def missing_search_triggers(connection):
+    """The search table's triggers missing on a SQLite `connection` that has the table."""
+    if connection.vendor != 'sqlite':
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger') AND name IN (%s)"
+            % ', '.join(['%s'] * (len(APPLICANT_SEARCH_TRIGGERS) + 1)),
+            [APPLICANT_SEARCH_TABLE, *APPLICANT_SEARCH_TRIGGERS],
+        )
+        present = {name for name, in cursor.fetchall()}
+    if APPLICANT_SEARCH_TABLE not in present:
+        return []
+    return [name for name in APPLICANT_SEARCH_TRIGGERS if name not in present]
+
+
+def verify_search_triggers(sender, using, **kwargs):
+    """
+    post_migrate receiver failing the migration when the SQLite search table has lost
+    its triggers, instead of letting search results silently go stale.
+    """
+    missing = missing_search_triggers(connections[using])
+    if missing:
+        raise CommandError(
+            f"The triggers {', '.join(missing)} of {APPLICANT_SEARCH_TABLE} are missing: a migration rebuilt "
+            "ats_applicant without reinstalling them. Run the SQLITE_FORWARD statements of migration 0008 "
+            "at its end, as 0013 does."
+        )
+
+
+def filter_applicants(queryset, stage=None, source=None, job_position_id=None, search=None, tags=None):
+    """
+    Applies the standard dashboard/API filters to an Applicant queryset.
+    Empty values are ignored so request parameters can be passed through as-is.
+    `tags` is a list of exact tag names that must all be present.
+    """
+    if stage:
+        queryset = queryset.filter(current_stage=stage)
+
+    if source:
+        queryset = queryset.filter(source=source)
+
+    if job_position_id:
+        queryset = queryset.filter(job_position_id=job_position_id)
+
+    if tags:
+        queryset = filter_by_tags(queryset, tags)
+
+    if search:
+        queryset = search_applicants(queryset, search)
+
+    return queryset
+
+
+def _fts_phrase(search):
+    # Quote the term as a single FTS5 phrase so punctuation is matched literally
+    return '"' + search.replace('"', '""') + '"'
+
+
+def search_applicants(queryset, search):
+    """
+    Substring search over name, email and tags.
+
+    On PostgreSQL the icontains lookups below are served by the GIN trigram indexes
+    on UPPER(column) from migration 0008. On SQLite, terms long enough to form a
+    trigram are matched through the FTS5 trigram table instead of scanning every row.
+    """
+    vendor = connections[queryset.db].vendor
+    if vendor == 'sqlite' and len(search) >= TRIGRAM_MIN_LENGTH:
+        return queryset.filter(id__in=RawSQL(
+            f'SELECT rowid FROM {APPLICANT_SEARCH_TABLE} WHERE {APPLICANT_SEARCH_TABLE} MATCH %s',
+            [_fts_phrase(search)],
+        ))
+
+    # Use Q objects for OR queries: search in name, email, or tags
+    return queryset.filter(
+        Q(name__icontains=search) |
+        Q(email__icontains=search) |
+        Q(tags__icontains=search)
+    )
+
+
+def rank_applicant_search(queryset, search):
+    """
+    Annotates `search_rank` (higher is more relevant) for an already searched queryset.
+    PostgreSQL uses pg_trgm word similarity; SQLite uses the FTS5 bm25 rank.
+    """
+    vendor = connections[queryset.db].vendor
+    if vendor == 'postgresql':
+        return queryset.annotate(search_rank=Greatest(
+            TrigramWordSimilarity(search, 'name'),
+            TrigramWordSimilarity(search, 'email'),
+            TrigramWordSimilarity(search, 'tags'),
+        ))
+    if vendor == 'sqlite' and len(search) >= TRIGRAM_MIN_LENGTH:
+        table = connections[queryset.db].ops.quote_name(queryset.model._meta.db_table)
+        return queryset.annotate(search_rank=RawSQL(
+            f'SELECT -rank FROM {APPLICANT_SEARCH_TABLE} '
+            f'WHERE {APPLICANT_SEARCH_TABLE} MATCH %s AND rowid = {table}.id',
+            [_fts_phrase(search)],
+        ))
+    # No ranking available: keep the default order by giving every row the same rank
+    return queryset.annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+
+def resolve_applicant_ordering(ordering, allowed_fields=APPLICANT_ORDERING_FIELDS):
+    """
+    Validates an ordering parameter such as 'name' or '-created_at' and returns
+    the arguments for order_by(). The primary key is appended as a tie-breaker
+    so that pages never overlap when the sort key has duplicates.
+
+    Raises ValueError for sort keys that are not whitelisted.
+    """
+    ordering = (ordering or DEFAULT_APPLICANT_ORDERING).strip()
+    field = ordering.lstrip('-')
+    if field not in allowed_fields:
+        raise ValueError(f"Unsupported ordering '{ordering}'.")
+
+    if field == 'id':
+        return (ordering,)
+    descending = ordering.startswith('-')
+    return (ordering, '-id' if descending else 'id')
@@ -1,6 +1,8 @@
 # hirehub/ats/forms.py
 from django import forms
-from .models import Applicant, JobPosition
+from django.core.files.uploadedfile import UploadedFile
+from .models import Applicant, JobPosition, normalize_email
+from .uploads import UploadError, check_uploaded_resume
 
 class JobPositionForm(forms.ModelForm):
     class Meta:
@@ -32,7 +34,7 @@ class ApplicantForm(forms.ModelForm):
         }
         help_texts = {
             'tags': 'Separate tags with commas',
-            'resume_file': 'Accepted formats: PDF, DOC, DOCX',
+            'resume_file': 'Accepted formats: PDF, DOC, DOCX, TXT',
         }
 
     def __init__(self, *args, **kwargs):
@@ -44,3 +46,17 @@ class ApplicantForm(forms.ModelForm):
         if 'job_position' in self.fields:
             self.fields['job_position'].queryset = JobPosition.objects.filter(is_active=True)
             self.fields['job_position'].empty_label = "Select Job Position"
+
+    def clean_email(self):
+        # Normalise before the (email, job_position) uniqueness check runs
+        return normalize_email(self.cleaned_data.get('email'))
+
+    def clean_resume_file(self):
+        resume_file = self.cleaned_data.get('resume_file')
+        # Only new uploads; an unchanged form keeps the stored file
+        if isinstance(resume_file, UploadedFile):
+            try:
+                check_uploaded_resume(resume_file)
+            except UploadError as exc:
+                raise forms.ValidationError(str(exc))
+        return resume_file
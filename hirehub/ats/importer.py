@@ -0,0 +1,388 @@
+# ats/importer.py
+import csv
+import io
+import json
+from collections import Counter
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+from .bulk import upsert_applicants
+from .models import Applicant, ApplicantProfile, ApplicantStageEvent, JobPosition, Tag, normalize_email
+from .tags import TAG_MAX_LENGTH
+
+# Applicant fields an import file may set; everything else keeps its model default
+IMPORT_FIELDS = (
+    'name', 'email', 'phone', 'job_position', 'current_stage', 'source', 'tags', 'resume_text',
+    'interviewers', 'interview_dates', 'comments_ta', 'comments_initial_call', 'comments_evaluation',
+    'overall_feedback', 'final_decision', 'created_at',
+)
+# The conflict key; never overwritten on update
+KEY_FIELDS = ('email', 'job_position')
+
+STAGING_TABLE = 'ats_applicant_import'
+
+
+def model_field(name):
+    """The model field behind an import field; Applicant.PROFILE_FIELDS live on ApplicantProfile."""
+    return (ApplicantProfile if name in Applicant.PROFILE_FIELDS else Applicant)._meta.get_field(name)
+
+
+def read_rows(path, file_format):
+    """
+    Yields (line number, row) from a CSV file with a header row or from an NDJSON file,
+    one row at a time. A line that is not a JSON object yields None as its row.
+    """
+    with open(path, newline='', encoding='utf-8-sig') as handle:
+        if file_format == 'csv':
+            reader = csv.DictReader(handle)
+            for row in reader:
+                yield reader.line_num, row
+            return
+        for number, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = None
+            yield number, row if isinstance(row, dict) else None
+
+
+class ApplicantRowValidator:
+    """
+    Maps file columns onto IMPORT_FIELDS and cleans each value with the model field,
+    without a query per row: job positions are loaded once and matched by id.
+
+    Columns map by name (case-insensitive, spaces as underscores) unless `column_map`
+    names them explicitly, e.g. {'E-mail': 'email'}. Unknown columns are ignored and
+    collected in `ignored`; the fields the file actually sets are in `mapped`.
+    """
+
+    def __init__(self, column_map=None):
+        self.column_map = dict(column_map or {})
+        self.positions = JobPosition.objects.only('id').in_bulk()
+        self.fields_by_column = {}
+        self.mapped = set()
+        self.ignored = set()
+        # Value (or ValidationError) for each field the row leaves out, cleaned once
+        self.missing = {}
+        for name in IMPORT_FIELDS:
+            try:
+                self.missing[name] = self.clean(name, None)
+            except ValidationError as exc:
+                self.missing[name] = exc
+
+    def field_for(self, column):
+        if column not in self.fields_by_column:
+            name = self.column_map.get(column, (column or '').strip().lower().replace(' ', '_'))
+            self.fields_by_column[column] = name if name in IMPORT_FIELDS else None
+            if name in IMPORT_FIELDS:
+                self.mapped.add(name)
+            else:
+                self.ignored.add(column)
+        return self.fields_by_column[column]
+
+    def validate(self, row):
+        """Returns (attrs, None) with a value for every import field, or (None, errors by field)."""
+        if row is None:
+            return None, {'row': ['Expected a JSON object.']}
+        values = {}
+        for column, value in row.items():
+            field = self.field_for(column)
+            if field:
+                values[field] = value.strip() if isinstance(value, str) else value
+
+        attrs, errors = {}, {}
+        for name in IMPORT_FIELDS:
+            try:
+                if name in values:
+                    attrs[name] = self.clean(name, values[name])
+                elif isinstance(self.missing[name], ValidationError):
+                    raise self.missing[name]
+                else:
+                    attrs[name] = self.missing[name]
+            except ValidationError as exc:
+                errors[name] = exc.messages
+        return (None, errors) if errors else (attrs, None)
+
+    def clean(self, name, value):
+        field = model_field(name)
+        if name == 'job_position':
+            if value in (None, ''):
+                return None
+            try:
+                position = self.positions.get(int(value))
+            except (TypeError, ValueError):
+                position = None
+            if position is None:
+                raise ValidationError(f'No job position with id {value!r}.')
+            return position
+        if name == 'created_at':
+            if value in (None, ''):
+                return None
+            value = field.to_python(value)
+            return timezone.make_aware(value) if timezone.is_naive(value) else value
+
+        if value in (None, '') and field.has_default():
+            return field.get_default()
+        if name == 'tags' and isinstance(value, list):
+            value = ', '.join(str(tag) for tag in value)
+        value = field.clean('' if value is None else str(value), None)
+        return normalize_email(value) if name == 'email' else value
+
+
+def dedupe_rows(rows):
+    """Keeps the last row for each (email, job_position); returns (rows, number dropped)."""
+    latest = {}
+    for attrs in rows:
+        position = attrs['job_position']
+        latest[attrs['email'], position.pk if position else None] = attrs
+    return list(latest.values()), len(rows) - len(latest)
+
+
+class BulkCreateLoader:
+    """Chunk loader for SQLite and other databases: the bulk API's upsert, without embedding."""
+
+    def __init__(self, mapped_fields):
+        self.mapped_fields = set(mapped_fields)
+
+    def load(self, rows):
+        # created_at only applies to new rows; bulk_create would stamp it with now()
+        created_at = [attrs.pop('created_at') for attrs in rows]
+        # Fields missing from the file keep their current values on existing rows
+        written_fields = self.mapped_fields | set(KEY_FIELDS)
+        rows = [{name: value for name, value in attrs.items() if name in written_fields} for attrs in rows]
+        results = upsert_applicants(rows, embed=False)
+
+        backdated = []
+        for (applicant, outcome), value in zip(results, created_at):
+            if outcome == 'created' and value is not None:
+                applicant.created_at = value
+                backdated.append(applicant)
+        Applicant.objects.bulk_update(backdated, ['created_at'])
+        # Their starting-stage events are dated by created_at too
+        ApplicantStageEvent.objects.filter(applicant__in=backdated, from_stage='').update(
+            at=Subquery(Applicant.objects.filter(pk=OuterRef('applicant_id')).values('created_at')[:1])
+        )
+        return Counter(outcome for _, outcome in results)
+
+
+class PostgresLoader:
+    """
+    Chunk loader for PostgreSQL: COPY into a session temp table, then merge with one
+    INSERT ... SELECT ... ON CONFLICT (email, job_position_id) DO UPDATE that only
+    touches rows whose mapped columns differ. Rows without a position cannot conflict,
+    so they are merged on email with an UPDATE and an INSERT ... WHERE NOT EXISTS.
+    Profile columns (Applicant.PROFILE_FIELDS) are updated in ApplicantProfile first,
+    and inserted there for the created applicants. Changed resume text clears the
+    embedding for the later batched pass; tags and stage events are written with
+    set-based SQL rather than per-row objects.
+    """
+
+    def __init__(self, mapped_fields):
+        self.table = Applicant._meta.db_table
+        self.profile_table = ApplicantProfile._meta.db_table
+        applicant_fields = [name for name in IMPORT_FIELDS if name not in Applicant.PROFILE_FIELDS]
+        profile_fields = [name for name in IMPORT_FIELDS if name in Applicant.PROFILE_FIELDS]
+        self.columns = [model_field(name).column for name in IMPORT_FIELDS]
+        self.insert_columns = [model_field(name).column for name in applicant_fields if name != 'created_at']
+        self.update_columns = [
+            model_field(name).column for name in applicant_fields
+            if name in mapped_fields and name not in KEY_FIELDS and name != 'created_at'
+        ]
+        self.profile_columns = [model_field(name).column for name in profile_fields]
+        self.profile_update_columns = [
+            model_field(name).column for name in profile_fields if name in mapped_fields
+        ]
+        self.text_columns = [column for column in self.columns if column not in ('job_position_id', 'created_at')]
+        self.sync_tags = 'tags' in mapped_fields
+
+        staged = [f'p.{column}' if column in self.profile_columns else f'a.{column}' for column in self.columns]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} AS SELECT {", ".join(staged)} '
+                f'FROM {self.table} a JOIN {self.profile_table} p ON p.applicant_id = a.id WITH NO DATA'
+            )
+
+    def copy_rows(self, cursor, rows):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for attrs in rows:
+            record = []
+            for name in IMPORT_FIELDS:
+                value = attrs[name]
+                if name == 'job_position':
+                    value = value.pk if value else None
+                elif name == 'created_at' and value is not None:
+                    value = value.isoformat()
+                record.append('' if value is None else value)
+            writer.writerow(record)
+        buffer.seek(0)
+        # Unquoted empty fields are NULL in COPY csv; text columns want '' instead
+        cursor.copy_expert(
+            f'COPY {STAGING_TABLE} ({", ".join(self.columns)}) FROM STDIN '
+            f'WITH (FORMAT csv, FORCE_NOT_NULL ({", ".join(self.text_columns)}))',
+            buffer,
+        )
+
+    def merge_sql(self):
+        columns = ', '.join(self.insert_columns)
+        selected = ', '.join(f's.{column}' for column in self.insert_columns)
+        insert = (
+            f'INSERT INTO {self.table} ({columns}, created_at, updated_at, last_status_update) '
+            f'SELECT {selected}, COALESCE(s.created_at, now()), now(), now() FROM {STAGING_TABLE} s'
+        )
+
+        def assignments(new):
+            sets = [f'{column} = {new}.{column}' for column in self.update_columns]
+            sets += ['updated_at = now()', 'last_status_update = now()']
+            return ', '.join(sets)
+
+        def differs(new):
+            old_values = ', '.join(f'{self.table}.{column}' for column in self.update_columns)
+            new_values = ', '.join(f'{new}.{column}' for column in self.update_columns)
+            return f'ROW({old_values}) IS DISTINCT FROM ROW({new_values})'
+
+        if self.update_columns:
+            on_conflict = f'DO UPDATE SET {assignments("EXCLUDED")} WHERE {differs("EXCLUDED")}'
+        else:
+            on_conflict = 'DO NOTHING'
+        positioned = (
+            f'{insert} WHERE s.job_position_id IS NOT NULL '
+            f'ON CONFLICT (email, job_position_id) {on_conflict} RETURNING id, (xmax = 0)'
+        )
+        position_less_update = (
+            f'UPDATE {self.table} SET {assignments("s")} FROM {STAGING_TABLE} s '
+            f'WHERE s.job_position_id IS NULL AND {self.table}.job_position_id IS NULL '
+            f'AND {self.table}.email = s.email AND {differs("s")} RETURNING {self.table}.id, false'
+        ) if self.update_columns else None
+        position_less_insert = (
+            f'{insert} WHERE s.job_position_id IS NULL AND NOT EXISTS ('
+            f'SELECT 1 FROM {self.table} a WHERE a.email = s.email AND a.job_position_id IS NULL'
+            f') RETURNING id, true'
+        )
+        return [sql for sql in (positioned, position_less_update, position_less_insert) if sql]
+
+    def staged_applicants(self):
+        """SELECT of the staged rows that match an existing applicant, with its id as applicant_id."""
+        def matches(position_match):
+            return (
+                f'SELECT a.id AS applicant_id, s.* FROM {STAGING_TABLE} s '
+                f'JOIN {self.table} a ON a.email = s.email AND {position_match}'
+            )
+
+        # Two joins rather than IS NOT DISTINCT FROM, which cannot use the unique index
+        return (
+            f'{matches("a.job_position_id = s.job_position_id")} UNION ALL '
+            f'{matches("a.job_position_id IS NULL AND s.job_position_id IS NULL")}'
+        )
+
+    def update_profiles(self, cursor):
+        """Writes changed profile columns of existing applicants; returns the ids whose profile changed."""
+        sets = [f'{column} = s.{column}' for column in self.profile_update_columns]
+        if 'resume_text' in self.profile_update_columns:
+            sets.append(
+                f'embedding = CASE WHEN {self.profile_table}.resume_text IS DISTINCT FROM s.resume_text '
+                f'THEN NULL ELSE {self.profile_table}.embedding END'
+            )
+        old_values = ', '.join(f'{self.profile_table}.{column}' for column in self.profile_update_columns)
+        new_values = ', '.join(f's.{column}' for column in self.profile_update_columns)
+        cursor.execute(
+            f'UPDATE {self.profile_table} SET {", ".join(sets)} FROM ({self.staged_applicants()}) s '
+            f'WHERE {self.profile_table}.applicant_id = s.applicant_id '
+            f'AND ROW({old_values}) IS DISTINCT FROM ROW({new_values}) RETURNING {self.profile_table}.applicant_id'
+        )
+        return [pk for pk, in cursor.fetchall()]
+
+    def insert_profiles(self, cursor, ids):
+        columns = ', '.join(self.profile_columns)
+        selected = ', '.join(f's.{column}' for column in self.profile_columns)
+        cursor.execute(
+            f'INSERT INTO {self.profile_table} (applicant_id, {columns}) '
+            f'SELECT s.applicant_id, {selected} FROM ({self.staged_applicants()}) s WHERE s.applicant_id = ANY(%s)',
+            [ids],
+        )
+
+    def record_stage_changes(self, cursor):
+        """Stage events for existing applicants the staged rows move to another stage; run before the merge."""
+        def moves(position_match):
+            return (
+                f'SELECT a.id, a.current_stage, s.current_stage, now() FROM {STAGING_TABLE} s '
+                f'JOIN {self.table} a ON a.email = s.email AND {position_match} '
+                f'WHERE a.current_stage <> s.current_stage'
+            )
+
+        # Two joins rather than IS NOT DISTINCT FROM, which cannot use the unique index
+        cursor.execute(
+            f'INSERT INTO {ApplicantStageEvent._meta.db_table} (applicant_id, from_stage, to_stage, at) '
+            f'{moves("a.job_position_id = s.job_position_id")} UNION ALL '
+            f'{moves("a.job_position_id IS NULL AND s.job_position_id IS NULL")}'
+        )
+
+    def record_starting_stages(self, cursor, ids):
+        cursor.execute(
+            f'INSERT INTO {ApplicantStageEvent._meta.db_table} (applicant_id, from_stage, to_stage, at) '
+            f"SELECT id, '', current_stage, created_at FROM {self.table} WHERE id = ANY(%s)",
+            [ids],
+        )
+
+    def sync_normalized_tags(self, cursor, ids):
+        """ats.tags.sync_tags_many() in three statements, splitting `tags` as parse_tags() does."""
+        through = Applicant.normalized_tags.through._meta.db_table
+        tags = Tag._meta.db_table
+        parsed = (
+            f"SELECT DISTINCT a.id AS applicant_id, "
+            f"left(lower(btrim(part, E' \\t\\r\\n')), {TAG_MAX_LENGTH}) AS name "
+            f"FROM {self.table} a, regexp_split_to_table(a.tags, ',') AS part "
+            f"WHERE a.id = ANY(%s) AND btrim(part, E' \\t\\r\\n') <> ''"
+        )
+        cursor.execute(
+            f'INSERT INTO {tags} (name) SELECT DISTINCT name FROM ({parsed}) p ON CONFLICT (name) DO NOTHING', [ids]
+        )
+        cursor.execute(f'DELETE FROM {through} WHERE applicant_id = ANY(%s)', [ids])
+        cursor.execute(
+            f'INSERT INTO {through} (applicant_id, tag_id) '
+            f'SELECT p.applicant_id, t.id FROM ({parsed}) p JOIN {tags} t ON t.name = p.name',
+            [ids],
+        )
+
+    def load(self, rows):
+        outcomes = Counter()
+        written = []
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f'TRUNCATE {STAGING_TABLE}')
+            self.copy_rows(cursor, rows)
+            if 'current_stage' in self.update_columns:
+                self.record_stage_changes(cursor)
+            profile_changed = self.update_profiles(cursor) if self.profile_update_columns else []
+            created_ids = []
+            for sql in self.merge_sql():
+                cursor.execute(sql)
+                for pk, created in cursor.fetchall():
+                    outcomes['created' if created else 'updated'] += 1
+                    written.append(pk)
+                    if created:
+                        created_ids.append(pk)
+            # Applicants whose only changes were to their profile
+            profile_only = sorted(set(profile_changed) - set(written))
+            if profile_only:
+                cursor.execute(
+                    f'UPDATE {self.table} SET updated_at = now(), last_status_update = now() WHERE id = ANY(%s)',
+                    [profile_only],
+                )
+                outcomes['updated'] += len(profile_only)
+                written += profile_only
+            if created_ids:
+                self.insert_profiles(cursor, created_ids)
+                self.record_starting_stages(cursor, created_ids)
+            if self.sync_tags and written:
+                self.sync_normalized_tags(cursor, written)
+        outcomes['unchanged'] = len(rows) - outcomes['created'] - outcomes['updated']
+        return outcomes
+
+
+def get_loader(mapped_fields):
+    if connection.vendor == 'postgresql':
+        return PostgresLoader(mapped_fields)
+    return BulkCreateLoader(mapped_fields)
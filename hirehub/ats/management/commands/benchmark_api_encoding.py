@@ -0,0 +1,56 @@
+import gzip
+import time
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+from ats.middleware import BROTLI_QUALITY, brotli
+from ats.models import Applicant
+from ats.renderers import ORJSONRenderer, orjson
+from ats.serializers import ApplicantSerializer
+
+class Command(BaseCommand):
+    help = 'Compares JSON encode time and response bytes for an applicant list page: json vs orjson, identity vs gzip/brotli'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100, help='Applicants per encoded page (default: 100)')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed runs per measurement; the best is reported (default: 20)')
+
+    def handle(self, *args, **options):
+        rows = max(1, options['rows'])
+        repeat = max(1, options['repeat'])
+        applicants = Applicant.objects.select_related('job_position').order_by('-created_at')[:rows]
+        data = ApplicantSerializer(applicants, many=True).data
+        if not data:
+            raise CommandError('No applicants to encode; seed some first (manage.py seed Applicant).')
+
+        def best_of(function):
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                result = function()
+                timings.append(time.perf_counter() - started)
+            return result, min(timings) * 1000
+
+        self.stdout.write(f'{len(data)} applicants, best of {repeat} runs')
+        self.stdout.write(self.style.MIGRATE_HEADING('\n== Encode'))
+        renderers = [('json (JSONRenderer)', JSONRenderer())]
+        if orjson is None:
+            self.stdout.write(self.style.WARNING('orjson is not installed; ORJSONRenderer falls back to json.'))
+        renderers.append(('orjson (ORJSONRenderer)', ORJSONRenderer()))
+        for label, renderer in renderers:
+            body, elapsed = best_of(lambda: renderer.render(data))
+            self.stdout.write(f'{label:<26} {elapsed:8.2f} ms {len(body):>10} bytes')
+
+        self.stdout.write(self.style.MIGRATE_HEADING('\n== Bytes on the wire'))
+        encodings = [
+            ('identity', lambda: body),
+            # The level Django's GZipMiddleware uses
+            ('gzip -6', lambda: gzip.compress(body, compresslevel=6, mtime=0)),
+        ]
+        if brotli is None:
+            self.stdout.write(self.style.WARNING('brotli is not installed; responses are only gzipped.'))
+        else:
+            encodings.append((f'brotli q{BROTLI_QUALITY}', lambda: brotli.compress(body, quality=BROTLI_QUALITY)))
+        for label, encode in encodings:
+            encoded, elapsed = best_of(encode)
+            ratio = len(encoded) / len(body) * 100
+            self.stdout.write(f'{label:<26} {elapsed:8.2f} ms {len(encoded):>10} bytes ({ratio:5.1f}%)')
@@ -0,0 +1,36 @@
+import datetime
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from ats.resumes import prune_resume_blobs, recount_resume_blobs, store_legacy_resumes
+from ats.uploads import prune_resume_uploads
+
+class Command(BaseCommand):
+    help = (
+        'Moves resume files uploaded before content addressing into the deduplicated store, '
+        'rebuilds the ResumeBlob reference counts and deletes files no applicant uses any more, '
+        'and abandoned chunked uploads'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--grace-hours', type=float, default=1.0,
+                            help='Hours a file must have been unused before it is deleted (default: 1)')
+        parser.add_argument('--no-prune', action='store_true', help='Keep unused files and abandoned uploads')
+
+    def handle(self, *args, **options):
+        def progress(done):
+            if done % 1000 == 0:
+                self.stdout.write(f'{done} files...')
+
+        moved, stored, missing = store_legacy_resumes(progress)
+        self.stdout.write(f'Moved {moved} legacy resume files into {stored} content-addressed files.')
+        if missing:
+            self.stdout.write(self.style.WARNING(f'{missing} resume files referenced by applicants are missing from storage.'))
+        changed = recount_resume_blobs()
+        self.stdout.write(f'Corrected {changed} reference counts.')
+        if not options['no_prune']:
+            pruned, freed = prune_resume_blobs(datetime.timedelta(hours=options['grace_hours']))
+            self.stdout.write(f'Deleted {pruned} unused files ({freed} bytes).')
+            expiry = getattr(settings, 'ATS_RESUME_UPLOAD_EXPIRY_HOURS', 24)
+            abandoned = prune_resume_uploads(datetime.timedelta(hours=expiry))
+            self.stdout.write(f'Deleted {abandoned} abandoned uploads.')
+        self.stdout.write(self.style.SUCCESS('Resume storage deduplicated.'))
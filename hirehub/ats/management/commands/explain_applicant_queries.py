@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+from ats.filters import DEFAULT_APPLICANT_ORDERING, filter_applicants, resolve_applicant_ordering
+from ats.models import Applicant, JobPosition
+from ats.pagination import ApplicantPagination
+
+class Command(BaseCommand):
+    help = 'Prints EXPLAIN plans for the standard dashboard/API applicant filter combinations'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--stage', type=str, help='Stage to filter on (defaults to the first stage choice)')
+        parser.add_argument('--source', type=str, help='Source to filter on (defaults to the first source choice)')
+        parser.add_argument('--job-position', type=int, help='Job position ID to filter on (defaults to the first position)')
+        parser.add_argument('--search', type=str, default='python', help='Search term for the name/email/tags search')
+        parser.add_argument('--ordering', type=str, default=DEFAULT_APPLICANT_ORDERING, help='Ordering to apply')
+        parser.add_argument('--analyze', action='store_true', help='Run EXPLAIN ANALYZE (PostgreSQL only; executes the queries)')
+
+    def handle(self, *args, **options):
+        stage = options['stage'] or Applicant.STAGE_CHOICES[0][0]
+        source = options['source'] or Applicant.SOURCE_CHOICES[0][0]
+        job_position_id = options['job_position']
+        if job_position_id is None:
+            job_position_id = JobPosition.objects.order_by('id').values_list('id', flat=True).first()
+        order_by = resolve_applicant_ordering(options['ordering'])
+
+        combinations = [
+            ('no filters', {}),
+            ('stage', {'stage': stage}),
+            ('source', {'source': source}),
+            ('job_position', {'job_position_id': job_position_id}),
+            ('stage + source', {'stage': stage, 'source': source}),
+            ('job_position + stage', {'job_position_id': job_position_id, 'stage': stage}),
+            ('search', {'search': options['search']}),
+        ]
+
+        explain_options = {}
+        if options['analyze'] and connection.vendor == 'postgresql':
+            explain_options = {'analyze': True, 'buffers': True}
+
+        self.stdout.write(f'Database vendor: {connection.vendor}; ordering: {", ".join(order_by)}')
+        for label, filters in combinations:
+            queryset = filter_applicants(Applicant.objects.all(), **filters).order_by(*order_by)
+            # Explain the first page, as served by the dashboard and the list API
+            page = queryset[:ApplicantPagination.page_size]
+            self.stdout.write(self.style.MIGRATE_HEADING(f'\n== {label} {filters or ""}'))
+            self.stdout.write(page.explain(**explain_options))
@@ -0,0 +1,57 @@
+import time
+from collections import Counter
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from ats.bulk import embed_missing_applicants
+from ats.resumes import ResumeExtractor, pending_resumes, share_blob_embeddings
+
+class Command(BaseCommand):
+    help = (
+        'Extracts resume_text from the uploaded resume files (media/resumes/) of applicants '
+        'that have none, then embeds them'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, help='Extraction processes (default: ATS_RESUME_EXTRACTION_WORKERS; 0 runs in this process)')
+        parser.add_argument('--retry', action='store_true', help='Also retry files whose earlier extraction failed or found no text')
+        parser.add_argument('--batch-size', type=int, default=500, help='Applicants queued per batch')
+        parser.add_argument('--skip-embeddings', action='store_true', help='Leave embeddings for a later import_applicants --embeddings-only run')
+
+    def handle(self, *args, **options):
+        workers = options['workers']
+        if workers is None:
+            workers = getattr(settings, 'ATS_RESUME_EXTRACTION_WORKERS', 2)
+        batch_size = max(1, options['batch_size'])
+        started = time.monotonic()
+        outcomes = Counter()
+        pending = pending_resumes(retry=options['retry']).order_by('id').values_list('id', flat=True)
+
+        extractor = ResumeExtractor(max(0, workers))
+        last_id = 0
+        try:
+            while True:
+                ids = list(pending.filter(id__gt=last_id)[:batch_size])
+                if not ids:
+                    break
+                futures = [extractor.submit(pk, force=options['retry'], embed=False) for pk in ids]
+                for future in futures:
+                    outcomes[future.result() or 'skipped'] += 1
+                last_id = ids[-1]
+                self.stdout.write(f'{sum(outcomes.values())} resumes...')
+        finally:
+            extractor.shutdown()
+
+        summary = ', '.join(f'{count} {status}' for status, count in sorted(outcomes.items())) or 'nothing to do'
+        self.stdout.write(self.style.SUCCESS(f'Extracted resumes in {time.monotonic() - started:.1f}s: {summary}.'))
+        for status in ('unsupported', 'too_large', 'timeout', 'failed'):
+            if outcomes[status]:
+                self.stdout.write(self.style.WARNING(
+                    f'{outcomes[status]} resumes {status.replace("_", " ")}; see ResumeExtraction.detail.'
+                ))
+
+        if not options['skip_embeddings']:
+            # Applicants sharing an already embedded resume file need no encoding
+            share_blob_embeddings()
+            done = embed_missing_applicants()
+            share_blob_embeddings()
+            self.stdout.write(self.style.SUCCESS(f'Embedded {done} applicants.'))
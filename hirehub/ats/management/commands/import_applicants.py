@@ -0,0 +1,104 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from ats.bulk import embed_missing_applicants
+from ats.facets import invalidate_applicant_facets
+from ats.importer import ApplicantRowValidator, dedupe_rows, get_loader, read_rows
+
+class Command(BaseCommand):
+    help = 'Imports applicants from a CSV or NDJSON file, upserting on (email, job position)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', type=str, help='CSV (with a header row) or NDJSON file to import')
+        parser.add_argument('--format', choices=['csv', 'ndjson'], help='File format (defaults to the file extension)')
+        parser.add_argument('--map', action='append', default=[], metavar='COLUMN=FIELD',
+                            help='Maps a file column onto an applicant field, e.g. --map "E-mail=email"; repeatable')
+        parser.add_argument('--chunk-size', type=int, default=5000, help='Rows validated and written per transaction')
+        parser.add_argument('--dry-run', action='store_true', help='Validate the file without writing anything')
+        parser.add_argument('--skip-embeddings', action='store_true', help='Leave embeddings for a later --embeddings-only run')
+        parser.add_argument('--embeddings-only', action='store_true', help='Only embed applicants that have resume text but no embedding')
+        parser.add_argument('--embedding-batch-size', type=int, default=256, help='Applicants per embedding encode call')
+        parser.add_argument('--show-errors', type=int, default=20, help='Rejected rows to print in full')
+
+    def handle(self, *args, **options):
+        if not options['embeddings_only']:
+            self.import_file(options)
+        if not (options['dry_run'] or options['skip_embeddings']):
+            self.embed(options)
+
+    def import_file(self, options):
+        path = options['path']
+        file_format = options['format'] or ('ndjson' if path.endswith(('.ndjson', '.jsonl')) else 'csv')
+        column_map = {}
+        for pair in options['map']:
+            column, sep, field = pair.partition('=')
+            if not sep:
+                raise CommandError(f'Invalid --map {pair!r}; expected COLUMN=FIELD')
+            column_map[column] = field
+        chunk_size = max(1, options['chunk_size'])
+
+        validator = ApplicantRowValidator(column_map)
+        totals = {'created': 0, 'updated': 0, 'unchanged': 0, 'duplicate': 0, 'rejected': 0}
+        processed = reported = 0
+        started = time.monotonic()
+        chunk = []
+
+        def report():
+            nonlocal reported
+            reported = processed
+            rate = processed / max(time.monotonic() - started, 1e-9)
+            self.stdout.write(
+                f'{processed} rows: {totals["created"]} created, {totals["updated"]} updated, '
+                f'{totals["unchanged"]} unchanged, {totals["duplicate"]} duplicate, '
+                f'{totals["rejected"]} rejected ({rate:.0f} rows/s)'
+            )
+
+        def flush():
+            rows, duplicates = dedupe_rows(chunk)
+            totals['duplicate'] += duplicates
+            if not options['dry_run']:
+                for outcome, count in get_loader(validator.mapped).load(rows).items():
+                    totals[outcome] += count
+            chunk.clear()
+            report()
+
+        try:
+            for line, row in read_rows(path, file_format):
+                processed += 1
+                attrs, errors = validator.validate(row)
+                if errors:
+                    totals['rejected'] += 1
+                    if totals['rejected'] <= options['show_errors']:
+                        self.stderr.write(f'Line {line}: {errors}')
+                    continue
+                chunk.append(attrs)
+                if len(chunk) >= chunk_size:
+                    flush()
+        except OSError as exc:
+            raise CommandError(f'Cannot read {path}: {exc}')
+        if chunk:
+            flush()
+        elif reported != processed or not processed:
+            report()
+
+        if validator.ignored:
+            self.stdout.write(self.style.WARNING(f'Ignored columns: {", ".join(sorted(map(str, validator.ignored)))}'))
+        if not options['dry_run']:
+            invalidate_applicant_facets()
+        self.stdout.write(self.style.SUCCESS(
+            f'{"Validated" if options["dry_run"] else "Imported"} {processed} rows in {time.monotonic() - started:.1f}s.'
+        ))
+
+    def embed(self, options):
+        batch_size = max(1, options['embedding_batch_size'])
+        started = time.monotonic()
+        report_every = max(batch_size, options['chunk_size'])
+        reported = 0
+
+        def progress(done):
+            nonlocal reported
+            if done - reported >= report_every:
+                reported = done
+                self.stdout.write(f'Embedded {done} applicants...')
+
+        done = embed_missing_applicants(batch_size, progress)
+        self.stdout.write(self.style.SUCCESS(f'Embedded {done} applicants in {time.monotonic() - started:.1f}s.'))
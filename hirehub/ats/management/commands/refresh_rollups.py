@@ -0,0 +1,35 @@
+import datetime
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from ats.analytics import refresh_rollups
+
+class Command(BaseCommand):
+    help = (
+        'Updates the daily analytics rollups behind /api/analytics/. Only the days touched since '
+        'the previous run are recomputed; schedule it (e.g. every 15 minutes) from cron'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='Recompute every day, e.g. after deleting a job position')
+        parser.add_argument('--since', type=str, help='Recompute the days touched since this date (YYYY-MM-DD)')
+
+    def handle(self, *args, **options):
+        since = None
+        if options['since']:
+            try:
+                day = parse_date(options['since'])
+            except ValueError:
+                day = None
+            if day is None:
+                raise CommandError(f'Invalid --since {options["since"]!r}; expected YYYY-MM-DD')
+            since = timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
+
+        started = time.monotonic()
+
+        def progress(done, total):
+            self.stdout.write(f'{done}/{total} days...')
+
+        days = refresh_rollups(full=options['full'], since=since, progress=progress)
+        self.stdout.write(self.style.SUCCESS(f'Refreshed {days} days of rollups in {time.monotonic() - started:.1f}s.'))
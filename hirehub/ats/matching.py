@@ -1,5 +1,12 @@
 from .models import Applicant, JobPosition
 from pgvector.django import CosineDistance
+from .metrics import vector_search_seconds
+
+def nearest_applicants(embedding, top_n):
+    # CosineDistance: 0 = identical, 2 = opposite. So we order ascending.
+    return Applicant.objects.filter(profile__embedding__isnull=False).select_related('profile').order_by(
+        CosineDistance('profile__embedding', embedding)
+    )[:top_n]
 
 def find_top_applicants_for_job(job_id, top_n=10):
     """
@@ -12,12 +19,21 @@ def find_top_applicants_for_job(job_id, top_n=10):
             return [] # Job has no embedding yet
 
         # Find applicants and order them by the cosine distance to the job's embedding
-        # CosineDistance: 0 = identical, 2 = opposite. So we order ascending.
-        top_applicants = Applicant.objects.exclude(embedding__isnull=True).order_by(
-            CosineDistance('embedding', job.embedding)
-        )[:top_n]
+        with vector_search_seconds.time():
+            top_applicants = list(nearest_applicants(job.embedding, top_n))
 
         return top_applicants
 
     except JobPosition.DoesNotExist:
         return []
+
+async def afind_top_applicants_for_job(job_id, top_n=10):
+    """find_top_applicants_for_job() for async views."""
+    try:
+        job = await JobPosition.objects.aget(id=job_id)
+    except JobPosition.DoesNotExist:
+        return []
+    if job.embedding is None:
+        return []
+    with vector_search_seconds.time():
+        return [applicant async for applicant in nearest_applicants(job.embedding, top_n)]
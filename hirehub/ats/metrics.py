@@ -0,0 +1,182 @@
+# ats/metrics.py
+# Process-local counters and histograms, rendered in the Prometheus text format by
+# the /metrics view. RequestMetricsMiddleware times every request; the database
+# wrapper installed on each connection counts the queries of the current request;
+# ats.embeddings, ats.matching and ats.agent time their own work. Each worker
+# process keeps its own figures, so scrape every process (or run one per target).
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Upper bounds of the histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+BATCH_SIZE_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+REGISTRY = []
+
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{escape_label(value)}"' for name, value in labels) + '}'
+
+
+def format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.lock = threading.Lock()
+        self.values = {}
+        REGISTRY.append(self)
+
+    def label_key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f'{self.name} takes the labels {", ".join(self.labelnames) or "(none)"}.')
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def reset(self):
+        with self.lock:
+            self.values.clear()
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        with self.lock:
+            items = sorted(self.values.items())
+            for key, value in items:
+                lines.extend(self.sample_lines(list(zip(self.labelnames, key)), value))
+        return lines
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self.label_key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def sample_lines(self, labels, value):
+        return [f'{self.name}{format_labels(labels)} {format_value(value)}']
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets) + (float('inf'),)
+
+    def observe(self, value, **labels):
+        key = self.label_key(labels)
+        with self.lock:
+            counts, total = self.values.get(key, ([0] * len(self.buckets), 0))
+            counts[bisect.bisect_left(self.buckets, value)] += 1
+            self.values[key] = (counts, total + value)
+
+    @contextmanager
+    def time(self, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def sample_lines(self, labels, value):
+        counts, total = value
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, counts):
+            cumulative += count
+            lines.append(f'{self.name}_bucket{format_labels(labels + [("le", format_value(bound))])} {cumulative}')
+        lines.append(f'{self.name}_sum{format_labels(labels)} {format_value(total)}')
+        lines.append(f'{self.name}_count{format_labels(labels)} {cumulative}')
+        return lines
+
+
+def render_metrics():
+    """Every registered metric in the Prometheus text exposition format (version 0.0.4)."""
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+
+request_seconds = Histogram(
+    'hirehub_http_request_duration_seconds', 'Time from the first middleware to the response, per view.',
+    ('view', 'method', 'status'),
+)
+request_queries = Histogram(
+    'hirehub_http_request_db_queries', 'Database queries issued while handling a request.',
+    ('view',), buckets=QUERY_COUNT_BUCKETS,
+)
+request_query_seconds = Histogram(
+    'hirehub_http_request_db_duration_seconds', 'Time spent in database queries while handling a request.',
+    ('view',),
+)
+embedding_seconds = Histogram('hirehub_embedding_encode_duration_seconds', 'Time taken by one encode call of the embedding model.')
+embedding_batch_size = Histogram(
+    'hirehub_embedding_batch_size', 'Texts encoded by one call of the embedding model.', buckets=BATCH_SIZE_BUCKETS,
+)
+vector_search_seconds = Histogram('hirehub_vector_search_duration_seconds', 'Time taken by one nearest-applicant search.')
+llm_seconds = Histogram(
+    'hirehub_llm_request_duration_seconds', 'Time taken by one chat API call, by outcome.', ('outcome',),
+)
+llm_tokens = Counter('hirehub_llm_tokens_total', 'Tokens reported by the chat API, by type.', ('type',))
+
+
+class RequestStats:
+    """
+    The database work of one request, filled in by query_wrapper(). Setting
+    `query_log` to a list also collects (sql, seconds) per query, as
+    ats.profiling does for a profiled request.
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.query_seconds = 0.0
+        self.query_log = None
+
+
+# Set by RequestMetricsMiddleware; sync_to_async carries it into the ORM's thread
+current_request_stats = ContextVar('current_request_stats', default=None)
+
+
+def query_wrapper(execute, sql, params, many, context):
+    stats = current_request_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - started
+        stats.queries += 1
+        stats.query_seconds += elapsed
+        if stats.query_log is not None:
+            stats.query_log.append((sql, elapsed))
+
+
+def install_query_wrapper(sender, connection, **kwargs):
+    """
+    connection_created receiver adding query_wrapper() to every new connection, as
+    connection.execute_wrapper() would for a block, so queries run in any thread
+    are counted against the request that issued them.
+    """
+    if query_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(query_wrapper)
@@ -0,0 +1,174 @@
+# ats/middleware.py
+import logging
+import time
+from asgiref.sync import async_to_sync, iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+from django.utils.regex_helper import _lazy_re_compile
+from .metrics import RequestStats, current_request_stats, request_queries, request_query_seconds, request_seconds
+from .profiling import profile_request, profile_requested, should_profile
+
+try:
+    import brotli
+except ImportError:  # optional; responses are gzipped instead
+    brotli = None
+
+# Text formats worth compressing; images, PDFs and resume uploads already are
+COMPRESSIBLE_CONTENT_TYPES = {
+    'application/json', 'application/x-ndjson', 'text/html', 'text/csv',
+}
+# Formats that may be Brotli-compressed. HTML pages carry CSRF tokens, so they keep
+# to gzip, whose randomised padding (Django's "Heal The Breach") guards against BREACH
+BROTLI_CONTENT_TYPES = COMPRESSIBLE_CONTENT_TYPES - {'text/html'}
+# Brotli's fast levels compress dynamic text better than gzip -6 at similar speed
+BROTLI_QUALITY = 5
+
+re_accepts_brotli = _lazy_re_compile(r'\bbr\b')
+
+# Methods labelled by name in the request metrics; anything else is 'other'
+METRIC_METHODS = {'GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'}
+
+logger = logging.getLogger(__name__)
+
+
+def brotli_sequence(sequence):
+    compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+    for item in sequence:
+        data = compressor.process(item)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    Compresses JSON, NDJSON, CSV and HTML responses of at least
+    ATS_COMPRESSION_MIN_SIZE bytes (streamed responses regardless of size). Brotli
+    is used for all but HTML when the client accepts it and the `brotli` package is
+    installed, otherwise gzip as in Django's GZipMiddleware, which weakens strong
+    ETags and pads its output against BREACH.
+    """
+
+    def process_response(self, request, response):
+        content_type = response.get('Content-Type', '').split(';')[0].strip().lower()
+        if content_type not in COMPRESSIBLE_CONTENT_TYPES:
+            return response
+        if not response.streaming and len(response.content) < getattr(settings, 'ATS_COMPRESSION_MIN_SIZE', 1024):
+            return response
+        if (
+            brotli is None
+            or content_type not in BROTLI_CONTENT_TYPES
+            or response.has_header('Content-Encoding')
+            or (response.streaming and response.is_async)
+            or not re_accepts_brotli.search(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        ):
+            return super().process_response(request, response)
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if response.streaming:
+            response.streaming_content = brotli_sequence(response.streaming_content)
+            del response.headers['Content-Length']
+        else:
+            compressed_content = brotli.compress(response.content, quality=BROTLI_QUALITY)
+            if len(compressed_content) >= len(response.content):
+                return response
+            response.content = compressed_content
+            response.headers['Content-Length'] = str(len(response.content))
+
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = 'br'
+        return response
+
+
+class RequestMetricsMiddleware:
+    """
+    Records the latency, query count and query time of every request in ats.metrics,
+    labelled with the URL name of the view, and logs a warning for requests taking
+    ATS_SLOW_REQUEST_SECONDS or longer. List it first so the other middleware is
+    timed too. Works in sync and async stacks; the time of a streamed body is not
+    included.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats = RequestStats()
+        token = current_request_stats.set(stats)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            current_request_stats.reset(token)
+        self.record(request, response, stats, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        stats = RequestStats()
+        token = current_request_stats.set(stats)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_request_stats.reset(token)
+        self.record(request, response, stats, time.perf_counter() - started)
+        return response
+
+    def record(self, request, response, stats, elapsed):
+        view = request.resolver_match.view_name if request.resolver_match else 'unmatched'
+        method = request.method if request.method in METRIC_METHODS else 'other'
+        request_seconds.observe(elapsed, view=view, method=method, status=response.status_code)
+        request_queries.observe(stats.queries, view=view)
+        request_query_seconds.observe(stats.query_seconds, view=view)
+
+        threshold = getattr(settings, 'ATS_SLOW_REQUEST_SECONDS', 1.0)
+        if threshold is not None and elapsed >= threshold:
+            logger.warning(
+                'Slow request: %s %s (%s) took %.3fs, %d queries in %.3fs',
+                request.method, request.path, view, elapsed, stats.queries, stats.query_seconds,
+            )
+
+
+class ProfilingMiddleware:
+    """
+    Profiles the requests a staff user asks for with an X-Profile header or ?profile=;
+    see ats.profiling. List it after AuthenticationMiddleware. Under ASGI a profiled
+    request runs on a thread of its own, which is where cProfile looks: the code it
+    awaits still runs on the event loop, while its synchronous parts (sync views, the
+    ORM, rendering) are routed back to that thread.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not should_profile(request, request.user):
+            return self.get_response(request)
+        return profile_request(request, self.get_response)
+
+    async def __acall__(self, request):
+        if not profile_requested(request) or not should_profile(request, await request.auser()):
+            return await self.get_response(request)
+        return await sync_to_async(self.profile_on_thread, thread_sensitive=False)(request)
+
+    def profile_on_thread(self, request):
+        try:
+            return profile_request(request, async_to_sync(self.get_response))
+        finally:
+            connections.close_all()  # this thread's connections; the pool thread may not serve a request again
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.2 on 2026-10-19 09:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ats', '0005_applicant_embedding_jobposition_embedding'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='applicant',
+            index=models.Index(fields=['created_at', 'id'], name='ats_applicant_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='applicant',
+            index=models.Index(fields=['updated_at', 'id'], name='ats_applicant_updated_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='applicant',
+            index=models.Index(fields=['name', 'id'], name='ats_applicant_name_id_idx'),
+        ),
+    ]
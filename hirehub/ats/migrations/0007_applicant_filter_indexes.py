@@ -0,0 +1,29 @@
+# Generated by Django 5.2.2 on 2026-10-19 09:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ats', '0006_applicant_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='applicant',
+            index=models.Index(fields=['current_stage', 'created_at', 'id'], name='ats_applicant_stage_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='applicant',
+            index=models.Index(fields=['source', 'created_at', 'id'], name='ats_applicant_source_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='applicant',
+            index=models.Index(fields=['job_position', 'created_at', 'id'], name='ats_applicant_position_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='applicant',
+            index=models.Index(fields=['job_position', 'current_stage', 'created_at', 'id'], name='ats_applicant_pos_stage_idx'),
+        ),
+    ]
@@ -0,0 +1,80 @@
+# Generated by Django 5.2.2 on 2026-10-19 10:05
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+SEARCH_COLUMNS = ('name', 'email', 'tags')
+
+# PostgreSQL: GIN trigram indexes on the same UPPER(column) expression that the
+# icontains lookup compiles to, so leading-wildcard LIKE searches use an index.
+POSTGRES_FORWARD = [
+    f'CREATE INDEX IF NOT EXISTS ats_applicant_{column}_trgm_idx '
+    f'ON ats_applicant USING gin (UPPER("{column}") gin_trgm_ops)'
+    for column in SEARCH_COLUMNS
+]
+POSTGRES_REVERSE = [
+    f'DROP INDEX IF EXISTS ats_applicant_{column}_trgm_idx' for column in SEARCH_COLUMNS
+]
+
+# SQLite: an external-content FTS5 table with the trigram tokenizer, kept in sync
+# with ats_applicant by triggers. MATCH on it is a case-insensitive substring search.
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS ats_applicant_search USING fts5(
+        name, email, tags, content='ats_applicant', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS ats_applicant_search_ai AFTER INSERT ON ats_applicant BEGIN
+        INSERT INTO ats_applicant_search(rowid, name, email, tags)
+        VALUES (new.id, new.name, new.email, new.tags);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS ats_applicant_search_ad AFTER DELETE ON ats_applicant BEGIN
+        INSERT INTO ats_applicant_search(ats_applicant_search, rowid, name, email, tags)
+        VALUES ('delete', old.id, old.name, old.email, old.tags);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS ats_applicant_search_au
+    AFTER UPDATE OF name, email, tags ON ats_applicant BEGIN
+        INSERT INTO ats_applicant_search(ats_applicant_search, rowid, name, email, tags)
+        VALUES ('delete', old.id, old.name, old.email, old.tags);
+        INSERT INTO ats_applicant_search(rowid, name, email, tags)
+        VALUES (new.id, new.name, new.email, new.tags);
+    END
+    """,
+    "INSERT INTO ats_applicant_search(ats_applicant_search) VALUES ('rebuild')",
+]
+SQLITE_REVERSE = [
+    'DROP TRIGGER IF EXISTS ats_applicant_search_au',
+    'DROP TRIGGER IF EXISTS ats_applicant_search_ad',
+    'DROP TRIGGER IF EXISTS ats_applicant_search_ai',
+    'DROP TABLE IF EXISTS ats_applicant_search',
+]
+
+
+def run_statements(schema_editor, statements_by_vendor):
+    for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+def create_search_indexes(apps, schema_editor):
+    run_statements(schema_editor, {'postgresql': POSTGRES_FORWARD, 'sqlite': SQLITE_FORWARD})
+
+
+def drop_search_indexes(apps, schema_editor):
+    run_statements(schema_editor, {'postgresql': POSTGRES_REVERSE, 'sqlite': SQLITE_REVERSE})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ats', '0007_applicant_filter_indexes'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.2 on 2026-10-19 09:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ats', '0008_applicant_search_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='applicant',
+            name='normalized_tags',
+            field=models.ManyToManyField(blank=True, related_name='applicants', to='ats.tag'),
+        ),
+        migrations.AddField(
+            model_name='jobposition',
+            name='normalized_tags',
+            field=models.ManyToManyField(blank=True, related_name='job_positions', to='ats.tag'),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.2 on 2026-10-19 09:20
+
+from django.db import migrations
+
+CHUNK_SIZE = 2000
+
+
+def parse_tags(value):
+    # Frozen copy of ats.tags.parse_tags so the migration does not depend on app code
+    names = []
+    for part in (value or '').split(','):
+        name = part.strip().lower()[:100]
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+def backfill_model(Tag, Model, fk_name):
+    Through = Model.normalized_tags.through
+    tag_ids = dict(Tag.objects.values_list('name', 'id'))
+
+    def flush(rows):
+        missing = {name for _, names in rows for name in names if name not in tag_ids}
+        if missing:
+            Tag.objects.bulk_create([Tag(name=name) for name in missing], ignore_conflicts=True)
+            tag_ids.update(Tag.objects.filter(name__in=missing).values_list('name', 'id'))
+        Through.objects.bulk_create(
+            [Through(**{fk_name: pk, 'tag_id': tag_ids[name]}) for pk, names in rows for name in names],
+            ignore_conflicts=True,
+        )
+
+    rows = []
+    for pk, tags in Model.objects.exclude(tags='').values_list('pk', 'tags').iterator(chunk_size=CHUNK_SIZE):
+        names = parse_tags(tags)
+        if names:
+            rows.append((pk, names))
+        if len(rows) >= CHUNK_SIZE:
+            flush(rows)
+            rows = []
+    if rows:
+        flush(rows)
+
+
+def backfill_normalized_tags(apps, schema_editor):
+    Tag = apps.get_model('ats', 'Tag')
+    backfill_model(Tag, apps.get_model('ats', 'Applicant'), 'applicant_id')
+    backfill_model(Tag, apps.get_model('ats', 'JobPosition'), 'jobposition_id')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ats', '0009_tag'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_normalized_tags, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.2 on 2026-10-19 09:40
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ats', '0010_backfill_normalized_tags'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobposition',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.2 on 2026-10-19 09:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ats', '0011_jobposition_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicantTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('applicant_id', models.BigIntegerField()),
+                ('deleted_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['deleted_at', 'applicant_id'],
+                'indexes': [models.Index(fields=['deleted_at', 'applicant_id'], name='ats_tombstone_deleted_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,120 @@
+# Generated by Django 5.2.2 on 2026-10-19 09:28
+
+from importlib import import_module
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import Lower, Now, Trim
+
+search_indexes = import_module('ats.migrations.0008_applicant_search_indexes')
+
+
+# Free-text notes of duplicate applications are kept side by side rather than picked from
+APPENDED_FIELDS = (
+    'interviewers', 'interview_dates', 'comments_ta', 'comments_initial_call',
+    'comments_evaluation', 'overall_feedback',
+)
+# Neither copied nor compared: the key, and the timestamps of the surviving row
+MERGE_SKIPPED_FIELDS = {'id', 'email', 'job_position_id', 'created_at', 'updated_at', 'last_status_update'}
+
+
+def is_empty(value):
+    value = getattr(value, 'name', value)  # a resume FieldFile
+    return value is None or (isinstance(value, str) and not value.strip())
+
+
+def merge_duplicates(survivor, losers):
+    """
+    The changes that fold `losers` (newest first) into `survivor`: empty fields take
+    the newest non-empty value, notes are appended, tags are united and created_at
+    becomes the earliest one.
+    """
+    rows = [survivor, *losers]
+    changes = {}
+    for field in survivor._meta.concrete_fields:
+        name = field.attname
+        if name in MERGE_SKIPPED_FIELDS:
+            continue
+        values = [getattr(row, name) for row in rows]
+        if name in APPENDED_FIELDS:
+            notes = list(dict.fromkeys(value.strip() for value in values if value and value.strip()))
+            merged = '\n\n'.join(notes)
+        elif name == 'tags':
+            tags = [tag.strip() for value in values for tag in (value or '').split(',')]
+            merged = ', '.join(dict.fromkeys(tag for tag in tags if tag))
+        else:
+            # Picked, not compared: the embedding is an array
+            merged = next((value for value in values if not is_empty(value)), values[0])
+            if merged is not values[0]:
+                changes[name] = merged
+            continue
+        if merged != values[0]:
+            changes[name] = merged
+    created_at = min(row.created_at for row in rows)
+    if created_at != survivor.created_at:
+        changes['created_at'] = created_at
+    return changes
+
+
+def normalize_and_merge_emails(apps, schema_editor):
+    """
+    Normalises every email (as ats.models.normalize_email does) and, where that leaves
+    several applications for the same person and position, merges them into the most
+    recently updated one (see merge_duplicates()), which also gains their tags. The
+    merged rows are then removed and get tombstones so delta-sync clients drop them
+    too. Applications without a position are left alone: the constraint does not
+    cover them, since NULLs are distinct.
+
+    Every row changed gets a new updated_at, so delta sync and the API validators
+    pick up the change. Duplicates are found on the normalised email before any is
+    written, so the survivor is still the row its owner updated last.
+    """
+    Applicant = apps.get_model('ats', 'Applicant')
+    ApplicantTombstone = apps.get_model('ats', 'ApplicantTombstone')
+    positioned = Applicant.objects.filter(job_position__isnull=False).annotate(normalized_email=Lower(Trim('email')))
+
+    duplicates = (
+        positioned.values('normalized_email', 'job_position')
+        .annotate(rows=Count('id'))
+        .filter(rows__gt=1)
+    )
+    for group in list(duplicates):
+        survivor, *losers = (
+            positioned.filter(normalized_email=group['normalized_email'], job_position=group['job_position'])
+            .order_by('-updated_at', '-id')
+        )
+        loser_ids = [loser.pk for loser in losers]
+        changes = merge_duplicates(survivor, losers)
+        through = Applicant.normalized_tags.through.objects
+        tag_ids = set(through.filter(applicant_id__in=loser_ids).values_list('tag_id', flat=True))
+        tag_ids -= set(through.filter(applicant_id=survivor.pk).values_list('tag_id', flat=True))
+        if changes or tag_ids:
+            Applicant.objects.filter(pk=survivor.pk).update(**changes, updated_at=Now())
+        survivor.normalized_tags.add(*tag_ids)
+        Applicant.objects.filter(id__in=loser_ids).delete()
+        ApplicantTombstone.objects.bulk_create([ApplicantTombstone(applicant_id=pk) for pk in loser_ids])
+
+    Applicant.objects.exclude(email=Lower(Trim('email'))).update(email=Lower(Trim('email')), updated_at=Now())
+
+
+def restore_search_triggers(apps, schema_editor):
+    # SQLite adds the constraint by rebuilding ats_applicant, which drops the
+    # triggers that keep the search index in sync; put them back.
+    search_indexes.run_statements(schema_editor, {'sqlite': search_indexes.SQLITE_FORWARD})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ats', '0012_applicanttombstone'),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_and_merge_emails, migrations.RunPython.noop),
+        migrations.RunPython(migrations.RunPython.noop, restore_search_triggers),
+        migrations.AddConstraint(
+            model_name='applicant',
+            constraint=models.UniqueConstraint(fields=('email', 'job_position'), name='ats_applicant_email_position_uniq'),
+        ),
+        migrations.RunPython(restore_search_triggers, migrations.RunPython.noop),
+    ]
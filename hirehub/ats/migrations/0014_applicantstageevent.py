@@ -0,0 +1,48 @@
+# Generated by Django 5.2.2 on 2026-10-19 09:41
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def backfill_stage_events(apps, schema_editor):
+    """
+    Seeds one event per applicant from its current state, in a single INSERT ... SELECT.
+    The real history is unknown: applicants still in Submitted entered it when they were
+    created; for later stages last_status_update is the best available estimate.
+    """
+    Applicant = apps.get_model('ats', 'Applicant')
+    ApplicantStageEvent = apps.get_model('ats', 'ApplicantStageEvent')
+    applicant = Applicant._meta.db_table
+    event = ApplicantStageEvent._meta.db_table
+    schema_editor.execute(
+        f"INSERT INTO {event} (applicant_id, from_stage, to_stage, at) "
+        f"SELECT a.id, '', a.current_stage, "
+        f"CASE WHEN a.current_stage = 'Submitted' THEN a.created_at ELSE a.last_status_update END "
+        f"FROM {applicant} a WHERE NOT EXISTS (SELECT 1 FROM {event} e WHERE e.applicant_id = a.id)"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ats', '0013_applicant_email_position_unique'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicantStageEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('from_stage', models.CharField(blank=True, choices=[('Submitted', 'Submitted'), ('Under Review', 'Under Review'), ('Interview Stage', 'Interview Stage'), ('Technical Assessment', 'Technical Assessment'), ('Final Interview', 'Final Interview'), ('Offer Extended', 'Offer Extended'), ('Hired', 'Hired'), ('Rejected', 'Rejected')], max_length=50)),
+                ('to_stage', models.CharField(choices=[('Submitted', 'Submitted'), ('Under Review', 'Under Review'), ('Interview Stage', 'Interview Stage'), ('Technical Assessment', 'Technical Assessment'), ('Final Interview', 'Final Interview'), ('Offer Extended', 'Offer Extended'), ('Hired', 'Hired'), ('Rejected', 'Rejected')], max_length=50)),
+                ('at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('applicant', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='stage_events', to='ats.applicant')),
+            ],
+            options={
+                'ordering': ['at', 'id'],
+                'indexes': [models.Index(fields=['to_stage', 'at'], name='ats_stage_event_stage_at_idx'), models.Index(fields=['applicant', 'at'], name='ats_stage_event_applicant_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_stage_events, migrations.RunPython.noop),
+    ]
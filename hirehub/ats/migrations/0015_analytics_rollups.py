@@ -0,0 +1,60 @@
+# Generated by Django 5.2.2 on 2026-10-19 09:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ats', '0014_applicantstageevent'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupRefresh',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('started_at', models.DateTimeField()),
+                ('finished_at', models.DateTimeField(auto_now_add=True)),
+                ('full', models.BooleanField(default=False)),
+                ('days', models.PositiveIntegerField()),
+            ],
+            options={
+                'ordering': ['-started_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='applicanttombstone',
+            name='applicant_created_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='FunnelDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('source', models.CharField(choices=[('LinkedIn', 'LinkedIn'), ('Indeed', 'Indeed'), ('Referral', 'Referral'), ('Company Website', 'Company Website'), ('Job Board', 'Job Board'), ('Other', 'Other')], max_length=50)),
+                ('furthest_stage', models.CharField(choices=[('Submitted', 'Submitted'), ('Under Review', 'Under Review'), ('Interview Stage', 'Interview Stage'), ('Technical Assessment', 'Technical Assessment'), ('Final Interview', 'Final Interview'), ('Offer Extended', 'Offer Extended'), ('Hired', 'Hired'), ('Rejected', 'Rejected')], max_length=50)),
+                ('applicants', models.PositiveIntegerField()),
+                ('job_position', models.ForeignKey(db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='ats.jobposition')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['day'], name='ats_funnel_rollup_day_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='HireDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('source', models.CharField(choices=[('LinkedIn', 'LinkedIn'), ('Indeed', 'Indeed'), ('Referral', 'Referral'), ('Company Website', 'Company Website'), ('Job Board', 'Job Board'), ('Other', 'Other')], max_length=50)),
+                ('days_to_hire', models.PositiveIntegerField()),
+                ('hires', models.PositiveIntegerField()),
+                ('job_position', models.ForeignKey(db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='ats.jobposition')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['day'], name='ats_hire_rollup_day_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.2 on 2026-10-19 09:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ats', '0015_analytics_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeExtraction',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('resume_file', models.CharField(max_length=255)),
+                ('status', models.CharField(choices=[('extracted', 'Extracted'), ('empty', 'No text found'), ('unsupported', 'Unsupported format'), ('too_large', 'Too large'), ('timeout', 'Timed out'), ('failed', 'Failed')], max_length=20)),
+                ('detail', models.TextField(blank=True)),
+                ('pages', models.PositiveIntegerField(blank=True, null=True)),
+                ('characters', models.PositiveIntegerField(default=0)),
+                ('extracted_at', models.DateTimeField(auto_now=True)),
+                ('applicant', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='resume_extraction', to='ats.applicant')),
+            ],
+        ),
+    ]
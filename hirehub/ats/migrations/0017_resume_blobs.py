@@ -0,0 +1,43 @@
+# Generated by Django 5.2.2 on 2026-10-19 09:55
+
+import ats.storage
+import django.utils.timezone
+import pgvector.django
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ats', '0016_resume_extraction'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('sha256', models.CharField(db_index=True, max_length=64)),
+                ('size', models.PositiveBigIntegerField()),
+                ('references', models.PositiveIntegerField(default=0)),
+                ('status', models.CharField(blank=True, max_length=20)),
+                ('detail', models.TextField(blank=True)),
+                ('pages', models.PositiveIntegerField(blank=True, null=True)),
+                ('text', models.TextField(blank=True)),
+                ('embedding', pgvector.django.VectorField(blank=True, dimensions=384, null=True)),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        # Only the storage changes, not the column; on SQLite a plain AlterField would
+        # rebuild ats_applicant and drop the search triggers of 0013
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name='applicant',
+                    name='resume_file',
+                    field=models.FileField(blank=True, null=True, storage=ats.storage.ContentAddressedStorage(), upload_to='resumes/'),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,82 @@
+# Generated by Django 5.2.2 on 2026-10-19 09:58
+
+from importlib import import_module
+
+import django.db.models.deletion
+import pgvector.django
+from django.db import migrations, models
+
+search_indexes = import_module('ats.migrations.0008_applicant_search_indexes')
+
+TEXT_COLUMNS = ['resume_text', 'comments_ta', 'comments_initial_call', 'comments_evaluation', 'overall_feedback']
+
+
+def copy_to_profiles(apps, schema_editor):
+    # One profile per applicant, in a single INSERT ... SELECT
+    columns = ', '.join(TEXT_COLUMNS + ['embedding'])
+    schema_editor.execute(
+        f'INSERT INTO ats_applicantprofile (applicant_id, {columns}) SELECT id, {columns} FROM ats_applicant'
+    )
+
+
+def copy_from_profiles(apps, schema_editor):
+    def from_profile(column, default):
+        value = f'(SELECT p.{column} FROM ats_applicantprofile p WHERE p.applicant_id = ats_applicant.id)'
+        return f'{column} = COALESCE({value}, {default})' if default else f'{column} = {value}'
+
+    assignments = [from_profile(column, "''") for column in TEXT_COLUMNS] + [from_profile('embedding', None)]
+    schema_editor.execute(f'UPDATE ats_applicant SET {", ".join(assignments)}')
+
+
+def restore_search_triggers(apps, schema_editor):
+    # Re-adding the columns on SQLite rebuilds ats_applicant, which drops the
+    # triggers that keep the search index in sync; put them back.
+    search_indexes.run_statements(schema_editor, {'sqlite': search_indexes.SQLITE_FORWARD})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ats', '0017_resume_blobs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicantProfile',
+            fields=[
+                ('applicant', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='profile', serialize=False, to='ats.applicant')),
+                ('resume_text', models.TextField(blank=True)),
+                ('comments_ta', models.TextField(blank=True, verbose_name='Technical Assessment Comments')),
+                ('comments_initial_call', models.TextField(blank=True, verbose_name='Initial Call Comments')),
+                ('comments_evaluation', models.TextField(blank=True, verbose_name='Evaluation Comments')),
+                ('overall_feedback', models.TextField(blank=True)),
+                ('embedding', pgvector.django.VectorField(blank=True, dimensions=384, null=True)),
+            ],
+        ),
+        migrations.RunPython(copy_to_profiles, copy_from_profiles),
+        migrations.RunPython(migrations.RunPython.noop, restore_search_triggers),
+        migrations.RemoveField(
+            model_name='applicant',
+            name='comments_evaluation',
+        ),
+        migrations.RemoveField(
+            model_name='applicant',
+            name='comments_initial_call',
+        ),
+        migrations.RemoveField(
+            model_name='applicant',
+            name='comments_ta',
+        ),
+        migrations.RemoveField(
+            model_name='applicant',
+            name='embedding',
+        ),
+        migrations.RemoveField(
+            model_name='applicant',
+            name='overall_feedback',
+        ),
+        migrations.RemoveField(
+            model_name='applicant',
+            name='resume_text',
+        ),
+    ]
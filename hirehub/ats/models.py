@@ -1,14 +1,44 @@
 # ats/models.py
+import uuid
 from django.db import models
+from django.utils import timezone
 from pgvector.django import VectorField
+from .storage import resume_storage
+
+def normalize_email(email):
+    """Canonical email used for the (email, job_position) uniqueness: trimmed and lower-cased."""
+    return (email or '').strip().lower()
+
+def profile_property(name):
+    """An Applicant attribute (and constructor keyword) stored on its ApplicantProfile."""
+    def get(applicant):
+        return getattr(applicant.get_profile(), name)
+
+    def set(applicant, value):
+        setattr(applicant.get_profile(), name, value)
+
+    return property(get, set, doc=f'ApplicantProfile.{name}')
+
+class Tag(models.Model):
+    # Normalised (stripped, lower-cased) tag name; see ats.tags.parse_tags
+    name = models.CharField(max_length=100, unique=True)
+
+    def __str__(self):
+        return self.name
+
+    class Meta:
+        ordering = ['name']
 
 class JobPosition(models.Model):
     title = models.CharField(max_length=255)
     description = models.TextField()
     requirements = models.TextField()
     tags = models.TextField(blank=True, help_text="Comma-separated tags")
+    # Indexed copy of `tags`, kept in sync on save by ats.signals
+    normalized_tags = models.ManyToManyField(Tag, blank=True, related_name='job_positions')
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     embedding = VectorField(dimensions=384, blank=True, null=True)
 
     def __str__(self):
@@ -25,6 +55,19 @@ class Applicant(models.Model):
         ('Hired', 'Hired'),
         ('Rejected', 'Rejected'),
     ]
+
+    # Stage -> stages it may move to in a bulk transition: forward through the pipeline,
+    # rejection from any open stage, and reopening a rejected application. Hired is final.
+    STAGE_TRANSITIONS = {
+        'Submitted': ['Under Review', 'Interview Stage', 'Technical Assessment', 'Rejected'],
+        'Under Review': ['Interview Stage', 'Technical Assessment', 'Rejected'],
+        'Interview Stage': ['Technical Assessment', 'Final Interview', 'Offer Extended', 'Rejected'],
+        'Technical Assessment': ['Interview Stage', 'Final Interview', 'Offer Extended', 'Rejected'],
+        'Final Interview': ['Offer Extended', 'Rejected'],
+        'Offer Extended': ['Hired', 'Rejected'],
+        'Hired': [],
+        'Rejected': ['Under Review'],
+    }
     
     SOURCE_CHOICES = [
         ('LinkedIn', 'LinkedIn'),
@@ -45,30 +88,263 @@ class Applicant(models.Model):
     current_stage = models.CharField(max_length=50, choices=STAGE_CHOICES, default='Submitted')
     source = models.CharField(max_length=50, choices=SOURCE_CHOICES)
     tags = models.TextField(blank=True, help_text="Comma-separated tags")
+    # Indexed copy of `tags`, kept in sync on save by ats.signals
+    normalized_tags = models.ManyToManyField(Tag, blank=True, related_name='applicants')
     
     # Resume
-    resume_file = models.FileField(upload_to='resumes/', blank=True, null=True)
-    resume_text = models.TextField(blank=True)
-    embedding = VectorField(dimensions=384, blank=True, null=True)
+    # Stored once per distinct content; see ats.storage and ResumeBlob
+    resume_file = models.FileField(upload_to='resumes/', storage=resume_storage, blank=True, null=True)
     
     # Interview Information
     interviewers = models.TextField(blank=True)
     interview_dates = models.TextField(blank=True)
     
     # Comments and Feedback
-    comments_ta = models.TextField(blank=True, verbose_name="Technical Assessment Comments")
-    comments_initial_call = models.TextField(blank=True, verbose_name="Initial Call Comments")
-    comments_evaluation = models.TextField(blank=True, verbose_name="Evaluation Comments")
-    overall_feedback = models.TextField(blank=True)
     final_decision = models.CharField(max_length=100, blank=True)
+
+    # Resume text, comments and embedding live on ApplicantProfile, so the rows that
+    # lists and filters scan stay narrow. They still read and write as attributes
+    # (and constructor keywords); queries go through profile__<name>.
+    PROFILE_FIELDS = (
+        'resume_text', 'comments_ta', 'comments_initial_call', 'comments_evaluation', 'overall_feedback', 'embedding',
+    )
+    resume_text = profile_property('resume_text')
+    comments_ta = profile_property('comments_ta')
+    comments_initial_call = profile_property('comments_initial_call')
+    comments_evaluation = profile_property('comments_evaluation')
+    overall_feedback = profile_property('overall_feedback')
+    embedding = profile_property('embedding')
     
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     last_status_update = models.DateTimeField(auto_now=True)
     
+    # current_stage as last read from or written to the database; ats.signals and
+    # ats.bulk compare against it to record ApplicantStageEvent rows
+    _stored_stage = None
+    # Same for resume_file ('' when there is none), for the ResumeBlob reference counts
+    _stored_resume_file = None
+
     def __str__(self):
         return f"{self.name} - {self.current_stage}"
-    
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._stored_stage = instance.__dict__.get('current_stage')
+        if 'resume_file' in instance.__dict__:
+            instance._stored_resume_file = instance.__dict__['resume_file'] or ''
+        return instance
+
+    def get_profile(self):
+        """The applicant's profile; a new one, saved with the applicant, if it has none yet."""
+        try:
+            return self.profile
+        except ApplicantProfile.DoesNotExist:
+            self.profile = ApplicantProfile(applicant=self)
+            return self.profile
+
+    def save(self, *args, **kwargs):
+        self.email = normalize_email(self.email)
+        # update_fields may name profile fields; they bump updated_at for delta sync
+        update_fields = kwargs.get('update_fields')
+        profile_fields = None
+        if update_fields is not None:
+            profile_fields = set(update_fields) & set(self.PROFILE_FIELDS)
+            if 'resume_text' in profile_fields:
+                profile_fields.add('embedding')  # refreshed by ats.signals
+            if profile_fields:
+                kwargs['update_fields'] = (set(update_fields) - profile_fields) | {'updated_at'}
+        created = self._state.adding
+        super().save(*args, **kwargs)
+        # Every applicant has a profile; an existing one is only written once it was loaded
+        if created or Applicant.profile.is_cached(self):
+            profile = self.get_profile()
+            if profile._state.adding:
+                profile.save(force_insert=True)
+            elif update_fields is None or profile_fields:
+                profile.save(update_fields=profile_fields)
+
+    class Meta:
+        ordering = ['-created_at']
+        constraints = [
+            # One application per person and position; the conflict target of upserts.
+            # Rows without a position never conflict (NULLs are distinct).
+            models.UniqueConstraint(fields=['email', 'job_position'], name='ats_applicant_email_position_uniq'),
+        ]
+        indexes = [
+            # Keyset pagination: (sort key, id) for every cursor-capable ordering
+            models.Index(fields=['created_at', 'id'], name='ats_applicant_created_id_idx'),
+            models.Index(fields=['updated_at', 'id'], name='ats_applicant_updated_id_idx'),
+            models.Index(fields=['name', 'id'], name='ats_applicant_name_id_idx'),
+            # Dashboard/API filters, each followed by the default -created_at ordering
+            models.Index(fields=['current_stage', 'created_at', 'id'], name='ats_applicant_stage_idx'),
+            models.Index(fields=['source', 'created_at', 'id'], name='ats_applicant_source_idx'),
+            models.Index(fields=['job_position', 'created_at', 'id'], name='ats_applicant_position_idx'),
+            models.Index(
+                fields=['job_position', 'current_stage', 'created_at', 'id'],
+                name='ats_applicant_pos_stage_idx',
+            ),
+        ]
+
+class ApplicantProfile(models.Model):
+    # The wide, rarely filtered part of an applicant, one-to-one by primary key. Only
+    # the detail views, matching and embedding code load it; see Applicant.PROFILE_FIELDS.
+    applicant = models.OneToOneField(Applicant, on_delete=models.CASCADE, primary_key=True, related_name='profile')
+    resume_text = models.TextField(blank=True)
+    comments_ta = models.TextField(blank=True, verbose_name="Technical Assessment Comments")
+    comments_initial_call = models.TextField(blank=True, verbose_name="Initial Call Comments")
+    comments_evaluation = models.TextField(blank=True, verbose_name="Evaluation Comments")
+    overall_feedback = models.TextField(blank=True)
+    embedding = VectorField(dimensions=384, blank=True, null=True)
+
+    def __str__(self):
+        return f"Profile of applicant {self.applicant_id}"
+
+class ApplicantTombstone(models.Model):
+    # Left behind by ats.signals when an applicant is deleted, so delta-sync
+    # clients (?updated_since= on the applicant API) can mirror the deletion
+    applicant_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+    # Lets ats.analytics refresh the rollups of the day the applicant applied
+    applicant_created_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Applicant {self.applicant_id} deleted at {self.deleted_at}"
+
+    class Meta:
+        ordering = ['deleted_at', 'applicant_id']
+        indexes = [
+            # Keyset pagination of the delta-sync deletion stream
+            models.Index(fields=['deleted_at', 'applicant_id'], name='ats_tombstone_deleted_idx'),
+        ]
+
+class ApplicantStageEvent(models.Model):
+    # Append-only history of current_stage, written by ats.signals and ats.bulk on
+    # every real stage change; from_stage is '' for the stage an applicant started in
+    applicant = models.ForeignKey(Applicant, on_delete=models.CASCADE, related_name='stage_events', db_index=False)
+    from_stage = models.CharField(max_length=50, choices=Applicant.STAGE_CHOICES, blank=True)
+    to_stage = models.CharField(max_length=50, choices=Applicant.STAGE_CHOICES)
+    at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"Applicant {self.applicant_id}: {self.from_stage or '-'} -> {self.to_stage} at {self.at}"
+
+    class Meta:
+        ordering = ['at', 'id']
+        indexes = [
+            # Funnel / SLA range scans: who entered a stage in a period
+            models.Index(fields=['to_stage', 'at'], name='ats_stage_event_stage_at_idx'),
+            # One applicant's history; also serves the foreign key
+            models.Index(fields=['applicant', 'at'], name='ats_stage_event_applicant_idx'),
+        ]
+
+class ResumeBlob(models.Model):
+    # One stored resume file per distinct content (see ats.storage), with the number of
+    # applicants using it, kept by ats.signals. Extraction and embedding results are
+    # cached here so every applicant after the first reuses them.
+    name = models.CharField(max_length=255, unique=True)
+    sha256 = models.CharField(max_length=64, db_index=True)
+    size = models.PositiveBigIntegerField()
+    references = models.PositiveIntegerField(default=0)
+    status = models.CharField(max_length=20, blank=True)
+    detail = models.TextField(blank=True)
+    pages = models.PositiveIntegerField(null=True, blank=True)
+    text = models.TextField(blank=True)
+    embedding = VectorField(dimensions=384, blank=True, null=True)
+    # Last change of `references` or reuse by an upload; unreferenced blobs are pruned
+    # after a grace period
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.name} ({self.references} applicants)"
+
+class ResumeExtraction(models.Model):
+    # Outcome of the last text extraction from an applicant's resume_file, written by
+    # ats.resumes; a file with a row here is not extracted again unless forced
+    STATUS_CHOICES = [
+        ('extracted', 'Extracted'),
+        ('empty', 'No text found'),
+        ('unsupported', 'Unsupported format'),
+        ('too_large', 'Too large'),
+        ('timeout', 'Timed out'),
+        ('failed', 'Failed'),
+    ]
+
+    applicant = models.OneToOneField(Applicant, on_delete=models.CASCADE, related_name='resume_extraction')
+    resume_file = models.CharField(max_length=255)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES)
+    detail = models.TextField(blank=True)
+    pages = models.PositiveIntegerField(null=True, blank=True)
+    characters = models.PositiveIntegerField(default=0)
+    extracted_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.resume_file}: {self.get_status_display()}"
+
+class ResumeUpload(models.Model):
+    # A chunked resume upload in progress (see ats.uploads). Chunks are written in order
+    # to `partial`, a temporary name in resume_storage, and `received` counts the bytes
+    # stored so far, which is where a client resumes after a dropped connection.
+    # Finalizing gives the file its content-addressed name and deletes the row.
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    applicant = models.ForeignKey(Applicant, on_delete=models.CASCADE, related_name='resume_uploads')
+    filename = models.CharField(max_length=255)
+    partial = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    received = models.PositiveBigIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Abandoned uploads are deleted by ats.uploads.prune_resume_uploads after a while
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.filename}: {self.received} of {self.size} bytes"
+
+class FunnelDailyRollup(models.Model):
+    # Maintained by ats.analytics.refresh_rollups: the applicants who applied on `day`
+    # for a position through a source, counted once by the furthest pipeline stage
+    # they have reached (Rejected does not count as progress)
+    day = models.DateField()
+    job_position = models.ForeignKey(
+        JobPosition, on_delete=models.DO_NOTHING, db_constraint=False, null=True, related_name='+'
+    )
+    source = models.CharField(max_length=50, choices=Applicant.SOURCE_CHOICES)
+    furthest_stage = models.CharField(max_length=50, choices=Applicant.STAGE_CHOICES)
+    applicants = models.PositiveIntegerField()
+
+    def __str__(self):
+        return f"{self.day} {self.source} {self.furthest_stage}: {self.applicants}"
+
+    class Meta:
+        indexes = [models.Index(fields=['day'], name='ats_funnel_rollup_day_idx')]
+
+class HireDailyRollup(models.Model):
+    # Maintained by ats.analytics.refresh_rollups: of the applicants who applied on
+    # `day`, how many were hired after `days_to_hire` whole days (first Hired event)
+    day = models.DateField()
+    job_position = models.ForeignKey(
+        JobPosition, on_delete=models.DO_NOTHING, db_constraint=False, null=True, related_name='+'
+    )
+    source = models.CharField(max_length=50, choices=Applicant.SOURCE_CHOICES)
+    days_to_hire = models.PositiveIntegerField()
+    hires = models.PositiveIntegerField()
+
+    def __str__(self):
+        return f"{self.day} {self.source}: {self.hires} hired in {self.days_to_hire} days"
+
+    class Meta:
+        indexes = [models.Index(fields=['day'], name='ats_hire_rollup_day_idx')]
+
+class RollupRefresh(models.Model):
+    # One row per refresh_rollups run; the latest started_at is the next run's watermark
+    started_at = models.DateTimeField()
+    finished_at = models.DateTimeField(auto_now_add=True)
+    full = models.BooleanField(default=False)
+    days = models.PositiveIntegerField()
+
+    def __str__(self):
+        return f"Rollups refreshed at {self.started_at} ({self.days} days)"
+
     class Meta:
-        ordering = ['-created_at']
\ No newline at end of file
+        ordering = ['-started_at']
@@ -0,0 +1,254 @@
+# ats/pagination.py
+import base64
+import datetime
+import json
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+from .models import ApplicantTombstone
+
+
+class KnownCountPaginator(Paginator):
+    """A Paginator that skips its COUNT(*) when the caller already knows the row count."""
+
+    def __init__(self, object_list, per_page, count=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        if count is not None:
+            self.__dict__['count'] = count  # primes the cached_property
+
+
+class ApplicantPagination(PageNumberPagination):
+    """
+    Page-number pagination for applicant listings.
+    Clients may pick a page size with ?page_size=, capped at max_page_size.
+    The view may set `known_count` to reuse a count it has already queried.
+    """
+    page_size = settings.REST_FRAMEWORK.get('PAGE_SIZE', 20)
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    known_count = None
+
+    def django_paginator_class(self, object_list, per_page):
+        return KnownCountPaginator(object_list, per_page, count=self.known_count)
+
+
+def clamp_page_size(value, default=ApplicantPagination.page_size):
+    """Parses a page size from a query string, falling back to the default."""
+    try:
+        page_size = int(value)
+    except (TypeError, ValueError):
+        return default
+    if page_size < 1:
+        return default
+    return min(page_size, ApplicantPagination.max_page_size)
+
+
+class ApplicantCursorPagination(BasePagination):
+    """
+    Keyset pagination for applicant listings, enabled with ?pagination=cursor.
+
+    Each page is fetched with a WHERE clause on the sort key and the primary key of
+    the last row already seen, e.g. (created_at, id) < (:created_at, :id), so deep
+    pages cost the same as the first one. No COUNT(*) is issued and only forward
+    paging through the opaque `next` link is supported.
+    """
+    page_size = ApplicantPagination.page_size
+    page_size_query_param = 'page_size'
+    max_page_size = ApplicantPagination.max_page_size
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = clamp_page_size(request.query_params.get(self.page_size_query_param), self.page_size)
+        self.ordering = tuple(queryset.query.order_by)
+
+        position = self.decode_cursor(request)
+        if position is not None:
+            queryset = queryset.filter(self.keyset_filter(position))
+
+        results = list(queryset[:self.page_size + 1])
+        self.has_next = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        return self.page
+
+    def keyset_filter(self, position, ordering=None):
+        """Builds the row-value comparison that starts the page after `position`."""
+        condition = None
+        equal = Q()
+        for field, value in zip(ordering or self.ordering, position):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            term = equal & Q(**{f'{name}__{lookup}': value})
+            condition = term if condition is None else condition | term
+            equal &= Q(**{name: value})
+        return condition
+
+    @staticmethod
+    def decode_payload(encoded):
+        return json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8'))
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            payload = self.decode_payload(encoded)
+            ordering, position = tuple(payload['o']), payload['p']
+        except (TypeError, ValueError, KeyError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+        # A cursor is only valid for the ordering it was issued for
+        if ordering != self.ordering or len(position) != len(ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return position
+
+    def encode_position(self, instance, ordering=None):
+        position = []
+        for field in ordering or self.ordering:
+            value = getattr(instance, field.lstrip('-'))
+            if isinstance(value, datetime.datetime):
+                value = value.isoformat() # Keep microseconds so the keyset stays exact
+            position.append(value)
+        return position
+
+    def encode_payload(self, payload):
+        payload = json.dumps(payload, separators=(',', ':'))
+        encoded = base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def encode_cursor(self, instance):
+        return self.encode_payload({'o': list(self.ordering), 'p': self.encode_position(instance)})
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1])
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class ApplicantChangesPagination(ApplicantCursorPagination):
+    """
+    Delta sync for applicant listings, enabled with ?updated_since=<ISO 8601 timestamp>.
+
+    Pages through the applicants changed at or after the timestamp in (updated_at, id)
+    order and, alongside them, the tombstones of applicants deleted since then in
+    (deleted_at, applicant_id) order. Both streams are keyset-paged on their own
+    indexes and share one opaque cursor, so a sync costs in proportion to the number
+    of changes. Delivery is at least once: once `next` is null, the client stores
+    `updated_until` and passes it as `updated_since` on its next sync.
+
+    updated_at is stamped when a row is saved, not when its transaction commits, so a
+    write committing late can carry an older timestamp than rows already delivered.
+    `updated_until` therefore never passes now minus ATS_DELTA_SYNC_LAG seconds: the
+    rows of that window are sent again on the next sync rather than missed.
+    """
+    ordering = ('updated_at', 'id')
+    TOMBSTONE_ORDERING = ('deleted_at', 'applicant_id')
+    since_query_param = 'updated_since'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = clamp_page_size(request.query_params.get(self.page_size_query_param), self.page_size)
+        self.since = self.parse_since(request)
+        rows_position, tombstones_position, self.updated_until = self.decode_changes_cursor(request)
+
+        queryset = queryset.filter(updated_at__gte=self.since)
+        if rows_position:
+            queryset = queryset.filter(self.keyset_filter(rows_position))
+        tombstones = ApplicantTombstone.objects.filter(deleted_at__gte=self.since).order_by(*self.TOMBSTONE_ORDERING)
+        if tombstones_position:
+            tombstones = tombstones.filter(self.keyset_filter(tombstones_position, self.TOMBSTONE_ORDERING))
+
+        rows = list(queryset[:self.page_size + 1])
+        deleted = list(tombstones[:self.page_size + 1])
+        self.has_next = len(rows) > self.page_size or len(deleted) > self.page_size
+        self.page, self.deleted = rows[:self.page_size], deleted[:self.page_size]
+
+        # Keep each stream's position; an exhausted stream stays where it stopped
+        self.rows_position = self.encode_position(self.page[-1]) if self.page else rows_position
+        self.tombstones_position = (
+            self.encode_position(self.deleted[-1], self.TOMBSTONE_ORDERING) if self.deleted else tombstones_position
+        )
+        seen = [self.updated_until] + [row.updated_at for row in self.page[-1:]]
+        seen += [tombstone.deleted_at for tombstone in self.deleted[-1:]]
+        self.updated_until = min(max(value for value in seen if value is not None), self.sync_horizon())
+        return self.page
+
+    def sync_horizon(self):
+        """The latest `updated_until` handed out; older writes are assumed committed."""
+        return timezone.now() - datetime.timedelta(seconds=getattr(settings, 'ATS_DELTA_SYNC_LAG', 30))
+
+    def parse_since(self, request):
+        value = parse_datetime(request.query_params[self.since_query_param].replace(' ', '+'))
+        if value is None:
+            raise ValidationError({self.since_query_param: ['Expected an ISO 8601 timestamp.']})
+        if timezone.is_naive(value):
+            value = timezone.make_aware(value, datetime.timezone.utc)
+        return value
+
+    def decode_changes_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None, None, self.since
+        try:
+            payload = self.decode_payload(encoded)
+            rows_position, tombstones_position = payload['p'], payload['d']
+            updated_until = datetime.datetime.fromisoformat(payload['u'])
+        except (TypeError, ValueError, KeyError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+        for position, ordering in ((rows_position, self.ordering), (tombstones_position, self.TOMBSTONE_ORDERING)):
+            if position is not None and len(position) != len(ordering):
+                raise NotFound(self.invalid_cursor_message)
+        return rows_position, tombstones_position, updated_until
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_payload({
+            'p': self.rows_position,
+            'd': self.tombstones_position,
+            'u': self.updated_until.isoformat(),
+        })
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'updated_until': self.updated_until,
+            'results': data,
+            'deleted': [tombstone.applicant_id for tombstone in self.deleted],
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results', 'deleted', 'updated_until'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'updated_until': {'type': 'string', 'format': 'date-time'},
+                'results': schema,
+                'deleted': {'type': 'array', 'items': {'type': 'integer'}},
+            },
+        }
@@ -0,0 +1,54 @@
+# ats/parsers.py
+import codecs
+import json
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+from .renderers import ORJSONRenderer, orjson
+
+# Decodes one JSON document; orjson when installed
+json_loads = orjson.loads if orjson else json.loads
+
+
+class ORJSONParser(JSONParser):
+    """JSONParser decoding with orjson when it is installed."""
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        try:
+            body = stream.read()
+            # orjson reads UTF-8 bytes directly; other charsets are decoded first
+            if codecs.lookup(encoding).name != 'utf-8':
+                body = body.decode(encoding)
+            return orjson.loads(body)
+        except ValueError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
+
+
+class NDJSONParser(BaseParser):
+    """
+    Parses newline-delimited JSON (one value per line, blank lines ignored) into a
+    list, so bulk endpoints accept the same rows as a JSON array or as NDJSON.
+    """
+    media_type = 'application/x-ndjson'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if stream is None:
+            return []
+
+        rows = []
+        for number, line in enumerate(codecs.getreader(encoding)(stream), start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                rows.append(json_loads(line))
+            except ValueError as exc:
+                raise ParseError(f'NDJSON parse error on line {number} - {exc}')
+        return rows
@@ -0,0 +1,142 @@
+# ats/profiling.py
+# Opt-in profiling of single requests. A staff user asks for it with an X-Profile
+# header or a ?profile= parameter; ATS_PROFILE_SAMPLE_RATE of those requests are
+# run under cProfile while their SQL is captured, and the report is written to
+# ATS_PROFILE_DIR, which keeps the newest ATS_PROFILE_MAX_REPORTS. The reports are
+# browsed at /admin/profiles/.
+import cProfile
+import datetime
+import io
+import json
+import os
+import pstats
+import random
+import re
+import time
+import uuid
+from django.conf import settings
+from django.utils import timezone
+from .metrics import RequestStats, current_request_stats
+
+PROFILE_HEADER = 'HTTP_X_PROFILE'
+PROFILE_QUERY_PARAM = 'profile'
+# Functions listed in a report, by cumulative time
+REPORT_FUNCTIONS = 60
+# Queries kept in a report; the count and total time cover all of them
+REPORT_MAX_QUERIES = 1000
+
+# <UTC timestamp>-<random>, so names sort by age
+re_report_id = re.compile(r'^\d{8}T\d{12}-[0-9a-f]{8}$')
+
+
+def profile_dir():
+    return str(getattr(settings, 'ATS_PROFILE_DIR', os.path.join(settings.BASE_DIR, 'profiles')))
+
+
+def profile_requested(request):
+    return bool(request.META.get(PROFILE_HEADER)) or PROFILE_QUERY_PARAM in request.GET
+
+
+def should_profile(request, user):
+    """Whether to profile `request`: asked for by a staff `user`, and sampled."""
+    if not profile_requested(request) or not (user.is_active and user.is_staff):
+        return False
+    return random.random() < getattr(settings, 'ATS_PROFILE_SAMPLE_RATE', 1.0)
+
+
+def profile_request(request, get_response):
+    """
+    Runs `get_response(request)` under cProfile with its queries captured, saves the
+    report and names it in the X-Profile-Report response header.
+    """
+    stats = current_request_stats.get()
+    token = None
+    if stats is None:  # RequestMetricsMiddleware is not installed
+        stats = RequestStats()
+        token = current_request_stats.set(stats)
+    stats.query_log = []
+    profiler = cProfile.Profile()
+    started = time.perf_counter()
+    try:
+        profiler.enable()
+        try:
+            response = get_response(request)
+        finally:
+            profiler.disable()
+        elapsed = time.perf_counter() - started
+        report_id = save_report(request, response, profiler, stats.query_log, elapsed)
+    finally:
+        stats.query_log = None
+        if token is not None:
+            current_request_stats.reset(token)
+    response['X-Profile-Report'] = report_id
+    return response
+
+
+def save_report(request, response, profiler, queries, elapsed):
+    """Writes <id>.json (summary, SQL and top functions) and <id>.prof (pstats) and prunes old reports."""
+    now = timezone.now()
+    report_id = f'{now.astimezone(datetime.timezone.utc):%Y%m%dT%H%M%S%f}-{uuid.uuid4().hex[:8]}'
+    directory = profile_dir()
+    os.makedirs(directory, exist_ok=True)
+
+    functions = io.StringIO()
+    pstats.Stats(profiler, stream=functions).sort_stats('cumulative').print_stats(REPORT_FUNCTIONS)
+    report = {
+        'id': report_id,
+        'created_at': now.isoformat(),
+        'method': request.method,
+        'path': request.get_full_path(),
+        'view': request.resolver_match.view_name if request.resolver_match else None,
+        'user': request.user.get_username(),
+        'status': response.status_code,
+        'duration': elapsed,
+        'query_count': len(queries),
+        'query_seconds': sum(seconds for _, seconds in queries),
+        'queries': [{'sql': sql, 'seconds': seconds} for sql, seconds in queries[:REPORT_MAX_QUERIES]],
+        'functions': functions.getvalue(),
+    }
+    profiler.dump_stats(os.path.join(directory, f'{report_id}.prof'))
+    with open(os.path.join(directory, f'{report_id}.json'), 'w', encoding='utf-8') as handle:
+        json.dump(report, handle)
+    prune_reports(getattr(settings, 'ATS_PROFILE_MAX_REPORTS', 100))
+    return report_id
+
+
+def report_ids():
+    """Stored report ids, newest first."""
+    try:
+        names = os.listdir(profile_dir())
+    except FileNotFoundError:
+        return []
+    ids = {os.path.splitext(name)[0] for name in names if name.endswith('.json')}
+    return sorted((report_id for report_id in ids if re_report_id.match(report_id)), reverse=True)
+
+
+def report_path(report_id, extension='.json'):
+    """The file of a stored report, or None for an unknown or malformed id."""
+    if not re_report_id.match(report_id or ''):
+        return None
+    path = os.path.join(profile_dir(), report_id + extension)
+    return path if os.path.exists(path) else None
+
+
+def load_report(report_id):
+    path = report_path(report_id)
+    if path is None:
+        return None
+    try:
+        with open(path, encoding='utf-8') as handle:
+            return json.load(handle)
+    except (OSError, ValueError):  # pruned or half-written meanwhile
+        return None
+
+
+def prune_reports(keep):
+    """Deletes all but the newest `keep` reports."""
+    for report_id in report_ids()[keep:]:
+        for extension in ('.json', '.prof'):
+            try:
+                os.remove(os.path.join(profile_dir(), report_id + extension))
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,39 @@
+# ats/renderers.py
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # optional; JSONRenderer's json.dumps() is used instead
+    orjson = None
+
+# Native datetimes match DRF's encoder (isoformat, 'Z' for UTC); int dict keys become strings
+ORJSON_OPTIONS = (orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer encoding with orjson when it is installed, producing the same compact
+    UTF-8 output as DRF's defaults. Types orjson does not handle natively (Decimal,
+    UUID, lazy translations, querysets) go through DRF's JSONEncoder.default().
+    Indented output (?indent=, the browsable API) and non-default UNICODE_JSON /
+    COMPACT_JSON settings keep using json.dumps().
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if orjson is None or indent or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=JSONEncoder().default, option=ORJSON_OPTIONS)
+        # Same as JSONRenderer: keep the output a strict JavaScript subset
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+def render_json(data):
+    """ORJSONRenderer output as text, for JSON embedded in templates."""
+    return ORJSONRenderer().render(data).decode('utf-8')
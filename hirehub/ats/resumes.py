@@ -0,0 +1,417 @@
+# ats/resumes.py
+import datetime
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Count, Exists, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from .bulk import embed_applicants
+from .extraction import ExtractionError, ExtractionTimeout, ResumeTooLarge, extract_text
+from .models import Applicant, ApplicantProfile, ResumeBlob, ResumeExtraction
+from .storage import content_hash, resume_storage
+
+logger = logging.getLogger(__name__)
+
+# Files a worker process extracts before it is replaced, so memory held by the
+# parsers cannot pile up in long-lived workers
+WORKER_MAX_TASKS = 200
+# Extra seconds the feeding thread waits past the timeout before it kills a worker
+# whose job ignored SIGALRM (e.g. stuck in C code)
+TIMEOUT_GRACE = 5
+
+
+def retain_resume(name):
+    """Counts one more applicant using the content-addressed resume file `name`."""
+    sha256 = content_hash(name)
+    if sha256 is None:
+        return
+    with transaction.atomic():
+        blob, created = ResumeBlob.objects.get_or_create(
+            name=name, defaults={'sha256': sha256, 'size': resume_storage.size(name), 'references': 1},
+        )
+        if not created:
+            ResumeBlob.objects.filter(pk=blob.pk).update(references=F('references') + 1, updated_at=timezone.now())
+
+
+def release_resume(name):
+    """
+    Counts one applicant fewer using `name`. The file itself stays until
+    prune_resume_blobs() removes blobs that have been unreferenced for a while.
+    """
+    if content_hash(name) is None:
+        return
+    ResumeBlob.objects.filter(name=name, references__gt=0).update(
+        references=F('references') - 1, updated_at=timezone.now(),
+    )
+
+
+def keep_unreferenced_resume(name):
+    """
+    Records a stored file no applicant took up, e.g. after a failed finalize, as an
+    unused blob, so prune_resume_blobs() deletes it once the grace period is over.
+    """
+    sha256 = content_hash(name)
+    if sha256 is None or not resume_storage.exists(name):
+        return
+    ResumeBlob.objects.get_or_create(
+        name=name, defaults={'sha256': sha256, 'size': resume_storage.size(name), 'references': 0},
+    )
+
+
+def store_legacy_resumes(progress=None):
+    """
+    Moves resume files saved before content addressing into resume_storage, pointing
+    their applicants and extractions at the new name; duplicates end up as one file.
+    `progress` is called with the running count of files. Returns (files moved,
+    distinct files they became, files missing from storage).
+    """
+    names = (
+        Applicant.objects.exclude(resume_file='').exclude(resume_file__isnull=True)
+        .order_by('resume_file').values_list('resume_file', flat=True).distinct()
+    )
+    moved = missing = 0
+    stored = set()
+    for name in list(names):
+        if content_hash(name) is not None:
+            continue
+        if not resume_storage.exists(name):
+            missing += 1
+            continue
+        with resume_storage.open(name, 'rb') as legacy:
+            new_name = resume_storage.save(name, legacy)
+        with transaction.atomic():
+            Applicant.objects.filter(resume_file=name).update(resume_file=new_name)
+            ResumeExtraction.objects.filter(resume_file=name).update(resume_file=new_name)
+        resume_storage.delete(name)
+        stored.add(new_name)
+        moved += 1
+        if progress:
+            progress(moved)
+    return moved, len(stored), missing
+
+
+def recount_resume_blobs():
+    """
+    Rebuilds the ResumeBlob rows and reference counts from the applicants, e.g. after
+    store_legacy_resumes() or writes that bypassed the signals. Returns the number
+    of blobs whose count changed.
+    """
+    names = (
+        Applicant.objects.exclude(resume_file='').exclude(resume_file__isnull=True)
+        .exclude(resume_file__in=ResumeBlob.objects.values('name'))
+        .order_by().values_list('resume_file', flat=True).distinct()
+    )
+    ResumeBlob.objects.bulk_create([
+        ResumeBlob(name=name, sha256=content_hash(name), size=resume_storage.size(name))
+        for name in names if content_hash(name) and resume_storage.exists(name)
+    ], ignore_conflicts=True)
+    users = (
+        Applicant.objects.filter(resume_file=OuterRef('name'))
+        .order_by().values('resume_file').annotate(count=Count('pk')).values('count')
+    )
+    actual = Coalesce(Subquery(users), 0)
+    return ResumeBlob.objects.annotate(actual=actual).exclude(references=F('actual')).update(
+        references=actual, updated_at=timezone.now(),
+    )
+
+
+def prune_resume_blobs(grace=datetime.timedelta(hours=1)):
+    """
+    Deletes the files and rows of blobs no applicant has used for `grace`; the delay
+    keeps a file an upload has just deduplicated against, which renews the blob (see
+    ContentAddressedStorage.store_temporary()). Each blob is re-checked and deleted
+    under a row lock, so such a renewal either comes first or waits until the file is
+    gone. Returns (blobs, bytes).
+    """
+    pruned = freed = 0
+    cutoff = timezone.now() - grace
+    for pk in list(ResumeBlob.objects.filter(references=0, updated_at__lt=cutoff).values_list('pk', flat=True)):
+        with transaction.atomic():
+            blob = ResumeBlob.objects.select_for_update().filter(pk=pk, references=0, updated_at__lt=cutoff).first()
+            if blob is None:
+                continue
+            resume_storage.delete(blob.name)
+            blob.delete()
+        pruned += 1
+        freed += blob.size
+    return pruned, freed
+
+
+def extraction_limits():
+    return {
+        'max_bytes': getattr(settings, 'ATS_RESUME_MAX_BYTES', 10 * 1024 * 1024),
+        'max_pages': getattr(settings, 'ATS_RESUME_MAX_PAGES', 20),
+        'max_chars': getattr(settings, 'ATS_RESUME_MAX_CHARS', 100000),
+        'timeout': getattr(settings, 'ATS_RESUME_EXTRACTION_TIMEOUT', 30),
+    }
+
+
+def spool_resume(resume_file, max_bytes):
+    """
+    Streams `resume_file` from its storage into a local temporary file, chunk by
+    chunk, so any storage backend works and worker processes get a plain path.
+    Raises ResumeTooLarge as soon as more than `max_bytes` have been read.
+    """
+    extension = os.path.splitext(resume_file.name)[1].lower()
+    handle = tempfile.NamedTemporaryFile(prefix='resume-', suffix=extension, delete=False)
+    try:
+        size = 0
+        with handle, resume_file.storage.open(resume_file.name, 'rb') as source:
+            for chunk in source.chunks():
+                size += len(chunk)
+                if size > max_bytes:
+                    raise ResumeTooLarge(f'Larger than the {max_bytes} byte limit')
+                handle.write(chunk)
+    except BaseException:
+        os.unlink(handle.name)
+        raise
+    return handle.name
+
+
+class ResumeExtractor:
+    """
+    Extracts resume text with `workers` processes, fed by as many threads: each thread
+    streams one file from storage, waits for a worker to extract it and saves the
+    result. With workers=0 everything runs in the calling thread instead.
+    """
+
+    def __init__(self, workers):
+        self.workers = workers
+        self._lock = threading.Lock()
+        self._pool = None
+        self._threads = None
+        self._pending = set()
+
+    def get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    # Fresh interpreters, not forks of a threaded web process
+                    mp_context=multiprocessing.get_context('spawn'),
+                    max_tasks_per_child=WORKER_MAX_TASKS,
+                )
+            return self._pool
+
+    def discard_pool(self, pool):
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        # A running job cannot be cancelled; terminating the workers is the only way
+        # to stop it. Jobs of the other workers fail with BrokenProcessPool and are
+        # picked up again by a later save or extract_resumes run.
+        for process in list((pool._processes or {}).values()):
+            process.terminate()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def extract(self, resume_file):
+        """
+        Extracts the text of `resume_file` within the configured limits:
+        {'status': 'extracted', 'text': '...', 'pages': 2, 'detail': ''}. Returns None
+        when the worker pool broke down, so the file can be tried again later.
+        """
+        limits = extraction_limits()
+        extension = os.path.splitext(resume_file.name)[1]
+        args = (extension, limits['max_pages'], limits['max_chars'], limits['timeout'])
+        try:
+            path = spool_resume(resume_file, limits['max_bytes'])
+        except ExtractionError as exc:
+            return {'status': exc.status, 'detail': str(exc)}
+        except OSError as exc:
+            return {'status': 'failed', 'detail': f'Cannot read {resume_file.name}: {exc}'}
+
+        try:
+            if not self.workers:
+                result = extract_text(path, *args)
+            else:
+                pool = self.get_pool()
+                future = pool.submit(extract_text, path, *args)
+                try:
+                    result = future.result(timeout=limits['timeout'] + TIMEOUT_GRACE if limits['timeout'] else None)
+                except FutureTimeoutError:
+                    self.discard_pool(pool)
+                    raise ExtractionTimeout(f'Extraction took longer than {limits["timeout"]}s')
+        except BrokenProcessPool:
+            logger.warning('Resume extraction worker pool broke down while extracting %s', resume_file.name)
+            return None
+        except ExtractionError as exc:
+            return {'status': exc.status, 'detail': str(exc)}
+        except Exception as exc:
+            return {'status': 'failed', 'detail': f'{type(exc).__name__}: {exc}'}
+        finally:
+            os.unlink(path)
+
+        details = []
+        if result['total_pages'] and result['pages'] < result['total_pages']:
+            details.append(f'Read the first {result["pages"]} of {result["total_pages"]} pages')
+        if len(result['text']) >= limits['max_chars']:
+            details.append(f'Truncated to {limits["max_chars"]} characters')
+        return {
+            'status': 'extracted' if result['text'] else 'empty',
+            'text': result['text'],
+            'pages': result['pages'],
+            'detail': '; '.join(details),
+        }
+
+    def submit(self, applicant_id, **options):
+        """
+        Queues extract_applicant_resume() for the applicant on the feeding threads and
+        returns its Future; an applicant already queued is not queued twice.
+        """
+        if not self.workers:
+            future = Future()
+            future.set_result(extract_applicant_resume(applicant_id, self, **options))
+            return future
+        with self._lock:
+            if self._threads is None:
+                self._threads = ThreadPoolExecutor(self.workers, thread_name_prefix='resume-extraction')
+            if applicant_id in self._pending:
+                future = Future()
+                future.set_result(None)
+                return future
+            self._pending.add(applicant_id)
+        return self._threads.submit(self.run_job, applicant_id, options)
+
+    def run_job(self, applicant_id, options):
+        try:
+            return extract_applicant_resume(applicant_id, self, **options)
+        except Exception:
+            logger.exception('Resume extraction failed for applicant %s', applicant_id)
+        finally:
+            with self._lock:
+                self._pending.discard(applicant_id)
+            # Threads hold their own connections; don't leave them open between jobs
+            connections.close_all()
+
+    def shutdown(self):
+        with self._lock:
+            threads, pool = self._threads, self._pool
+            self._threads = self._pool = None
+        if threads is not None:
+            threads.shutdown()
+        if pool is not None:
+            pool.shutdown()
+
+
+def extract_applicant_resume(applicant_id, extractor, force=False, embed=True):
+    """
+    Extracts the text of the applicant's resume_file and records the outcome as their
+    ResumeExtraction. The text fills resume_text only while that is still empty and
+    the file unchanged, and is then embedded unless embed=False. A file that already
+    has an extraction is skipped unless force=True. Content-addressed files are
+    extracted and embedded once: later applicants reuse their ResumeBlob's results.
+    Returns the status, or None when nothing was extracted.
+    """
+    applicant = (
+        Applicant.objects.filter(pk=applicant_id).select_related('profile')
+        .only('id', 'resume_file', 'profile__resume_text').first()
+    )
+    if applicant is None or not applicant.resume_file or applicant.resume_text:
+        return None
+    name = applicant.resume_file.name
+    if not force and ResumeExtraction.objects.filter(applicant_id=applicant.pk, resume_file=name).exists():
+        return None
+
+    blob = ResumeBlob.objects.filter(name=name).first()
+    if blob is not None and blob.status and not force:
+        outcome = {'status': blob.status, 'text': blob.text, 'pages': blob.pages, 'detail': blob.detail}
+    else:
+        outcome = extractor.extract(applicant.resume_file)
+        if outcome is None:
+            return None
+        if blob is not None:
+            ResumeBlob.objects.filter(pk=blob.pk).update(
+                status=outcome['status'], detail=outcome['detail'], pages=outcome.get('pages'),
+                text=outcome.get('text', ''), embedding=None,
+            )
+            blob = None
+    text = outcome.get('text', '')
+    ResumeExtraction.objects.update_or_create(
+        applicant_id=applicant.pk,
+        defaults={
+            'resume_file': name,
+            'status': outcome['status'],
+            'detail': outcome['detail'],
+            'pages': outcome.get('pages'),
+            'characters': len(text),
+        },
+    )
+    if text:
+        with transaction.atomic():
+            filled = ApplicantProfile.objects.filter(
+                applicant_id=applicant.pk, applicant__resume_file=name, resume_text='',
+            ).update(resume_text=text)
+            if filled:
+                Applicant.objects.filter(pk=applicant.pk).update(updated_at=timezone.now())
+        if filled and embed:
+            if blob is not None and blob.embedding is not None:
+                ApplicantProfile.objects.filter(pk=applicant.pk).update(embedding=blob.embedding)
+            else:
+                applicant.resume_text = text
+                embed_applicants([applicant])
+                ResumeBlob.objects.filter(name=name, text=text).update(embedding=applicant.embedding)
+    return outcome['status']
+
+
+def share_blob_embeddings():
+    """
+    Copies embeddings between resume blobs and the applicants whose resume_text is
+    their blob's extracted text, both ways, with two UPDATE statements: applicants
+    reuse a blob's embedding, and blobs keep one computed for an applicant.
+    """
+    # UPDATE cannot join, so the profile's resume_file is a subquery of its own
+    resume_file = Applicant.objects.filter(pk=OuterRef(OuterRef('pk'))).values('resume_file')[:1]
+    same_text = ResumeBlob.objects.filter(
+        name=Subquery(resume_file), text=OuterRef('resume_text'), embedding__isnull=False,
+    )
+    ApplicantProfile.objects.filter(embedding__isnull=True).exclude(resume_text='').filter(Exists(same_text)).update(
+        embedding=Subquery(same_text.values('embedding')[:1]),
+    )
+    embedded = ApplicantProfile.objects.filter(
+        applicant__resume_file=OuterRef('name'), resume_text=OuterRef('text'), embedding__isnull=False,
+    )
+    ResumeBlob.objects.filter(embedding__isnull=True).exclude(text='').filter(Exists(embedded)).update(
+        embedding=Subquery(embedded.values('embedding')[:1]),
+    )
+
+
+def pending_resumes(retry=False):
+    """
+    Applicants with a resume file but no resume text whose file has not been
+    extracted yet; with retry=True also those whose extraction found nothing.
+    """
+    queryset = (
+        Applicant.objects.exclude(resume_file='').exclude(resume_file__isnull=True).filter(profile__resume_text='')
+    )
+    if not retry:
+        extracted = ResumeExtraction.objects.filter(applicant=OuterRef('pk'), resume_file=OuterRef('resume_file'))
+        queryset = queryset.exclude(Exists(extracted))
+    return queryset
+
+
+_background = None
+_background_lock = threading.Lock()
+
+
+def schedule_resume_extraction(applicant_id):
+    """
+    Extracts the applicant's resume in the background (see ResumeExtractor), with
+    ATS_RESUME_EXTRACTION_WORKERS processes, or right away when that is 0.
+    """
+    global _background
+    workers = getattr(settings, 'ATS_RESUME_EXTRACTION_WORKERS', 2)
+    if not workers:
+        ResumeExtractor(0).submit(applicant_id)
+        return
+    with _background_lock:
+        if _background is None:
+            _background = ResumeExtractor(workers)
+    _background.submit(applicant_id)
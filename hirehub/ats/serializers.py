@@ -1,15 +1,222 @@
+import base64
+import numpy as np
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.utils.text import capfirst
 from rest_framework import serializers
-from .models import Applicant, JobPosition
+from rest_framework.settings import api_settings
+from rest_framework.validators import UniqueTogetherValidator
+from .bulk import applicant_key, bulk_create_applicants, bulk_update_applicants, upsert_applicants
+from .models import Applicant, ApplicantProfile, JobPosition, ResumeUpload, normalize_email
+from .uploads import UploadError, check_resume_name, check_uploaded_resume
+
+# Wire formats for ?include=embedding, as little-endian numpy dtypes
+EMBEDDING_DTYPES = {
+    'float32': '<f4',
+    'float16': '<f2',
+}
+DEFAULT_EMBEDDING_DTYPE = 'float32'
+
+class EmbeddingField(serializers.Field):
+    """
+    Read-only representation of a pgvector embedding as base64-encoded packed floats,
+    e.g. {"dtype": "float16", "dim": 384, "data": "..."} (~1 KB instead of ~8 KB of JSON text).
+    """
+
+    def __init__(self, dtype=DEFAULT_EMBEDDING_DTYPE, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+        self.dtype = dtype
+
+    def to_representation(self, value):
+        if value is None:
+            return None
+        vector = np.asarray(value, dtype=EMBEDDING_DTYPES[self.dtype])
+        return {
+            'dtype': self.dtype,
+            'dim': int(vector.shape[0]),
+            'data': base64.b64encode(vector.tobytes()).decode('ascii'),
+        }
+
+def is_top_level(serializer):
+    """True for the root serializer, or the child of a root `many=True` list serializer."""
+    if serializer.parent is None:
+        return True
+    return isinstance(serializer.parent, serializers.ListSerializer) and serializer.parent.parent is None
+
+def model_field_paths(fields, prefix=''):
+    """
+    Maps serializer fields onto the model field paths they read, for QuerySet.only().
+    Nested model serializers contribute `relation__field` paths, and the applicant
+    fields stored on its profile (Applicant.PROFILE_FIELDS) `profile__field` paths.
+    """
+    paths = set()
+    for field in fields.values():
+        if field.source == '*':
+            continue
+        source = field.source
+        model = getattr(getattr(field.parent, 'Meta', None), 'model', None)
+        if source in getattr(model, 'PROFILE_FIELDS', ()):
+            source = f'profile.{source}'
+        path = prefix + source.replace('.', '__')
+        paths.add(path)
+        if isinstance(field, serializers.ModelSerializer):
+            paths |= model_field_paths(field.fields, prefix=path + '__')
+    return paths
+
+class SparseFieldsetMixin:
+    """
+    Trims the top-level fields to the `fields` set in the serializer context, minus the
+    `exclude` set, e.g. from ?fields=id,name,email. Unknown names raise a ValidationError.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if not is_top_level(self):
+            return fields
+
+        requested = self.context.get('fields') or set()
+        excluded = self.context.get('exclude') or set()
+        unknown = (requested | excluded) - set(fields)
+        if unknown:
+            raise serializers.ValidationError(
+                {'fields': [f"Unknown field(s): {', '.join(sorted(unknown))}."]}
+            )
+
+        for name in list(fields):
+            if (requested and name not in requested) or name in excluded:
+                del fields[name]
+        return fields
+
+class TagsField(serializers.CharField):
+    """
+    Comma-separated tag string, stored as given. Also accepts a JSON list of tags,
+    which is joined into the same comma-separated form.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('allow_blank', True)
+        kwargs.setdefault('required', False)
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        if isinstance(data, (list, tuple)):
+            if not all(isinstance(item, str) for item in data):
+                self.fail('invalid')
+            data = ', '.join(item.strip() for item in data if item.strip())
+        return super().to_internal_value(data)
+
+class ProfileTextField(serializers.CharField):
+    """
+    A text field of ApplicantProfile, read and written through the Applicant property
+    of the same name, so it behaves as the model field it used to be.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('allow_blank', True)
+        kwargs.setdefault('required', False)
+        kwargs.setdefault('style', {'base_template': 'textarea.html'})
+        super().__init__(**kwargs)
+
+    def bind(self, field_name, parent):
+        if self.label is None:
+            self.label = capfirst(ApplicantProfile._meta.get_field(self.source or field_name).verbose_name)
+        super().bind(field_name, parent)
+
+class IncludeEmbeddingMixin:
+    """
+    Adds the model's `embedding` as an EmbeddingField when the serializer context has
+    'embedding' in its `include` set. Nested serializers never include it.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if 'embedding' in self.context.get('include', ()) and is_top_level(self):
+            fields['embedding'] = EmbeddingField(
+                dtype=self.context.get('embedding_dtype', DEFAULT_EMBEDDING_DTYPE)
+            )
+        return fields
+
+class JobPositionSerializer(SparseFieldsetMixin, IncludeEmbeddingMixin, serializers.ModelSerializer):
+    tags = TagsField()
 
-class JobPositionSerializer(serializers.ModelSerializer):
     class Meta:
         model = JobPosition
-        fields = '__all__'
+        fields = ['id', 'title', 'description', 'requirements', 'tags', 'is_active', 'created_at']
+
+class ApplicantListSerializer(serializers.ListSerializer):
+    """
+    many=True serializer for applicants, as used by the bulk endpoints. Rows are
+    validated independently: rejected rows are kept in `row_errors` by input index
+    and the valid ones are written in chunks by ats.bulk, so one bad row does not
+    sink a whole import. For updates, `instance` maps ids to the applicants being
+    changed and every row names its target with "id". With `upsert` in the context,
+    creates become an idempotent upsert on (email, job_position).
+    `row_outcomes` holds 'created', 'updated' or 'unchanged' per saved row.
+    """
+
+    def to_internal_value(self, data):
+        if not isinstance(data, list):
+            message = self.error_messages['not_a_list'].format(input_type=type(data).__name__)
+            raise serializers.ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [message]}, code='not_a_list')
+        if self.max_length is not None and len(data) > self.max_length:
+            message = self.error_messages['max_length'].format(max_length=self.max_length)
+            raise serializers.ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [message]}, code='max_length')
+
+        self.row_indexes, self.row_instances, self.row_errors = [], [], {}
+        validated = []
+        seen_keys = {}
+        for index, item in enumerate(data):
+            try:
+                attrs = self.run_child_validation(item)
+            except serializers.ValidationError as exc:
+                self.row_errors[index] = exc.detail
+                continue
+            # Two rows for the same person and position cannot both be inserted
+            if self.instance is None:
+                key = applicant_key(attrs)
+                if key in seen_keys:
+                    self.row_errors[index] = {'email': [f'Duplicates row {seen_keys[key]} of this request.']}
+                    continue
+                seen_keys[key] = index
+            validated.append(attrs)
+            self.row_indexes.append(index)
+            self.row_instances.append(self.child.instance)
+        return validated
+
+    def run_child_validation(self, data):
+        if self.instance is not None:
+            try:
+                self.child.instance = self.instance.get(int(data['id']))
+            except (TypeError, KeyError, ValueError):
+                self.child.instance = None
+            if self.child.instance is None:
+                raise serializers.ValidationError({'id': ['No applicant with this id.']})
+            self.child.initial_data = data
+        return super().run_child_validation(data)
 
-class ApplicantSerializer(serializers.ModelSerializer):
+    def create(self, validated_data):
+        if self.context.get('upsert'):
+            results = upsert_applicants(validated_data)
+            self.row_outcomes = [outcome for _, outcome in results]
+            return [applicant for applicant, _ in results]
+        self.row_outcomes = ['created'] * len(validated_data)
+        return bulk_create_applicants(validated_data)
+
+    def update(self, instance, validated_data):
+        self.row_outcomes = ['updated'] * len(validated_data)
+        return bulk_update_applicants(self.row_instances, validated_data)
+
+class ApplicantSerializer(SparseFieldsetMixin, IncludeEmbeddingMixin, serializers.ModelSerializer):
     job_position_details = JobPositionSerializer(source='job_position', read_only=True)
     applicant_id = serializers.IntegerField(source='id', read_only=True)
-    
+    tags = TagsField()
+    resume_text = ProfileTextField()
+    comments_ta = ProfileTextField()
+    comments_initial_call = ProfileTextField()
+    comments_evaluation = ProfileTextField()
+    overall_feedback = ProfileTextField()
+
     class Meta:
         model = Applicant
         fields = [
@@ -19,4 +226,85 @@ class ApplicantSerializer(serializers.ModelSerializer):
             'comments_evaluation', 'overall_feedback', 'final_decision',
             'created_at', 'updated_at', 'last_status_update'
         ]
-        read_only_fields = ['created_at', 'updated_at', 'last_status_update']
\ No newline at end of file
+        read_only_fields = ['created_at', 'updated_at', 'last_status_update']
+        list_serializer_class = ApplicantListSerializer
+
+    def get_validators(self):
+        validators = super().get_validators()
+        # An upsert resolves (email, job_position) clashes instead of rejecting them
+        if self.context.get('upsert'):
+            validators = [v for v in validators if not isinstance(v, UniqueTogetherValidator)]
+        return validators
+
+    def validate_email(self, value):
+        return normalize_email(value)
+
+    def validate_resume_file(self, value):
+        if isinstance(value, UploadedFile):
+            try:
+                check_uploaded_resume(value)
+            except UploadError as exc:
+                raise serializers.ValidationError(str(exc))
+        return value
+
+class ApplicantSummarySerializer(serializers.ModelSerializer):
+    """Slim row used by the dashboard table; omits resume and comment fields."""
+    applicant_id = serializers.IntegerField(source='id', read_only=True)
+
+    # Model fields needed to build a row, for use with QuerySet.only()
+    ONLY_FIELDS = ('id', 'name', 'email', 'job_position', 'current_stage', 'source', 'last_status_update')
+
+    class Meta:
+        model = Applicant
+        fields = [
+            'id', 'applicant_id', 'name', 'email', 'job_position',
+            'current_stage', 'source', 'last_status_update'
+        ]
+        read_only_fields = fields
+
+class ApplicantFilterSerializer(serializers.Serializer):
+    """The applicant list API's filter parameters as a JSON object; at least one is required."""
+    stage = serializers.ChoiceField(choices=Applicant.STAGE_CHOICES, required=False)
+    source = serializers.ChoiceField(choices=Applicant.SOURCE_CHOICES, required=False)
+    job_position = serializers.IntegerField(min_value=1, required=False)
+    search = serializers.CharField(required=False)
+    tag = serializers.ListField(child=serializers.CharField(), allow_empty=False, required=False)
+
+    def validate(self, attrs):
+        if not attrs:
+            raise serializers.ValidationError('At least one filter is required.')
+        return attrs
+
+class ApplicantTransitionSerializer(serializers.Serializer):
+    """Target stage and selection (explicit `ids` or a `filter`) of a bulk stage transition."""
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), allow_empty=False, required=False)
+    filter = ApplicantFilterSerializer(required=False)
+    current_stage = serializers.ChoiceField(choices=Applicant.STAGE_CHOICES)
+    dry_run = serializers.BooleanField(default=False)
+
+    def validate_ids(self, value):
+        max_rows = getattr(settings, 'ATS_BULK_MAX_ROWS', 1000)
+        if len(value) > max_rows:
+            raise serializers.ValidationError(f'Ensure this field has no more than {max_rows} elements.')
+        return list(dict.fromkeys(value))
+
+    def validate(self, attrs):
+        if ('ids' in attrs) == ('filter' in attrs):
+            raise serializers.ValidationError('Provide either "ids" or "filter".')
+        return attrs
+
+class ResumeUploadSerializer(serializers.ModelSerializer):
+    """A chunked resume upload: declared at creation, then `received` grows with each chunk."""
+    size = serializers.IntegerField(min_value=1)
+
+    class Meta:
+        model = ResumeUpload
+        fields = ['id', 'applicant', 'filename', 'size', 'received', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'received', 'created_at', 'updated_at']
+
+    def validate(self, attrs):
+        try:
+            check_resume_name(attrs['filename'], attrs['size'])
+        except UploadError as exc:
+            raise serializers.ValidationError({'filename': [str(exc)]})
+        return attrs
@@ -1,7 +1,13 @@
-from django.db.models.signals import post_save
+from functools import partial
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
 from django.dispatch import receiver
-from .models import JobPosition, Applicant
+from .models import JobPosition, Applicant, ApplicantStageEvent, ApplicantTombstone, ResumeUpload, Tag
 from .embeddings import get_embedding, generate_job_embedding_text, generate_applicant_embedding_text
+from .facets import invalidate_applicant_facets
+from .resumes import release_resume, retain_resume, schedule_resume_extraction
+from .storage import resume_storage
+from .tags import sync_tags
 
 @receiver(post_save, sender=JobPosition)
 def update_job_embedding(sender, instance, created, **kwargs):
@@ -14,7 +20,109 @@ def update_job_embedding(sender, instance, created, **kwargs):
 
 @receiver(post_save, sender=Applicant)
 def update_applicant_embedding(sender, instance, **kwargs):
+    # The resume text can only have changed if the profile was loaded; Applicant.save()
+    # writes the profile, embedding included, after the post_save signals
+    if not Applicant.profile.is_cached(instance):
+        return
     if instance.resume_text: # Only if there's resume text
         text_to_embed = generate_applicant_embedding_text(instance)
-        new_embedding = get_embedding(text_to_embed)
-        Applicant.objects.filter(pk=instance.pk).update(embedding=new_embedding)
+        instance.embedding = get_embedding(text_to_embed)
+
+@receiver(pre_save, sender=Applicant)
+def load_stored_resume_file(sender, instance, update_fields=None, **kwargs):
+    # Like load_stored_stage: the file being replaced must be known to release it
+    if instance._state.adding or instance._stored_resume_file is not None:
+        return
+    if update_fields is not None and 'resume_file' not in update_fields:
+        return
+    stored = Applicant.objects.filter(pk=instance.pk).values_list('resume_file', flat=True).first()
+    instance._stored_resume_file = stored or ''
+
+@receiver(post_save, sender=Applicant)
+def count_resume_references(sender, instance, created, update_fields=None, **kwargs):
+    # Keeps ResumeBlob.references equal to the applicants using each stored file
+    if update_fields is not None and 'resume_file' not in update_fields:
+        return
+    if 'resume_file' in instance.get_deferred_fields():
+        return
+    previous = '' if created else instance._stored_resume_file or ''
+    current = instance.resume_file.name or ''
+    if current != previous:
+        if current:
+            retain_resume(current)
+        if previous:
+            release_resume(previous)
+    instance._stored_resume_file = current
+
+@receiver(post_delete, sender=Applicant)
+def release_deleted_resume(sender, instance, **kwargs):
+    name = instance.__dict__.get('resume_file', instance._stored_resume_file)
+    if name:
+        release_resume(str(name))
+
+@receiver(post_delete, sender=ResumeUpload)
+def delete_upload_partial(sender, instance, **kwargs):
+    # Cancelled, pruned or cascaded uploads leave no partial file; a finalized one has moved it already
+    resume_storage.delete(instance.partial)
+
+@receiver(post_save, sender=Applicant)
+def queue_resume_extraction(sender, instance, update_fields=None, **kwargs):
+    # Uploaded resumes fill an empty resume_text once the upload is committed
+    if update_fields is not None and 'resume_file' not in update_fields:
+        return
+    if 'resume_file' in instance.get_deferred_fields():
+        return
+    if instance.resume_file and not instance.resume_text:
+        transaction.on_commit(partial(schedule_resume_extraction, instance.pk))
+
+@receiver(post_save, sender=JobPosition)
+@receiver(post_save, sender=Applicant)
+def update_normalized_tags(sender, instance, update_fields=None, **kwargs):
+    # Skip saves that cannot have changed the tag string
+    if update_fields is not None and 'tags' not in update_fields:
+        return
+    if 'tags' in instance.get_deferred_fields():
+        return
+    sync_tags(instance)
+
+@receiver(pre_save, sender=Applicant)
+def load_stored_stage(sender, instance, update_fields=None, **kwargs):
+    # Instances loaded without current_stage (or built by hand) read it before it is overwritten
+    if instance._state.adding or instance._stored_stage is not None:
+        return
+    if update_fields is not None and 'current_stage' not in update_fields:
+        return
+    instance._stored_stage = (
+        Applicant.objects.filter(pk=instance.pk).values_list('current_stage', flat=True).first()
+    )
+
+@receiver(post_save, sender=Applicant)
+def record_stage_event(sender, instance, created, update_fields=None, **kwargs):
+    # Only real stage changes are recorded, plus the stage a new applicant starts in
+    if update_fields is not None and 'current_stage' not in update_fields:
+        return
+    if 'current_stage' in instance.get_deferred_fields():
+        return
+    previous = None if created else instance._stored_stage
+    if instance.current_stage != previous:
+        ApplicantStageEvent.objects.create(
+            applicant=instance,
+            from_stage=previous or '',
+            to_stage=instance.current_stage,
+            at=instance.created_at if created else instance.last_status_update,
+        )
+    instance._stored_stage = instance.current_stage
+
+@receiver(post_delete, sender=Applicant)
+def record_applicant_tombstone(sender, instance, **kwargs):
+    # Delta-sync clients learn about deletions from these rows
+    ApplicantTombstone.objects.create(applicant_id=instance.pk, applicant_created_at=instance.created_at)
+
+@receiver(post_save, sender=Applicant)
+@receiver(post_delete, sender=Applicant)
+@receiver(post_save, sender=JobPosition)
+@receiver(post_delete, sender=JobPosition)
+@receiver(post_delete, sender=Tag)  # its applicant links go by cascade, without m2m_changed
+@receiver(m2m_changed, sender=Applicant.normalized_tags.through)
+def invalidate_facets(sender, **kwargs):
+    invalidate_applicant_facets()
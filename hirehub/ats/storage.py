@@ -0,0 +1,86 @@
+# ats/storage.py
+import hashlib
+import os
+import re
+import uuid
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.utils import timezone
+
+# <upload_to>/<first two hex digits>/<sha256><extension>, e.g. resumes/3f/3fa4...e1.pdf
+re_content_addressed = re.compile(r'(?:^|/)[0-9a-f]{2}/(?P<sha256>[0-9a-f]{64})(?:\.[^/]*)?$')
+
+
+def content_hash(name):
+    """The SHA-256 in a name given by ContentAddressedStorage; None for other names."""
+    match = re_content_addressed.search(name or '')
+    return match['sha256'] if match else None
+
+
+class HashingFile(File):
+    """Wraps a file so that reading it through chunks() also hashes the content."""
+
+    def __init__(self, file):
+        super().__init__(file, getattr(file, 'name', None))
+        self.sha256 = hashlib.sha256()
+
+    def chunks(self, chunk_size=None):
+        for chunk in super().chunks(chunk_size):
+            self.sha256.update(chunk if isinstance(chunk, bytes) else chunk.encode('utf-8'))
+            yield chunk
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    FileSystemStorage naming each file after the SHA-256 of its content, so the same
+    resume uploaded for five positions is stored once. The hash is computed while the
+    upload streams to a temporary name beside its final place; content that is
+    already stored is discarded and the existing name returned. ats.signals counts
+    the applicants using each file in ResumeBlob.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        # The final name comes from the content in _save(); identical content is meant to collide
+        return name
+
+    def temporary_name(self, name):
+        """A unique name beside the final place of `name` for content still being written."""
+        directory, extension = os.path.dirname(name), os.path.splitext(name)[1].lower()
+        return os.path.join(directory, f'.upload-{uuid.uuid4().hex}{extension}').replace('\\', '/')
+
+    def _save(self, name, content):
+        hashing = HashingFile(content)
+        temporary = super()._save(self.temporary_name(name), hashing)
+        return self.store_temporary(temporary, hashing.sha256.hexdigest())
+
+    def store_temporary(self, temporary, sha256=None):
+        """
+        Moves the complete file at the `temporary_name()` to its content-addressed name,
+        or deletes it when that content is already stored, and returns the final name.
+        The file is read once to hash it unless its `sha256` is known.
+
+        Reusing a stored file renews its ResumeBlob first, so prune_resume_blobs() keeps
+        it for another grace period, while the applicant taking it up is saved. The
+        renewal waits for a prune deleting that blob, which removes the file before it
+        commits; the content is then stored afresh.
+        """
+        from .models import ResumeBlob  # ats.models uses this module
+        if sha256 is None:
+            digest = hashlib.sha256()
+            with self.open(temporary, 'rb') as handle:
+                for chunk in handle.chunks():
+                    digest.update(chunk)
+            sha256 = digest.hexdigest()
+        directory, extension = os.path.dirname(temporary), os.path.splitext(temporary)[1]
+        final = os.path.join(directory, sha256[:2], sha256 + extension).replace('\\', '/')
+        ResumeBlob.objects.filter(name=final).update(updated_at=timezone.now())
+        if self.exists(final):
+            self.delete(temporary)
+        else:
+            os.makedirs(os.path.dirname(self.path(final)), exist_ok=True)
+            # Atomic within one file system; a concurrent identical upload writes the same bytes
+            os.replace(self.path(temporary), self.path(final))
+        return final
+
+
+resume_storage = ContentAddressedStorage()
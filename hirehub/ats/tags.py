@@ -0,0 +1,77 @@
+# ats/tags.py
+from django.db.models import Count
+from .models import Tag
+
+TAG_MAX_LENGTH = Tag._meta.get_field('name').max_length
+
+
+def normalize_tag(name):
+    return name.strip().lower()[:TAG_MAX_LENGTH]
+
+
+def parse_tags(value):
+    """
+    Splits a comma-separated tag string into unique normalised names, keeping order.
+    "Python, django ,python" -> ['python', 'django']
+    """
+    names = []
+    for part in (value or '').split(','):
+        name = normalize_tag(part)
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+def get_or_create_tags(names):
+    """Returns Tag rows for the given normalised names, inserting missing ones in one statement."""
+    if not names:
+        return []
+    Tag.objects.bulk_create([Tag(name=name) for name in names], ignore_conflicts=True)
+    return list(Tag.objects.filter(name__in=names))
+
+
+def sync_tags(instance):
+    """Mirrors an Applicant's or JobPosition's `tags` string into its `normalized_tags` relation."""
+    instance.normalized_tags.set(get_or_create_tags(parse_tags(instance.tags)))
+
+
+def sync_tags_many(instances):
+    """
+    sync_tags() for a batch of saved instances of one model, as written by bulk_create /
+    bulk_update (which send no post_save): one tag insert and select, one delete and one
+    insert on the join table.
+    """
+    if not instances:
+        return
+    model = type(instances[0])
+    names_by_pk = {instance.pk: parse_tags(instance.tags) for instance in instances}
+    all_names = sorted({name for names in names_by_pk.values() for name in names})
+    tags = {tag.name: tag for tag in get_or_create_tags(all_names)}
+
+    through = model.normalized_tags.through
+    column = f'{model._meta.model_name}_id'
+    through.objects.filter(**{f'{column}__in': list(names_by_pk)}).delete()
+    through.objects.bulk_create([
+        through(**{column: pk, 'tag_id': tags[name].pk})
+        for pk, names in names_by_pk.items() for name in names
+    ])
+
+def filter_by_tags(queryset, tags):
+    """Keeps rows carrying every one of the given tags (exact, normalised match)."""
+    for name in parse_tags(','.join(tags)):
+        queryset = queryset.filter(normalized_tags__name=name)
+    return queryset
+
+
+def applicant_tag_counts(applicants):
+    """
+    Counts applicants per tag with a single grouped query over the join table,
+    e.g. [{'name': 'python', 'count': 12}, ...], most used first.
+    """
+    return (
+        Tag.objects
+        .filter(applicants__in=applicants.order_by().values('pk'))
+        .values('name')
+        .annotate(count=Count('applicants'))
+        .order_by('-count', 'name')
+    )
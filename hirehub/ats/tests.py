@@ -378,6 +378,36 @@ class DashboardViewTests(TestCase):
         self.assertEqual(len(data_java_submitted), 0, "Should be 0 applicants matching stage 'Submitted' and search 'java'")
 
 
+    def test_dashboard_renders_single_page_of_slim_rows(self):
+        """Test that only the requested page is embedded, without heavy fields."""
+        response = self.client.get(self.dashboard_url, {'page_size': 2})
+        data = json.loads(response.context['applicants_json'])
+        pagination = json.loads(response.context['pagination_json'])
+
+        self.assertEqual(len(data), 2)
+        self.assertEqual(pagination['count'], 3)
+        self.assertEqual(pagination['num_pages'], 2)
+        self.assertNotIn('resume_text', data[0])
+        self.assertNotIn('comments_ta', data[0])
+
+        response_page_2 = self.client.get(self.dashboard_url, {'page_size': 2, 'page': 2})
+        data_page_2 = json.loads(response_page_2.context['applicants_json'])
+        self.assertEqual(len(data_page_2), 1)
+        self.assertEqual(data_page_2[0]['name'], self.app1.name) # Oldest applicant comes last
+
+    def test_dashboard_sorting_is_validated(self):
+        """Test whitelisted sort keys are applied and unknown ones fall back to the default."""
+        response = self.client.get(self.dashboard_url, {'ordering': 'name'})
+        names = [item['name'] for item in json.loads(response.context['applicants_json'])]
+        self.assertEqual(names, [self.app1.name, self.app2.name, self.app3.name])
+
+        response_invalid = self.client.get(self.dashboard_url, {'ordering': 'resume_text'})
+        self.assertEqual(response_invalid.status_code, 200)
+        pagination = json.loads(response_invalid.context['pagination_json'])
+        self.assertEqual(pagination['ordering'], '-created_at')
+
+
+import hashlib
 from django.core.files.uploadedfile import SimpleUploadedFile
 
 class ApplicantDetailViewTests(TestCase):
@@ -417,9 +447,24 @@ class ApplicantDetailViewTests(TestCase):
         self.assertEqual(response.status_code, 404)
 
 
-class NewApplicantViewTests(TestCase):
+import shutil
+import tempfile
+
+class TemporaryMediaRootMixin:
+    """Stores the files a test uploads under a MEDIA_ROOT of its own, deleted afterwards."""
 
     def setUp(self):
+        super().setUp()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+class NewApplicantViewTests(TemporaryMediaRootMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
         self.client = Client()
         self.new_applicant_url = reverse('ats:new_applicant')
         # Minimal valid data for a new applicant POST request
@@ -474,8 +519,9 @@ class NewApplicantViewTests(TestCase):
         else:
             print("DEBUG: new_applicant.resume_file has no 'name' attribute.")
 
-        # Check that the file name starts with the upload_to path and contains the original name part
-        self.assertTrue(new_applicant.resume_file.name.startswith('resumes/test_resume'))
+        # Check that the file is stored under the upload_to path and the SHA-256 of its content
+        digest = hashlib.sha256(resume_content).hexdigest()
+        self.assertTrue(new_applicant.resume_file.name.startswith(f'resumes/{digest[:2]}/{digest}'))
         self.assertTrue(new_applicant.resume_file.name.endswith('.txt')) # Check extension
 
         # Check file content (optional, but good for completeness)
@@ -745,6 +791,51 @@ class ApplicantListCreateAPIViewTests(TestCase):
         self.assertEqual(results_explicit[1]['name'], "SecondCreated")
         self.assertEqual(results_explicit[2]['name'], "FirstCreated")
 
+    def test_order_applicants_by_unknown_field_400_bad_request(self):
+        response = self.client.get(self.list_create_url, {'ordering': 'resume_text'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('ordering', response.data)
+
+    def test_list_applicants_page_size_is_capped(self):
+        response = self.client.get(self.list_create_url, {'page_size': 2})
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertEqual(response.data['count'], 3)
+
+        response_large = self.client.get(self.list_create_url, {'page_size': 100000})
+        self.assertEqual(response_large.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response_large.data['results']), 3)
+
+    # Keyset pagination (GET ?pagination=cursor)
+    def test_cursor_pagination_walks_all_pages_without_count(self):
+        for i in range(4):
+            Applicant.objects.create(name=f"Cursor {i}", email=f"cursor{i}@example.com", source="Other")
+        expected = list(Applicant.objects.order_by('-created_at', '-id').values_list('name', flat=True))
+
+        names = []
+        response = self.client.get(self.list_create_url, {'pagination': 'cursor', 'page_size': 3})
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', response.data)
+            names.extend(app['name'] for app in response.data['results'])
+            if not response.data['next']:
+                break
+            response = self.client.get(response.data['next'])
+        self.assertEqual(names, expected)
+
+    def test_cursor_pagination_with_name_ordering(self):
+        response = self.client.get(self.list_create_url, {'pagination': 'cursor', 'ordering': 'name', 'page_size': 2})
+        self.assertEqual([app['name'] for app in response.data['results']], [self.app1.name, self.app2.name])
+        response_next = self.client.get(response.data['next'])
+        self.assertEqual([app['name'] for app in response_next.data['results']], [self.app3.name])
+        self.assertIsNone(response_next.data['next'])
+
+    def test_cursor_pagination_rejects_unindexed_ordering_and_bad_cursor(self):
+        response = self.client.get(self.list_create_url, {'pagination': 'cursor', 'ordering': 'email'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response_bad_cursor = self.client.get(self.list_create_url, {'cursor': 'not-a-cursor'})
+        self.assertEqual(response_bad_cursor.status_code, status.HTTP_404_NOT_FOUND)
+
 
 class ApplicantDetailAPIViewTests(TestCase):
     def setUp(self):
@@ -877,3 +968,1704 @@ class ApplicantDetailAPIViewTests(TestCase):
         response = self.client.delete(self.detail_url(9999)) # Non-existent ID
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
         self.assertEqual(Applicant.objects.count(), initial_count) # Count should not change
+
+
+import base64
+import numpy as np
+from django.db import connection
+from asgiref.sync import async_to_sync
+from django.test.utils import CaptureQueriesContext
+from .models import JobPosition
+
+class EmbeddingPayloadAPITests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.position = JobPosition.objects.create(
+            title="Backend Engineer", description="Build APIs.", requirements="Python, Django"
+        )
+        for i in range(3):
+            Applicant.objects.create(
+                name=f"Embedded {i}", email=f"embedded{i}@example.com", source="Other",
+                job_position=self.position, resume_text=f"Python developer number {i}."
+            )
+
+    def test_embeddings_are_not_in_default_payloads(self):
+        response = self.client.get(reverse('ats:api_job_position_list'))
+        self.assertNotIn('embedding', response.data['results'][0])
+
+        response = self.client.get(reverse('ats:api_applicant_list'))
+        first = response.data['results'][0]
+        self.assertNotIn('embedding', first)
+        self.assertNotIn('embedding', first['job_position_details'])
+
+    def test_applicant_list_joins_job_position(self):
+        # One COUNT and one SELECT regardless of how many applicants have a position
+        with self.assertNumQueries(2):
+            self.client.get(reverse('ats:api_applicant_list'))
+
+    def test_include_embedding_returns_packed_vector(self):
+        url = reverse('ats:api_job_position_detail', kwargs={'pk': self.position.pk})
+        response = self.client.get(url, {'include': 'embedding'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        encoded = response.data['embedding']
+        self.assertEqual(encoded['dtype'], 'float32')
+        self.assertEqual(encoded['dim'], 384)
+        vector = np.frombuffer(base64.b64decode(encoded['data']), dtype='<f4')
+        self.position.refresh_from_db()
+        np.testing.assert_allclose(vector, self.position.embedding)
+
+        response_half = self.client.get(url, {'include': 'embedding', 'embedding_dtype': 'float16'})
+        self.assertEqual(len(base64.b64decode(response_half.data['embedding']['data'])), 384 * 2)
+
+        response_invalid = self.client.get(url, {'include': 'embedding', 'embedding_dtype': 'float8'})
+        self.assertEqual(response_invalid.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_include_embedding_on_applicant_list_skips_nested_position(self):
+        response = self.client.get(reverse('ats:api_applicant_list'), {'include': 'embedding'})
+        first = response.data['results'][0]
+        self.assertEqual(first['embedding']['dim'], 384)
+        self.assertNotIn('embedding', first['job_position_details'])
+
+
+class SparseFieldsetAPITests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.position = JobPosition.objects.create(
+            title="Data Engineer", description="Pipelines.", requirements="SQL"
+        )
+        self.applicant = Applicant.objects.create(
+            name="Sparse Sam", email="sam@example.com", source="Referral",
+            job_position=self.position, resume_text="Long resume text.", comments_ta="Solid."
+        )
+        self.list_url = reverse('ats:api_applicant_list')
+
+    def test_fields_param_trims_payload_and_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.list_url, {'fields': 'id,name,email'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data['results'][0]), {'id', 'name', 'email'})
+
+        select_sql = queries.captured_queries[-1]['sql']
+        self.assertIn('"name"', select_sql)
+        self.assertNotIn('resume_text', select_sql)
+        self.assertNotIn('comments_ta', select_sql)
+        self.assertNotIn('ats_jobposition', select_sql) # Nested position no longer joined
+
+    def test_exclude_param_removes_fields(self):
+        url = reverse('ats:api_applicant_detail', kwargs={'pk': self.applicant.pk})
+        response = self.client.get(url, {'exclude': 'resume_text,job_position_details'})
+        self.assertNotIn('resume_text', response.data)
+        self.assertNotIn('job_position_details', response.data)
+        self.assertEqual(response.data['comments_ta'], 'Solid.')
+
+    def test_nested_position_fields_are_loaded_when_requested(self):
+        response = self.client.get(self.list_url, {'fields': 'id,job_position_details'})
+        self.assertEqual(response.data['results'][0]['job_position_details']['title'], 'Data Engineer')
+
+    def test_position_fields_param(self):
+        response = self.client.get(reverse('ats:api_job_position_list'), {'fields': 'id,title'})
+        self.assertEqual(set(response.data['results'][0]), {'id', 'title'})
+
+    def test_unknown_field_400_bad_request(self):
+        response = self.client.get(self.list_url, {'fields': 'id,password'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_fields_param_does_not_affect_writes(self):
+        url = reverse('ats:api_applicant_detail', kwargs={'pk': self.applicant.pk})
+        response = self.client.patch(url + '?fields=id', {'name': 'Sparse Samantha'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['name'], 'Sparse Samantha')
+
+
+from io import StringIO
+from django.core.management import call_command
+
+class ExplainApplicantQueriesCommandTests(TestCase):
+    def test_prints_a_plan_per_filter_combination(self):
+        out = StringIO()
+        call_command('explain_applicant_queries', stdout=out)
+        output = out.getvalue()
+        for label in ('no filters', 'stage', 'source', 'job_position', 'stage + source', 'job_position + stage', 'search'):
+            self.assertIn(f'== {label}', output)
+        if connection.vendor == 'sqlite':
+            self.assertIn('ats_applicant_stage_idx', output)
+
+
+from importlib import import_module
+from django.core.management.base import CommandError
+from .filters import missing_search_triggers, verify_search_triggers
+
+search_indexes = import_module('ats.migrations.0008_applicant_search_indexes')
+
+class ApplicantSearchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.list_url = reverse('ats:api_applicant_list')
+        self.exact = Applicant.objects.create(
+            name="Kotlin Kim", email="kim@example.com", source="Other", tags="kotlin"
+        )
+        self.partial = Applicant.objects.create(
+            name="Lee", email="lee@example.com", source="Other", tags="java, kotlin multiplatform, android"
+        )
+
+    def test_search_is_case_insensitive_substring(self):
+        response = self.client.get(self.list_url, {'search': 'KOTL'})
+        self.assertEqual(response.data['count'], 2)
+
+    def test_search_index_follows_updates_and_deletes(self):
+        self.exact.tags = 'scala'
+        self.exact.name = 'Kim'
+        self.exact.save()
+        response = self.client.get(self.list_url, {'search': 'kotlin'})
+        self.assertEqual([app['name'] for app in response.data['results']], ['Lee'])
+
+        Applicant.objects.filter(pk=self.partial.pk).delete()
+        response = self.client.get(self.list_url, {'search': 'kotlin'})
+        self.assertEqual(response.data['count'], 0)
+
+    def test_short_search_terms_still_match(self):
+        response = self.client.get(self.list_url, {'search': 'ki'})
+        self.assertEqual([app['name'] for app in response.data['results']], ['Kotlin Kim'])
+
+    def test_lost_search_triggers_fail_migrate(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('The search triggers are SQLite only.')
+        self.assertEqual(missing_search_triggers(connection), [])
+        with connection.cursor() as cursor:
+            cursor.execute('DROP TRIGGER ats_applicant_search_au')
+        self.addCleanup(connection.cursor().execute, search_indexes.SQLITE_FORWARD[3])
+        self.assertEqual(missing_search_triggers(connection), ['ats_applicant_search_au'])
+        with self.assertRaisesMessage(CommandError, 'ats_applicant_search_au'):
+            verify_search_triggers(sender=None, using='default')
+
+    def test_relevance_ordering(self):
+        response = self.client.get(self.list_url, {'search': 'kotlin', 'ordering': 'relevance', 'fields': 'id,name'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([app['name'] for app in response.data['results']], ['Kotlin Kim', 'Lee'])
+
+
+from .models import Tag
+from .tags import parse_tags
+
+class NormalizedTagTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.list_url = reverse('ats:api_applicant_list')
+        self.java = Applicant.objects.create(name="Jav A", email="java@example.com", source="Other", tags="Java, Spring")
+        self.js = Applicant.objects.create(name="Jay Ess", email="js@example.com", source="Other", tags="javascript, react")
+        self.both = Applicant.objects.create(name="Full Stack", email="fs@example.com", source="Other", tags="java ,JavaScript")
+
+    def test_parse_tags_normalises_and_dedupes(self):
+        self.assertEqual(parse_tags(" Python, django ,python,, "), ['python', 'django'])
+        self.assertEqual(parse_tags(''), [])
+
+    def test_tags_string_is_mirrored_on_save(self):
+        self.assertEqual(sorted(self.java.normalized_tags.values_list('name', flat=True)), ['java', 'spring'])
+        self.java.tags = 'kotlin'
+        self.java.save()
+        self.assertEqual(list(self.java.normalized_tags.values_list('name', flat=True)), ['kotlin'])
+        self.assertEqual(Tag.objects.filter(name='java').count(), 1) # Shared rows, no duplicates
+
+    def test_exact_tag_filter_does_not_match_prefixes(self):
+        response = self.client.get(self.list_url, {'tag': 'java'})
+        self.assertEqual(sorted(app['name'] for app in response.data['results']), ['Full Stack', 'Jav A'])
+
+        response_all = self.client.get(self.list_url + '?tag=java&tag=javascript')
+        self.assertEqual([app['name'] for app in response_all.data['results']], ['Full Stack'])
+
+    def test_tag_counts_endpoint(self):
+        response = self.client.get(reverse('ats:api_applicant_tag_counts'))
+        counts = {row['name']: row['count'] for row in response.data}
+        self.assertEqual(counts, {'java': 2, 'javascript': 2, 'spring': 1, 'react': 1})
+
+        response_filtered = self.client.get(reverse('ats:api_applicant_tag_counts'), {'tag': 'spring'})
+        self.assertEqual(list(response_filtered.data), [{'name': 'java', 'count': 1}, {'name': 'spring', 'count': 1}])
+
+    def test_serializer_accepts_comma_string_and_list(self):
+        response = self.client.post(self.list_url, {
+            'name': 'Listy', 'email': 'listy@example.com', 'source': 'Other', 'tags': ['Go', 'rust ']
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['tags'], 'Go, rust')
+        applicant = Applicant.objects.get(pk=response.data['id'])
+        self.assertEqual(sorted(applicant.normalized_tags.values_list('name', flat=True)), ['go', 'rust'])
+
+
+from django.core.cache import cache
+
+class ApplicantFacetsAPITests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.url = reverse('ats:api_applicant_facets')
+        self.position = JobPosition.objects.create(title="QA Engineer", description="Tests.", requirements="Care")
+        Applicant.objects.create(name="F One", email="f1@example.com", source="LinkedIn", tags="python, qa",
+                                 current_stage="Submitted", job_position=self.position)
+        Applicant.objects.create(name="F Two", email="f2@example.com", source="LinkedIn", tags="python",
+                                 current_stage="Hired")
+        Applicant.objects.create(name="F Three", email="f3@example.com", source="Indeed",
+                                 current_stage="Submitted", job_position=self.position)
+
+    @staticmethod
+    def counts(buckets):
+        return {bucket['value']: bucket['count'] for bucket in buckets if bucket['count']}
+
+    def test_counts_per_facet_in_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual(self.counts(response.data['stage']), {'Submitted': 2, 'Hired': 1})
+        self.assertEqual(self.counts(response.data['source']), {'LinkedIn': 2, 'Indeed': 1})
+        self.assertEqual(response.data['job_position'], [{'value': self.position.pk, 'label': 'QA Engineer', 'count': 2}])
+        self.assertEqual(self.counts(response.data['tag']), {'python': 2, 'qa': 1})
+        # Unused choices are still listed so every dropdown option gets a count
+        self.assertEqual(len(response.data['stage']), len(Applicant.STAGE_CHOICES))
+
+    def test_counts_follow_current_filters(self):
+        response = self.client.get(self.url, {'source': 'LinkedIn'})
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual(self.counts(response.data['stage']), {'Submitted': 1, 'Hired': 1})
+        self.assertEqual(self.counts(response.data['tag']), {'python': 2, 'qa': 1})
+
+    def test_cached_until_an_applicant_is_written(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            self.client.get(self.url)
+
+        Applicant.objects.create(name="F Four", email="f4@example.com", source="Referral")
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['count'], 4)
+
+    def test_deleted_positions_and_tags_leave_the_cache(self):
+        self.client.get(self.url)
+        self.position.delete()
+        self.assertEqual(self.client.get(self.url).data['job_position'], [])
+
+        Tag.objects.get(name='qa').delete()
+        self.assertEqual(self.counts(self.client.get(self.url).data['tag']), {'python': 2})
+
+from unittest import mock
+from django.db.models import QuerySet
+
+class ConditionalRequestAPITests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.list_url = reverse('ats:api_applicant_list')
+        self.applicant = Applicant.objects.create(name="C One", email="c1@example.com", source="LinkedIn")
+        Applicant.objects.create(name="C Two", email="c2@example.com", source="Indeed")
+        self.detail_url = reverse('ats:api_applicant_detail', args=[self.applicant.pk])
+
+    def test_list_sends_validators_and_answers_304_without_loading_rows(self):
+        response = self.client.get(self.list_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('no-cache', response['Cache-Control'])
+        etag = response['ETag']
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(len(queries), 1)  # only the count/max(updated_at) aggregate
+
+    def test_list_etag_changes_on_update_and_delete(self):
+        etag = self.client.get(self.list_url)['ETag']
+        self.applicant.current_stage = "Hired"
+        self.applicant.save()
+        updated_etag = self.client.get(self.list_url)['ETag']
+        self.assertNotEqual(updated_etag, etag)
+
+        Applicant.objects.filter(name="C Two").delete()
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=updated_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 1)
+
+    def test_list_etag_depends_on_filters(self):
+        etag = self.client.get(self.list_url, {'source': 'LinkedIn'})['ETag']
+        response = self.client.get(self.list_url, {'source': 'Indeed'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_detail_if_none_match_and_if_modified_since(self):
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag, last_modified = response['ETag'], response['Last-Modified']
+
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        response = self.client.get(self.detail_url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_patch_with_stale_if_match_is_rejected(self):
+        etag = self.client.get(self.detail_url)['ETag']
+        Applicant.objects.get(pk=self.applicant.pk).save()  # someone else saves in between
+
+        response = self.client.patch(self.detail_url, {'current_stage': 'Hired'}, format='json', HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.applicant.refresh_from_db()
+        self.assertEqual(self.applicant.current_stage, 'Submitted')
+
+    def test_write_locks_the_row_it_checks_if_match_against(self):
+        etag = self.client.get(self.detail_url)['ETag']
+        with mock.patch.object(QuerySet, 'select_for_update', autospec=True, side_effect=QuerySet.select_for_update) as lock:
+            response = self.client.patch(self.detail_url, {'current_stage': 'Hired'}, format='json', HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        queryset, = lock.call_args.args
+        self.assertEqual(lock.call_args.kwargs, {'of': ('self',)})
+        self.assertEqual(queryset.model, Applicant)
+
+    def test_patch_with_current_if_match_returns_new_etag(self):
+        etag = self.client.get(self.detail_url)['ETag']
+        response = self.client.patch(self.detail_url, {'current_stage': 'Hired'}, format='json', HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(self.client.get(self.detail_url)['ETag'], response['ETag'])
+
+    def test_validators_follow_the_nested_job_position(self):
+        position = JobPosition.objects.create(title="Ops", description="Ops.", requirements="Linux")
+        Applicant.objects.filter(pk=self.applicant.pk).update(job_position=position)
+        etags = {url: self.client.get(url)['ETag'] for url in (self.list_url, self.detail_url)}
+
+        position.title = "Platform"
+        position.save()
+        for url, etag in etags.items():
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_200_OK, url)
+            etags[url] = response['ETag']
+        self.assertEqual(self.client.get(self.detail_url).data['job_position_details']['title'], "Platform")
+
+        position.delete()  # SET_NULL leaves the applicant's updated_at alone
+        for url, etag in etags.items():
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_200_OK, url)
+
+    def test_missing_object_is_still_404(self):
+        response = self.client.get(reverse('ats:api_applicant_detail', args=[self.applicant.pk + 100]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_job_position_detail_validators(self):
+        position = JobPosition.objects.create(title="Ops", description="Ops.", requirements="Linux")
+        url = reverse('ats:api_job_position_detail', args=[position.pk])
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+import datetime
+from django.utils import timezone
+from .models import ApplicantTombstone
+
+class ApplicantDeltaSyncAPITests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse('ats:api_applicant_list')
+        self.old = Applicant.objects.create(name="D Old", email="dold@example.com", source="LinkedIn")
+        Applicant.objects.filter(pk=self.old.pk).update(updated_at=timezone.now() - datetime.timedelta(days=2))
+        self.since = (timezone.now() - datetime.timedelta(days=1)).isoformat()
+        self.changed = [
+            Applicant.objects.create(name=f"D {i}", email=f"d{i}@example.com", source="Indeed") for i in range(3)
+        ]
+
+    def sync(self, params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_returns_only_changed_rows_oldest_first(self):
+        data = self.sync({'updated_since': self.since})
+        self.assertEqual([row['id'] for row in data['results']], [a.pk for a in self.changed])
+        self.assertEqual(data['deleted'], [])
+        self.assertIsNone(data['next'])
+        self.assertNotIn('count', data)
+
+    def test_deletions_come_from_tombstones(self):
+        deleted_id = self.old.pk
+        self.old.delete()
+        self.assertTrue(ApplicantTombstone.objects.filter(applicant_id=deleted_id).exists())
+        data = self.sync({'updated_since': self.since})
+        self.assertEqual(data['deleted'], [deleted_id])
+
+    def test_pages_both_streams_with_one_cursor(self):
+        deleted_ids = sorted([self.changed[0].pk, self.old.pk])
+        Applicant.objects.filter(pk__in=deleted_ids).delete()
+        seen, deleted = [], []
+        params = {'updated_since': self.since, 'page_size': 1}
+        while True:
+            data = self.sync(params)
+            seen += [row['id'] for row in data['results']]
+            deleted += data['deleted']
+            if not data['next']:
+                break
+            params['cursor'] = data['next'].split('cursor=')[1].split('&')[0]
+        self.assertEqual(seen, [a.pk for a in self.changed[1:]])
+        self.assertEqual(sorted(deleted), deleted_ids)
+
+    @override_settings(ATS_DELTA_SYNC_LAG=0)
+    def test_updated_until_resumes_the_next_sync(self):
+        data = self.sync({'updated_since': self.since})
+        self.changed[1].save()
+        data = self.sync({'updated_since': data['updated_until'].isoformat()})
+        self.assertEqual([row['id'] for row in data['results']][-1], self.changed[1].pk)
+        self.assertNotIn(self.changed[0].pk, [row['id'] for row in data['results']])
+
+    @override_settings(ATS_DELTA_SYNC_LAG=60)
+    def test_updated_until_lags_behind_late_commits(self):
+        data = self.sync({'updated_since': self.since})
+        self.assertLessEqual(data['updated_until'], timezone.now() - datetime.timedelta(seconds=60))
+        # Saved before the sync above but committed after it, with an older updated_at
+        late = Applicant.objects.create(name="D Late", email="dlate@example.com", source="Indeed")
+        Applicant.objects.filter(pk=late.pk).update(updated_at=timezone.now() - datetime.timedelta(seconds=5))
+        data = self.sync({'updated_since': data['updated_until'].isoformat()})
+        self.assertIn(late.pk, [row['id'] for row in data['results']])
+
+    def test_invalid_timestamp_and_ordering_are_rejected(self):
+        response = self.client.get(self.url, {'updated_since': 'yesterday'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(self.url, {'updated_since': self.since, 'ordering': 'name'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+import json
+from unittest import mock
+from . import bulk
+
+class ApplicantBulkAPITests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse('ats:api_applicant_bulk')
+        self.position = JobPosition.objects.create(title="Data Engineer", description="Pipelines.", requirements="SQL")
+
+    def row(self, i, **extra):
+        return {'name': f"Bulk {i}", 'email': f"bulk{i}@example.com", 'source': 'Job Board',
+                'job_position': self.position.pk, **extra}
+
+    def test_create_from_json_array_embeds_in_one_call(self):
+        rows = [self.row(i, resume_text=f"Resume {i}", tags="SQL, Python") for i in range(3)]
+        with mock.patch.object(bulk, 'get_embeddings', wraps=bulk.get_embeddings) as get_embeddings:
+            response = self.client.post(self.url, rows, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 3)
+        self.assertEqual(get_embeddings.call_count, 1)
+
+        applicants = Applicant.objects.filter(email__startswith='bulk').order_by('id')
+        self.assertEqual([r['id'] for r in response.data['results']], [a.pk for a in applicants])
+        self.assertTrue(all(a.embedding is not None and a.updated_at for a in applicants))
+        self.assertEqual(
+            sorted(applicants[0].normalized_tags.values_list('name', flat=True)), ['python', 'sql']
+        )
+
+    def test_create_from_ndjson(self):
+        body = '\n'.join(json.dumps(self.row(i)) for i in range(2)) + '\n\n'
+        response = self.client.post(self.url, body, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Applicant.objects.filter(email__startswith='bulk').count(), 2)
+
+    def test_invalid_rows_are_reported_per_row(self):
+        rows = [self.row(0), self.row(1, email='not-an-email'), self.row(2)]
+        response = self.client.post(self.url, rows, format='json')
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual([r['status'] for r in response.data['results']], ['created', 'error', 'created'])
+        self.assertIn('email', response.data['results'][1]['errors'])
+        self.assertEqual(Applicant.objects.filter(email__startswith='bulk').count(), 2)
+
+        response = self.client.post(self.url, [self.row(3, source='Carrier pigeon')], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_malformed_body_and_row_limit(self):
+        response = self.client.post(self.url, '{"a": 1}\nnope', content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post(self.url, {'name': 'not a list'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        with self.settings(ATS_BULK_MAX_ROWS=1):
+            response = self.client.post(self.url, [self.row(0), self.row(1)], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_partial_update(self):
+        first = Applicant.objects.create(**{**self.row(0), 'job_position': self.position})
+        second = Applicant.objects.create(**{**self.row(1), 'job_position': self.position})
+        before = second.updated_at
+        rows = [
+            {'id': first.pk, 'current_stage': 'Hired'},
+            {'id': second.pk, 'tags': 'Spark'},
+            {'id': 999999, 'current_stage': 'Hired'},
+        ]
+        response = self.client.patch(self.url, rows, format='json')
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(response.data['updated'], 2)
+        self.assertIn('id', response.data['results'][2]['errors'])
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.current_stage, 'Hired')
+        self.assertEqual(second.current_stage, 'Submitted')
+        self.assertGreater(second.updated_at, before)
+        self.assertEqual(list(second.normalized_tags.values_list('name', flat=True)), ['spark'])
+
+from django.db import IntegrityError, transaction
+from .models import ApplicantProfile
+
+class ApplicantUpsertTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse('ats:api_applicant_bulk') + '?upsert=true'
+        self.position = JobPosition.objects.create(title="SRE", description="Uptime.", requirements="Linux")
+        self.rows = [
+            {'name': "Up One", 'email': "Up1@Example.com ", 'source': 'LinkedIn', 'job_position': self.position.pk},
+            {'name': "Up Two", 'email': "up2@example.com", 'source': 'LinkedIn', 'job_position': self.position.pk,
+             'resume_text': "Kubernetes"},
+        ]
+
+    def test_email_is_normalised_and_unique_per_position(self):
+        applicant = Applicant.objects.create(name="Norm", email=" Norm@Example.COM", source="Other",
+                                             job_position=self.position)
+        self.assertEqual(applicant.email, 'norm@example.com')
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Applicant.objects.create(name="Norm again", email="norm@example.com", source="Other",
+                                     job_position=self.position)
+        # The same person may apply without a position more than once, or to another one
+        Applicant.objects.create(name="Norm", email="norm@example.com", source="Other")
+        Applicant.objects.create(name="Norm", email="norm@example.com", source="Other")
+
+    def test_replay_is_a_no_op(self):
+        response = self.client.post(self.url, self.rows, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 2)
+        ids = [result['id'] for result in response.data['results']]
+        updated_at = dict(Applicant.objects.values_list('id', 'updated_at'))
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.url, self.rows, format='json')
+        self.assertEqual(response.data['unchanged'], 2)
+        self.assertEqual([result['id'] for result in response.data['results']], ids)
+        self.assertFalse([q for q in queries if q['sql'].startswith(('INSERT', 'UPDATE'))])
+        self.assertEqual(dict(Applicant.objects.values_list('id', 'updated_at')), updated_at)
+        self.assertEqual(Applicant.objects.count(), 2)
+
+    def test_only_changed_fields_are_overwritten(self):
+        self.client.post(self.url, self.rows, format='json')
+        applicant = Applicant.objects.get(email='up1@example.com')
+        ApplicantProfile.objects.filter(pk=applicant.pk).update(comments_ta="Keep me")
+
+        rows = [{**self.rows[0], 'name': "Up One Renamed"}, self.rows[1]]
+        response = self.client.post(self.url, rows, format='json')
+        self.assertEqual([r['status'] for r in response.data['results']], ['updated', 'unchanged'])
+        self.assertEqual(response.data['results'][0]['id'], applicant.pk)
+        applicant.refresh_from_db()
+        self.assertEqual(applicant.name, "Up One Renamed")
+        self.assertEqual(applicant.comments_ta, "Keep me")
+        self.assertGreater(applicant.updated_at, applicant.created_at)
+
+    def test_duplicate_rows_in_one_request(self):
+        response = self.client.post(self.url, [self.rows[0], {**self.rows[0], 'email': 'up1@example.com'}], format='json')
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertIn('email', response.data['results'][1]['errors'])
+
+    def test_plain_bulk_create_rejects_existing_applicant(self):
+        self.client.post(self.url, self.rows[:1], format='json')
+        response = self.client.post(reverse('ats:api_applicant_bulk'), self.rows[:1], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['results'][0]['status'], 'error')
+
+import csv as csv_module
+
+class ApplicantExportAPITests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.position = JobPosition.objects.create(title="Analyst", description="Reports.", requirements="SQL")
+        self.first = Applicant.objects.create(name="Ex, One", email="ex1@example.com", source="LinkedIn",
+                                              current_stage="Hired", job_position=self.position)
+        self.second = Applicant.objects.create(name="Ex Two", email="ex2@example.com", source="Indeed")
+
+    def content(self, response):
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return b''.join(response.streaming_content).decode('utf-8')
+
+    def test_csv_export_streams_all_rows_in_id_order(self):
+        response = self.client.get(reverse('ats:api_applicant_export_csv'))
+        self.assertTrue(response.streaming)
+        self.assertIn('attachment; filename="applicants.csv"', response['Content-Disposition'])
+        rows = list(csv_module.reader(self.content(response).splitlines()))
+        self.assertEqual(rows[0][:3], ['id', 'name', 'email'])
+        self.assertEqual([row[1] for row in rows[1:]], ["Ex, One", "Ex Two"])
+        self.assertEqual(rows[1][rows[0].index('job_position_title')], "Analyst")
+
+    def test_ndjson_export_with_filters_and_field_selector(self):
+        response = self.client.get(
+            reverse('ats:api_applicant_export_ndjson'),
+            {'stage': 'Hired', 'fields': 'email,id,created_at'},
+        )
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson; charset=utf-8')
+        lines = self.content(response).splitlines()
+        self.assertEqual(len(lines), 1)
+        row = json.loads(lines[0])
+        self.assertEqual(list(row), ['email', 'id', 'created_at'])
+        self.assertEqual(row['id'], self.first.pk)
+
+    def test_csv_cells_cannot_become_formulas(self):
+        Applicant.objects.filter(pk=self.second.pk).update(name='=HYPERLINK("http://evil.example")', tags='@SUM(A1)')
+        fields = {'fields': 'id,name,tags'}
+        rows = list(csv_module.reader(self.content(self.client.get(reverse('ats:api_applicant_export_csv'), fields)).splitlines()))
+        self.assertEqual(rows[2][1:], ['\'=HYPERLINK("http://evil.example")', "'@SUM(A1)"])
+        self.assertEqual(rows[1][1], "Ex, One")
+        # NDJSON is data, not a spreadsheet: values are exported as stored
+        lines = self.content(self.client.get(reverse('ats:api_applicant_export_ndjson'), fields)).splitlines()
+        self.assertEqual(json.loads(lines[1])['tags'], '@SUM(A1)')
+
+    def test_export_uses_one_query_without_serializers(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.content(self.client.get(reverse('ats:api_applicant_export_csv'), {'fields': 'id,name'}))
+        self.assertEqual(len(queries), 1)
+
+    def test_unknown_field_is_rejected(self):
+        response = self.client.get(reverse('ats:api_applicant_export_csv'), {'fields': 'id,embedding'},
+                                   HTTP_ACCEPT='text/csv')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+import os
+import tempfile
+from django.core.management.base import CommandError
+
+class ImportApplicantsCommandTests(TestCase):
+    def setUp(self):
+        self.position = JobPosition.objects.create(title="Recruiter", description="Hiring.", requirements="People")
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def write(self, name, content):
+        path = os.path.join(self.tmpdir.name, name)
+        with open(path, 'w', encoding='utf-8') as handle:
+            handle.write(content)
+        return path
+
+    def run_import(self, *args):
+        out, err = StringIO(), StringIO()
+        call_command('import_applicants', *args, stdout=out, stderr=err)
+        return out.getvalue(), err.getvalue()
+
+    def test_csv_import_maps_validates_and_is_idempotent(self):
+        path = self.write('applicants.csv', (
+            'Full Name,E-mail,Source,Job Position,Tags,Resume Text,Created At,Shoe Size\n'
+            f'Imp One,IMP1@example.com,LinkedIn,{self.position.pk},"python, sql",Ten years of SQL,2024-01-02T03:04:05,42\n'
+            f'Imp Two,imp2@example.com,Indeed,{self.position.pk},,,,\n'
+            f'Imp Bad,not-an-email,Carrier pigeon,{self.position.pk},,,,\n'
+        ))
+        out, err = self.run_import(path, '--map', 'Full Name=name', '--map', 'E-mail=email', '--chunk-size', '2')
+        self.assertIn('2 created', out)
+        self.assertIn('1 rejected', out)
+        self.assertIn('Shoe Size', out)
+        self.assertIn('Line 4', err)
+        self.assertIn('Embedded 1 applicants', out)
+
+        first = Applicant.objects.get(email='imp1@example.com')
+        self.assertEqual(first.job_position, self.position)
+        self.assertEqual(first.created_at.year, 2024)
+        self.assertIsNotNone(first.embedding)
+        self.assertEqual(sorted(first.normalized_tags.values_list('name', flat=True)), ['python', 'sql'])
+
+        out, _ = self.run_import(path, '--map', 'Full Name=name', '--map', 'E-mail=email')
+        self.assertIn('0 created, 0 updated, 2 unchanged', out)
+        self.assertEqual(Applicant.objects.count(), 2)
+
+    def test_ndjson_update_keeps_unmapped_fields_and_defers_embeddings(self):
+        Applicant.objects.create(name="Nd", email="nd@example.com", source="Other", job_position=self.position,
+                                 resume_text="Old resume", comments_ta="Keep me")
+        path = self.write('applicants.ndjson', (
+            json.dumps({'name': 'Nd', 'email': 'nd@example.com', 'source': 'Other',
+                        'job_position': self.position.pk, 'resume_text': 'New resume'}) + '\n'
+            '{not json}\n'
+        ))
+        out, err = self.run_import(path, '--skip-embeddings')
+        self.assertIn('1 updated', out)
+        self.assertIn('Line 2', err)
+
+        applicant = Applicant.objects.get(email='nd@example.com')
+        self.assertEqual(applicant.resume_text, 'New resume')
+        self.assertEqual(applicant.comments_ta, 'Keep me')
+        self.assertIsNone(applicant.embedding)
+
+        out, _ = self.run_import(path, '--embeddings-only')
+        applicant.refresh_from_db()
+        self.assertIsNotNone(applicant.embedding)
+
+    def test_dry_run_writes_nothing(self):
+        path = self.write('applicants.csv', 'name,email,source\nDry,dry@example.com,Other\n')
+        out, _ = self.run_import(path, '--dry-run')
+        self.assertIn('Validated 1 rows', out)
+        self.assertFalse(Applicant.objects.exists())
+
+    def test_bad_map_and_missing_file(self):
+        with self.assertRaises(CommandError):
+            self.run_import(self.write('a.csv', 'name\n'), '--map', 'oops')
+        with self.assertRaises(CommandError):
+            self.run_import(os.path.join(self.tmpdir.name, 'missing.csv'))
+
+import decimal
+import gzip
+import uuid
+from io import BytesIO
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from . import middleware
+from .parsers import ORJSONParser
+from .renderers import ORJSONRenderer
+
+class APIEncodingTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.list_url = reverse('ats:api_applicant_list')
+        for number in range(10):
+            Applicant.objects.create(
+                name=f"Enc {number}", email=f"enc{number}@example.com", source="LinkedIn",
+                resume_text="Python developer with Django experience. " * 30,
+            )
+
+    def test_orjson_renderer_matches_json_renderer(self):
+        data = {
+            'aware': datetime.datetime(2024, 5, 1, 10, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+            'offset': datetime.datetime(2024, 5, 1, 10, 30, tzinfo=datetime.timezone(datetime.timedelta(hours=2))),
+            'naive': datetime.datetime(2024, 5, 1, 10, 30),
+            'date': datetime.date(2024, 5, 1),
+            'decimal': decimal.Decimal('12.50'),
+            'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            'lazy': gettext_lazy('Submitted'),
+            'separators': 'line\u2028paragraph\u2029 and \u00fcn\u00efcode',
+            1: [None, True, 1.5],
+        }
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+        self.assertEqual(
+            ORJSONRenderer().render(data, 'application/json; indent=2'),
+            JSONRenderer().render(data, 'application/json; indent=2'),
+        )
+
+    def test_orjson_parser(self):
+        parser = ORJSONParser()
+        self.assertEqual(parser.parse(BytesIO('{"name": "Zoë"}'.encode('utf-8'))), {'name': 'Zoë'})
+        self.assertEqual(
+            parser.parse(BytesIO('{"name": "Zoë"}'.encode('latin-1')), parser_context={'encoding': 'latin-1'}),
+            {'name': 'Zoë'},
+        )
+        with self.assertRaises(ParseError):
+            parser.parse(BytesIO(b'{"name": '))
+
+    def test_large_json_is_gzipped_with_weak_etag(self):
+        plain = self.client.get(self.list_url)
+        response = self.client.get(self.list_url, HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(response['ETag'], 'W/' + plain['ETag'])
+        self.assertEqual(json.loads(gzip.decompress(response.content)), plain.json())
+
+    def test_small_and_unaccepted_responses_are_not_compressed(self):
+        response = self.client.get(self.list_url, {'page_size': 1, 'fields': 'id'}, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        response = self.client.get(self.list_url)
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_weak_etag_from_compressed_response_satisfies_if_match(self):
+        applicant = Applicant.objects.get(email="enc0@example.com")
+        detail_url = reverse('ats:api_applicant_detail', args=[applicant.pk])
+        etag = self.client.get(detail_url, HTTP_ACCEPT_ENCODING='gzip')['ETag']
+        self.assertTrue(etag.startswith('W/'))
+
+        response = self.client.patch(detail_url, {'current_stage': 'Hired'}, format='json', HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.patch(detail_url, {'current_stage': 'Rejected'}, format='json', HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+
+    def test_dashboard_is_gzipped(self):
+        response = Client().get(reverse('ats:dashboard'), HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn(b'Enc 0', gzip.decompress(response.content))
+
+    def test_html_is_never_brotli_compressed(self):
+        with mock.patch.object(middleware, 'brotli') as brotli:
+            response = Client().get(reverse('ats:dashboard'), HTTP_ACCEPT_ENCODING='br, gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        brotli.compress.assert_not_called()
+
+    def test_benchmark_command(self):
+        out = StringIO()
+        call_command('benchmark_api_encoding', '--rows', '5', '--repeat', '1', stdout=out)
+        self.assertIn('orjson (ORJSONRenderer)', out.getvalue())
+        self.assertIn('gzip -6', out.getvalue())
+
+from .models import ApplicantStageEvent
+
+class ApplicantTransitionAPITests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse('ats:api_applicant_transition')
+        self.position = JobPosition.objects.create(title="Dev", description="Dev.", requirements="Python")
+        self.other_position = JobPosition.objects.create(title="Ops", description="Ops.", requirements="Linux")
+        stages = ['Submitted', 'Under Review', 'Final Interview', 'Hired', 'Rejected']
+        self.applicants = {
+            stage: Applicant.objects.create(
+                name=f"T {stage}", email=f"t{number}@example.com", source="LinkedIn",
+                job_position=self.position, current_stage=stage,
+            )
+            for number, stage in enumerate(stages)
+        }
+        self.outsider = Applicant.objects.create(
+            name="T Other", email="other@example.com", source="Indeed", job_position=self.other_position,
+        )
+
+    def stage_of(self, applicant):
+        return Applicant.objects.values_list('current_stage', flat=True).get(pk=applicant.pk)
+
+    def test_filter_rejects_remaining_applicants_in_one_update(self):
+        before = self.applicants['Submitted'].updated_at
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                self.url, {'filter': {'job_position': self.position.pk}, 'current_stage': 'Rejected'}, format='json'
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['matched'], 5)
+        self.assertEqual(response.data['updated'], 3)
+        self.assertEqual(response.data['unchanged'], 1)
+        self.assertEqual(response.data['not_allowed'], {'Hired': 1})
+        self.assertEqual(len([q for q in queries if q['sql'].startswith('UPDATE')]), 1)
+
+        self.assertEqual(self.stage_of(self.applicants['Final Interview']), 'Rejected')
+        self.assertEqual(self.stage_of(self.applicants['Hired']), 'Hired')
+        self.assertEqual(self.stage_of(self.outsider), 'Submitted')
+        self.assertGreater(Applicant.objects.get(pk=self.applicants['Submitted'].pk).updated_at, before)
+
+    def test_selection_is_locked_before_the_events_and_update(self):
+        with mock.patch.object(QuerySet, 'select_for_update', autospec=True, side_effect=QuerySet.select_for_update) as lock:
+            counts = bulk.transition_applicants(Applicant.objects.filter(job_position=self.position), 'Rejected')
+        lock.assert_called_once()
+        self.assertEqual(counts['updated'], 3)
+        events = ApplicantStageEvent.objects.filter(to_stage='Rejected').exclude(from_stage='')  # not the creations
+        self.assertEqual(
+            sorted(events.values_list('from_stage', flat=True)), ['Final Interview', 'Submitted', 'Under Review']
+        )
+
+    def test_ids_report_not_found_and_disallowed(self):
+        ids = [self.applicants['Submitted'].pk, self.applicants['Hired'].pk, self.outsider.pk + 100]
+        response = self.client.post(self.url, {'ids': ids, 'current_stage': 'Under Review'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['updated'], 1)
+        self.assertEqual(response.data['not_allowed'], {'Hired': 1})
+        self.assertEqual(response.data['not_found'], 1)
+        self.assertEqual(self.stage_of(self.applicants['Submitted']), 'Under Review')
+
+    def test_dry_run_writes_nothing(self):
+        response = self.client.post(
+            self.url, {'filter': {'stage': 'Submitted'}, 'current_stage': 'Under Review', 'dry_run': True}, format='json'
+        )
+        self.assertEqual(response.data['updated'], 2)  # the Submitted applicant and the outsider
+        self.assertEqual(self.stage_of(self.outsider), 'Submitted')
+
+    def test_invalid_requests(self):
+        for payload in [
+            {'current_stage': 'Rejected'},
+            {'ids': [1], 'filter': {'stage': 'Submitted'}, 'current_stage': 'Rejected'},
+            {'filter': {}, 'current_stage': 'Rejected'},
+            {'ids': [self.outsider.pk], 'current_stage': 'Nowhere'},
+        ]:
+            response = self.client.post(self.url, payload, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, payload)
+        self.assertEqual(self.stage_of(self.outsider), 'Submitted')
+
+    @override_settings(ATS_BULK_MAX_ROWS=2)
+    def test_too_many_ids(self):
+        response = self.client.post(self.url, {'ids': [1, 2, 3], 'current_stage': 'Rejected'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('ids', response.data)
+
+from importlib import import_module
+from django.apps import apps as django_apps
+from .models import ApplicantStageEvent
+
+class ApplicantStageEventTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.position = JobPosition.objects.create(title="Dev", description="Dev.", requirements="Python")
+        self.applicant = Applicant.objects.create(
+            name="S One", email="s1@example.com", source="LinkedIn", job_position=self.position,
+        )
+
+    def history(self, applicant):
+        return list(
+            ApplicantStageEvent.objects.filter(applicant=applicant).order_by('id').values_list('from_stage', 'to_stage')
+        )
+
+    def test_only_real_stage_changes_are_recorded(self):
+        self.assertEqual(self.history(self.applicant), [('', 'Submitted')])
+        event = ApplicantStageEvent.objects.get(applicant=self.applicant)
+        self.assertEqual(event.at, self.applicant.created_at)
+
+        self.applicant.name = "S Renamed"
+        self.applicant.save()
+        self.applicant.current_stage = 'Under Review'
+        self.applicant.save(update_fields=['name'])
+        self.assertEqual(len(self.history(self.applicant)), 1)
+
+        self.applicant.save()
+        self.applicant.save()
+        self.assertEqual(self.history(self.applicant), [('', 'Submitted'), ('Submitted', 'Under Review')])
+
+    def test_deferred_stage_is_read_before_save(self):
+        applicant = Applicant.objects.only('id', 'name').get(pk=self.applicant.pk)
+        applicant.current_stage = 'Rejected'
+        applicant.save()
+        self.assertEqual(self.history(self.applicant)[-1], ('Submitted', 'Rejected'))
+
+    def test_api_patch_records_change(self):
+        url = reverse('ats:api_applicant_detail', args=[self.applicant.pk])
+        self.client.patch(url, {'current_stage': 'Interview Stage'}, format='json')
+        self.client.patch(url, {'comments_ta': 'Solid.'}, format='json')
+        self.assertEqual(self.history(self.applicant), [('', 'Submitted'), ('Submitted', 'Interview Stage')])
+
+    def test_bulk_create_update_and_upsert_record_changes(self):
+        url = reverse('ats:api_applicant_bulk')
+        response = self.client.post(url, [
+            {'name': 'S Two', 'email': 's2@example.com', 'source': 'Indeed', 'current_stage': 'Under Review'},
+        ], format='json')
+        created = Applicant.objects.get(pk=response.data['results'][0]['id'])
+        self.assertEqual(self.history(created), [('', 'Under Review')])
+
+        self.client.patch(url, [
+            {'id': created.pk, 'current_stage': 'Final Interview'},
+            {'id': self.applicant.pk, 'name': 'S One Renamed'},
+        ], format='json')
+        self.assertEqual(self.history(created)[-1], ('Under Review', 'Final Interview'))
+        self.assertEqual(len(self.history(self.applicant)), 1)
+
+        self.client.post(f'{url}?upsert=true', [
+            {'name': 'S One', 'email': 's1@example.com', 'source': 'LinkedIn',
+             'job_position': self.position.pk, 'current_stage': 'Rejected'},
+        ], format='json')
+        self.assertEqual(self.history(self.applicant)[-1], ('Submitted', 'Rejected'))
+
+    def test_transition_records_one_event_per_moved_applicant(self):
+        hired = Applicant.objects.create(
+            name="S Hired", email="s3@example.com", source="Referral", job_position=self.position, current_stage='Hired',
+        )
+        response = self.client.post(
+            reverse('ats:api_applicant_transition'),
+            {'filter': {'job_position': self.position.pk}, 'current_stage': 'Rejected'}, format='json',
+        )
+        self.assertEqual(response.data['updated'], 1)
+        self.assertEqual(self.history(self.applicant), [('', 'Submitted'), ('Submitted', 'Rejected')])
+        self.assertEqual(self.history(hired), [('', 'Hired')])
+        event = ApplicantStageEvent.objects.filter(applicant=self.applicant).last()
+        self.assertEqual(event.at, Applicant.objects.get(pk=self.applicant.pk).last_status_update)
+
+    def test_import_dates_starting_stage_by_created_at(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as handle:
+            handle.write('name,email,source,current_stage,created_at\nS Four,s4@example.com,Other,Hired,2024-01-02T03:04:05\n')
+        self.addCleanup(os.remove, handle.name)
+        call_command('import_applicants', handle.name, '--skip-embeddings', stdout=StringIO())
+        applicant = Applicant.objects.get(email='s4@example.com')
+        event = ApplicantStageEvent.objects.get(applicant=applicant)
+        self.assertEqual((event.from_stage, event.to_stage, event.at), ('', 'Hired', applicant.created_at))
+        self.assertEqual(applicant.created_at.year, 2024)
+
+    def test_backfill_seeds_one_event_per_applicant(self):
+        migration = import_module('ats.migrations.0014_applicantstageevent')
+        advanced = Applicant.objects.create(name="S Five", email="s5@example.com", source="Other")
+        advanced.current_stage = 'Offer Extended'
+        advanced.save()
+        ApplicantStageEvent.objects.all().delete()
+
+        # SQLite's schema editor cannot open inside the test transaction; only execute() is used
+        with connection.cursor() as cursor:
+            schema_editor = mock.Mock(execute=lambda sql, params=(): cursor.execute(sql, params))
+            migration.backfill_stage_events(django_apps, schema_editor)
+            migration.backfill_stage_events(django_apps, schema_editor)
+        advanced.refresh_from_db()
+        self.assertEqual(ApplicantStageEvent.objects.count(), 2)
+        self.assertEqual(ApplicantStageEvent.objects.get(applicant=self.applicant).at, self.applicant.created_at)
+        event = ApplicantStageEvent.objects.get(applicant=advanced)
+        self.assertEqual((event.to_stage, event.at), ('Offer Extended', advanced.last_status_update))
+
+from .analytics import median_from_histogram, refresh_rollups
+from .models import FunnelDailyRollup, RollupRefresh
+
+class PipelineAnalyticsTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse('ats:api_analytics')
+        self.position = JobPosition.objects.create(title="Dev", description="Dev.", requirements="Python")
+        self.applied = timezone.make_aware(datetime.datetime(2024, 3, 4, 9, 0))  # a Monday
+        self.hired = self.make_applicant('a1', 'LinkedIn', ['Interview Stage', 'Offer Extended', 'Hired'], hired_after=10)
+        self.rejected = self.make_applicant('a2', 'LinkedIn', ['Under Review', 'Rejected'])
+        self.waiting = self.make_applicant('a3', 'Referral', [])
+        self.referral = self.make_applicant('a4', 'Referral', ['Under Review', 'Final Interview', 'Offer Extended', 'Hired'], hired_after=20)
+        Applicant.objects.create(  # applied the next week, for another position
+            name="Other", email="other@example.com", source="Indeed",
+            job_position=JobPosition.objects.create(title="Ops", description="Ops.", requirements="Linux"),
+        )
+        Applicant.objects.filter(email="other@example.com").update(created_at=self.applied + datetime.timedelta(days=8))
+        self.params = {'start': '2024-03-01', 'end': '2024-03-31'}
+
+    def make_applicant(self, name, source, stages, hired_after=None):
+        applicant = Applicant.objects.create(
+            name=name, email=f"{name}@example.com", source=source, job_position=self.position,
+        )
+        for stage in stages:
+            applicant.current_stage = stage
+            applicant.save()
+        Applicant.objects.filter(pk=applicant.pk).update(created_at=self.applied)
+        ApplicantStageEvent.objects.filter(applicant=applicant).update(at=self.applied)
+        if hired_after is not None:
+            ApplicantStageEvent.objects.filter(applicant=applicant, to_stage='Hired').update(
+                at=self.applied + datetime.timedelta(days=hired_after, hours=3)
+            )
+        applicant.refresh_from_db()
+        return applicant
+
+    def test_funnel_hires_sources_and_weekly_volume(self):
+        refresh_rollups()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, self.params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(any('"ats_applicant"' in query['sql'] for query in queries))
+
+        funnel = {row['stage']: row for row in response.data['funnel']}
+        self.assertEqual(funnel['Submitted']['applicants'], 5)
+        self.assertEqual(funnel['Under Review']['applicants'], 3)  # a1 skipped it but got further
+        self.assertEqual(funnel['Interview Stage']['applicants'], 2)
+        self.assertEqual(funnel['Hired']['applicants'], 2)
+        self.assertEqual(funnel['Hired']['conversion'], 0.4)
+        self.assertEqual(funnel['Hired']['step_conversion'], 1.0)
+        self.assertEqual(response.data['time_to_hire'], {'hires': 2, 'median_days': 15.0})
+
+        sources = {row['source']: row for row in response.data['sources']}
+        self.assertEqual(sources['LinkedIn']['applicants'], 2)
+        self.assertEqual(sources['LinkedIn']['hire_rate'], 0.5)
+        self.assertEqual(sources['Referral']['median_days_to_hire'], 20.0)
+        self.assertEqual(sources['Job Board']['applicants'], 0)
+
+        weeks = {row['title']: row['weeks'] for row in response.data['positions']}
+        self.assertEqual(weeks['Dev'], [{'week': datetime.date(2024, 3, 4), 'applicants': 4}])
+        self.assertEqual(weeks['Ops'], [{'week': datetime.date(2024, 3, 11), 'applicants': 1}])
+
+        response = self.client.get(self.url, {**self.params, 'source': 'Referral', 'job_position': self.position.pk})
+        self.assertEqual(response.data['funnel'][0]['applicants'], 2)
+
+    def test_incremental_refresh_covers_touched_days_only(self):
+        # Written well before the first run, so the next one's overlap window is empty
+        Applicant.objects.update(updated_at=timezone.now() - datetime.timedelta(hours=1))
+        self.assertEqual(refresh_rollups(), 2)
+        self.assertEqual(refresh_rollups(), 0)
+
+        self.waiting.current_stage = 'Under Review'
+        self.waiting.save()
+        self.rejected.delete()
+        self.assertEqual(refresh_rollups(), 1)
+        funnel = {row['stage']: row['applicants'] for row in self.client.get(self.url, self.params).data['funnel']}
+        self.assertEqual(funnel['Submitted'], 4)
+        self.assertEqual(funnel['Under Review'], 3)
+        self.assertEqual(FunnelDailyRollup.objects.filter(day=self.applied.date()).count(), 3)
+
+    def test_conditional_requests_follow_refreshes(self):
+        self.assertIsNone(self.client.get(self.url).data['refreshed_at'])
+        refresh_rollups()
+        etag = self.client.get(self.url, self.params)['ETag']
+        self.assertEqual(
+            self.client.get(self.url, self.params, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED
+        )
+        refresh_rollups()
+        self.assertEqual(self.client.get(self.url, self.params, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_200_OK)
+
+    def test_invalid_parameters(self):
+        for params in [{'start': '2024-02-30'}, {'end': 'soon'}, {'source': 'Carrier pigeon'},
+                       {'job_position': 'x'}, {'start': '2024-04-01', 'end': '2024-03-01'}]:
+            self.assertEqual(self.client.get(self.url, params).status_code, status.HTTP_400_BAD_REQUEST, params)
+
+    def test_median_from_histogram(self):
+        self.assertIsNone(median_from_histogram({}))
+        self.assertEqual(median_from_histogram({3: 1}), 3)
+        self.assertEqual(median_from_histogram({1: 2, 9: 1}), 1)
+        self.assertEqual(median_from_histogram({1: 1, 4: 2, 10: 1}), 4)
+        self.assertEqual(median_from_histogram({2: 1, 6: 1}), 4)
+
+    def test_refresh_rollups_command(self):
+        out = StringIO()
+        call_command('refresh_rollups', stdout=out)
+        call_command('refresh_rollups', '--since', '2024-01-01', stdout=out)
+        self.assertIn('Refreshed 2 days', out.getvalue())
+        self.assertEqual(RollupRefresh.objects.count(), 2)
+        self.assertFalse(RollupRefresh.objects.first().full)
+        with self.assertRaises(CommandError):
+            call_command('refresh_rollups', '--since', 'yesterday')
+
+
+import time
+import zipfile
+from .extraction import ExtractionTimeout, clean_text, extract_text, time_limit
+from .models import ResumeExtraction
+from .resumes import ResumeExtractor, extract_applicant_resume, prune_resume_blobs
+
+
+def make_docx(*paragraphs):
+    body = ''.join(f'<w:p><w:r><w:t>{text}</w:t></w:r></w:p>' for text in paragraphs)
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        archive.writestr(
+            'word/document.xml',
+            '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+            f'<w:body>{body}</w:body></w:document>',
+        )
+    return buffer.getvalue()
+
+
+class ResumeExtractionTests(TemporaryMediaRootMixin, TestCase):
+
+    def make_applicant(self, name, content, **fields):
+        return Applicant.objects.create(
+            name='Resume Owner', email=f'{name}@example.com', source='Other',
+            resume_file=SimpleUploadedFile(name, content), **fields,
+        )
+
+    def test_extract_text_reads_docx_paragraphs(self):
+        with tempfile.NamedTemporaryFile(suffix='.docx', delete=False) as handle:
+            handle.write(make_docx('Senior Python developer', 'Django,   PostgreSQL'))
+        self.addCleanup(os.unlink, handle.name)
+        result = extract_text(handle.name, '.docx', max_pages=5, max_chars=1000, timeout=5)
+        self.assertEqual(result['text'], 'Senior Python developer\nDjango, PostgreSQL')
+        self.assertIsNone(result['pages'])
+
+    def test_clean_text_drops_control_characters_and_truncates(self):
+        self.assertEqual(clean_text('a\x00b\t\tc\n\n\n\n\nd', 100), 'ab c\n\nd')
+        self.assertEqual(clean_text('abcdef', 3), 'abc')
+
+    def test_time_limit_interrupts_slow_extraction(self):
+        with self.assertRaises(ExtractionTimeout):
+            with time_limit(0.05):
+                time.sleep(2)
+
+    @override_settings(ATS_RESUME_EXTRACTION_WORKERS=0)
+    def test_upload_fills_resume_text_and_embedding_after_commit(self):
+        data = {
+            'name': 'Uploaded Only', 'email': 'uploaded@example.com', 'source': 'Other',
+            'resume_file': SimpleUploadedFile('cv.docx', make_docx('Kubernetes platform engineer')),
+        }
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('ats:new_applicant'), data)
+        applicant = Applicant.objects.get(email='uploaded@example.com')
+        self.assertEqual(applicant.resume_text, 'Kubernetes platform engineer')
+        self.assertIsNotNone(applicant.embedding)
+        extraction = applicant.resume_extraction
+        self.assertEqual(extraction.status, 'extracted')
+        self.assertEqual(extraction.resume_file, applicant.resume_file.name)
+        self.assertEqual(extraction.characters, len(applicant.resume_text))
+
+    @override_settings(ATS_RESUME_EXTRACTION_WORKERS=0)
+    def test_existing_resume_text_is_not_replaced(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            applicant = self.make_applicant('typed.txt', b'From the file', resume_text='Typed by a recruiter')
+        applicant.refresh_from_db()
+        self.assertEqual(applicant.resume_text, 'Typed by a recruiter')
+        self.assertFalse(ResumeExtraction.objects.exists())
+
+    @override_settings(ATS_RESUME_MAX_BYTES=10)
+    def test_limits_and_unsupported_formats_are_recorded(self):
+        big = self.make_applicant('big.txt', b'x' * 11)
+        odt = self.make_applicant('cv.odt', b'not extracted')
+        extractor = ResumeExtractor(0)
+        self.assertEqual(extract_applicant_resume(big.pk, extractor), 'too_large')
+        with override_settings(ATS_RESUME_MAX_BYTES=1000):
+            self.assertEqual(extract_applicant_resume(odt.pk, extractor), 'unsupported')
+        self.assertEqual(Applicant.objects.get(pk=big.pk).resume_text, '')
+        self.assertIn('.odt', ResumeExtraction.objects.get(applicant=odt).detail)
+        # Recorded outcomes are not retried unless forced
+        self.assertIsNone(extract_applicant_resume(big.pk, extractor))
+
+    def test_process_pool_extracts_in_a_worker(self):
+        applicant = self.make_applicant('pooled.docx', make_docx('Extracted in a worker process'))
+        extractor = ResumeExtractor(1)
+        self.addCleanup(extractor.shutdown)
+        outcome = extractor.extract(applicant.resume_file)
+        self.assertEqual(outcome['status'], 'extracted')
+        self.assertEqual(outcome['text'], 'Extracted in a worker process')
+
+    def test_extract_resumes_command_backfills_and_embeds(self):
+        first = self.make_applicant('first.txt', b'Data engineer, Spark')
+        second = self.make_applicant('second.docx', make_docx('Frontend developer'))
+        unsupported = self.make_applicant('third.odt', b'?')
+        out = StringIO()
+        call_command('extract_resumes', '--workers', '0', stdout=out)
+        self.assertIn('2 extracted, 1 unsupported', out.getvalue())
+        self.assertEqual(Applicant.objects.get(pk=first.pk).resume_text, 'Data engineer, Spark')
+        self.assertEqual(Applicant.objects.get(pk=second.pk).resume_text, 'Frontend developer')
+        self.assertFalse(Applicant.objects.filter(pk__in=[first.pk, second.pk], profile__embedding__isnull=True).exists())
+
+        out = StringIO()
+        call_command('extract_resumes', '--workers', '0', stdout=out)
+        self.assertIn('nothing to do', out.getvalue())
+        out = StringIO()
+        call_command('extract_resumes', '--workers', '0', '--retry', stdout=out)
+        self.assertIn('1 unsupported', out.getvalue())
+        self.assertEqual(ResumeExtraction.objects.get(applicant=unsupported).status, 'unsupported')
+
+
+from django.core.files.base import ContentFile
+from .models import ResumeBlob
+from .storage import content_hash, resume_storage
+
+class ResumeDeduplicationTests(TemporaryMediaRootMixin, TestCase):
+
+    def make_applicant(self, email, filename, content):
+        return Applicant.objects.create(
+            name='Resume Owner', email=email, source='Other', resume_file=SimpleUploadedFile(filename, content),
+        )
+
+    def test_identical_uploads_share_one_file_with_a_reference_count(self):
+        first = self.make_applicant('one@example.com', 'cv.txt', b'Same resume')
+        second = self.make_applicant('two@example.com', 'cv (1).txt', b'Same resume')
+        digest = hashlib.sha256(b'Same resume').hexdigest()
+        self.assertEqual(first.resume_file.name, f'resumes/{digest[:2]}/{digest}.txt')
+        self.assertEqual(second.resume_file.name, first.resume_file.name)
+        self.assertEqual(content_hash(first.resume_file.name), digest)
+        self.assertEqual(len(os.listdir(resume_storage.path(f'resumes/{digest[:2]}'))), 1)
+        blob = ResumeBlob.objects.get(name=first.resume_file.name)
+        self.assertEqual((blob.sha256, blob.size, blob.references), (digest, 11, 2))
+
+        first.delete()
+        self.assertEqual(ResumeBlob.objects.get(pk=blob.pk).references, 1)
+        second = Applicant.objects.get(pk=second.pk)
+        second.resume_file = SimpleUploadedFile('new.txt', b'Updated resume')
+        second.save()
+        self.assertEqual(ResumeBlob.objects.get(pk=blob.pk).references, 0)
+        self.assertEqual(ResumeBlob.objects.get(name=second.resume_file.name).references, 1)
+        # Saves that leave the file alone do not count it again
+        Applicant.objects.get(pk=second.pk).save()
+        self.assertEqual(ResumeBlob.objects.get(name=second.resume_file.name).references, 1)
+
+    def test_reusing_an_unused_file_renews_it_against_pruning(self):
+        name = self.make_applicant('one@example.com', 'cv.txt', b'Reused resume').resume_file.name
+        Applicant.objects.get(email='one@example.com').delete()
+        ResumeBlob.objects.filter(name=name).update(updated_at=timezone.now() - datetime.timedelta(hours=2))
+
+        # Deduplicated against, but the applicant taking it up is not saved yet
+        self.assertEqual(resume_storage.save('resumes/cv.txt', ContentFile(b'Reused resume')), name)
+        self.assertEqual(prune_resume_blobs(), (0, 0))
+        self.assertTrue(resume_storage.exists(name))
+
+    @override_settings(ATS_RESUME_EXTRACTION_WORKERS=0)
+    def test_extraction_and_embedding_are_reused_per_file(self):
+        content = make_docx('Shared resume for two positions')
+        with self.captureOnCommitCallbacks(execute=True):
+            first = self.make_applicant('one@example.com', 'cv.docx', content)
+        first.refresh_from_db()
+        blob = ResumeBlob.objects.get(name=first.resume_file.name)
+        self.assertEqual((blob.status, blob.text), ('extracted', 'Shared resume for two positions'))
+        self.assertIsNotNone(blob.embedding)
+
+        with mock.patch.object(ResumeExtractor, 'extract') as extract, \
+                mock.patch('ats.bulk.get_embeddings') as get_embeddings:
+            with self.captureOnCommitCallbacks(execute=True):
+                second = self.make_applicant('two@example.com', 'cv.docx', content)
+        extract.assert_not_called()
+        get_embeddings.assert_not_called()
+        second.refresh_from_db()
+        self.assertEqual(second.resume_text, first.resume_text)
+        self.assertTrue(np.array_equal(second.embedding, first.embedding))
+        self.assertEqual(second.resume_extraction.status, 'extracted')
+
+    def test_dedupe_resumes_command_moves_legacy_files_and_prunes_unused_ones(self):
+        legacy = [('resumes/a.txt', b'Legacy resume'), ('resumes/b.txt', b'Legacy resume'), ('resumes/c.txt', b'Other')]
+        applicants = []
+        os.makedirs(resume_storage.path('resumes'), exist_ok=True)
+        for index, (name, content) in enumerate(legacy):
+            applicant = Applicant.objects.create(name='Legacy', email=f'legacy{index}@example.com', source='Other')
+            # Written the way the default storage named uploads before
+            with open(resume_storage.path(name), 'wb') as handle:
+                handle.write(content)
+            Applicant.objects.filter(pk=applicant.pk).update(resume_file=name)
+            applicants.append(applicant)
+        unused = resume_storage.save('resumes/unused.txt', ContentFile(b'Nobody uses this'))
+        ResumeBlob.objects.create(
+            name=unused, sha256=content_hash(unused), size=16, references=0,
+            updated_at=timezone.now() - datetime.timedelta(hours=2),
+        )
+
+        out = StringIO()
+        call_command('dedupe_resumes', stdout=out)
+        self.assertIn('Moved 3 legacy resume files into 2 content-addressed files.', out.getvalue())
+        self.assertIn('Deleted 1 unused files (16 bytes).', out.getvalue())
+        names = [Applicant.objects.get(pk=applicant.pk).resume_file.name for applicant in applicants]
+        self.assertEqual(names[0], names[1])
+        self.assertNotEqual(names[0], names[2])
+        self.assertEqual(ResumeBlob.objects.get(name=names[0]).references, 2)
+        self.assertEqual(ResumeBlob.objects.get(name=names[2]).references, 1)
+        self.assertFalse(any(resume_storage.exists(name) for name, _ in legacy))
+        self.assertFalse(resume_storage.exists(unused))
+        self.assertFalse(ResumeBlob.objects.filter(name=unused).exists())
+
+
+class ApplicantProfileTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.position = JobPosition.objects.create(title="Analyst", description="Numbers.", requirements="SQL")
+        self.applicant = Applicant.objects.create(
+            name="Wide Wendy", email="wendy@example.com", source="LinkedIn", job_position=self.position,
+            resume_text="Ten pages of resume.", comments_ta="Strong SQL.", overall_feedback="Hire.",
+        )
+
+    def test_profile_fields_are_stored_on_the_profile(self):
+        profile = ApplicantProfile.objects.get(pk=self.applicant.pk)
+        self.assertEqual((profile.resume_text, profile.comments_ta), ("Ten pages of resume.", "Strong SQL."))
+        self.assertIsNotNone(profile.embedding)
+        bare = Applicant.objects.create(name="Bare", email="bare@example.com", source="Other")
+        self.assertEqual(ApplicantProfile.objects.get(pk=bare.pk).resume_text, '')
+
+    def test_list_views_do_not_read_the_profile(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(reverse('ats:dashboard')).status_code, 200)
+            response = self.client.get(reverse('ats:api_applicant_list'), {'fields': 'id,name,current_stage'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse([q for q in queries if 'ats_applicantprofile' in q['sql']])
+
+    def test_api_and_detail_view_load_the_profile_in_the_same_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('ats:api_applicant_list'))
+        self.assertEqual(response.data['results'][0]['comments_ta'], "Strong SQL.")
+        self.assertEqual(len([q for q in queries if 'ats_applicantprofile' in q['sql']]), 1)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('ats:applicant_detail', args=[self.applicant.pk]))
+        self.assertContains(response, "Ten pages of resume.")
+        self.assertEqual(len([q for q in queries if 'ats_applicantprofile' in q['sql']]), 1)
+
+    def test_profile_updates_bump_updated_at(self):
+        before = self.applicant.updated_at
+        url = reverse('ats:api_applicant_detail', kwargs={'pk': self.applicant.pk})
+        response = self.client.patch(url, {'comments_evaluation': 'Great case study.'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        applicant = Applicant.objects.get(pk=self.applicant.pk)
+        self.assertEqual(applicant.comments_evaluation, 'Great case study.')
+        self.assertGreater(applicant.updated_at, before)
+
+        applicant.overall_feedback = 'Hire soon.'
+        applicant.save(update_fields=['overall_feedback'])
+        self.assertEqual(ApplicantProfile.objects.get(pk=applicant.pk).overall_feedback, 'Hire soon.')
+
+    def test_saving_without_loading_the_profile_leaves_it_alone(self):
+        applicant = Applicant.objects.get(pk=self.applicant.pk)
+        applicant.current_stage = 'Under Review'
+        with CaptureQueriesContext(connection) as queries:
+            applicant.save()
+        self.assertFalse([q for q in queries if 'ats_applicantprofile' in q['sql']])
+        self.assertEqual(Applicant.objects.get(pk=applicant.pk).resume_text, "Ten pages of resume.")
+
+
+from django.db import DatabaseError
+from .models import ResumeUpload
+from .uploads import UploadNotFound, append_chunk, finalize_upload
+
+@override_settings(ATS_RESUME_EXTRACTION_WORKERS=0)
+class ResumeUploadTests(TemporaryMediaRootMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.applicant = Applicant.objects.create(name="Chunky", email="chunky@example.com", source="Other")
+        self.content = make_docx('Platform engineer, ten years of Kubernetes')
+
+    def start(self, filename='cv.docx', size=None):
+        return self.client.post(reverse('ats:api_resume_upload_list'), {
+            'applicant': self.applicant.pk, 'filename': filename, 'size': len(self.content) if size is None else size,
+        }, format='json')
+
+    def send(self, url, offset, data, **extra):
+        return self.client.generic(
+            'PATCH', url, data, content_type='application/offset+octet-stream', HTTP_UPLOAD_OFFSET=str(offset), **extra,
+        )
+
+    def test_chunks_are_assembled_and_attached_to_the_applicant(self):
+        response = self.start()
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        url = response['Location']
+        middle = len(self.content) // 2
+        self.assertEqual(self.send(url, 0, self.content[:middle])['Upload-Offset'], str(middle))
+        response = self.send(url, middle, self.content[middle:])
+        self.assertEqual(response.data['received'], len(self.content))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(url + 'finalize/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        digest = hashlib.sha256(self.content).hexdigest()
+        self.assertEqual(response.data['resume_file'], f'resumes/{digest[:2]}/{digest}.docx')
+        applicant = Applicant.objects.get(pk=self.applicant.pk)
+        self.assertEqual(applicant.resume_file.name, response.data['resume_file'])
+        self.assertEqual(applicant.resume_text, 'Platform engineer, ten years of Kubernetes')
+        self.assertEqual(ResumeBlob.objects.get(name=applicant.resume_file.name).references, 1)
+        self.assertFalse(ResumeUpload.objects.exists())
+        self.assertFalse([name for name in os.listdir(resume_storage.path('resumes')) if name.startswith('.upload-')])
+
+    def test_upload_resumes_after_a_dropped_connection(self):
+        url = self.start()['Location']
+        # The client sends the whole file but the connection breaks after 100 bytes
+        body = BytesIO(self.content[:100])
+
+        class DroppedConnection:
+            def read(self, size):
+                data = body.read(size)
+                if not data:
+                    raise OSError('Connection reset by peer')
+                return data
+
+        upload = ResumeUpload.objects.get()
+        with self.assertRaises(OSError):
+            append_chunk(upload, 0, DroppedConnection(), len(self.content))
+
+        response = self.client.get(url)
+        self.assertEqual(response.data['received'], 100)
+        response = self.send(url, 0, self.content)
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual((response.data['received'], response['Upload-Offset']), (100, '100'))
+        self.assertEqual(self.send(url, 100, self.content[100:]).status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.post(url + 'finalize/').status_code, status.HTTP_200_OK)
+        self.assertEqual(Applicant.objects.get(pk=self.applicant.pk).resume_file.read(), self.content)
+
+    @override_settings(ATS_RESUME_MAX_BYTES=1000, ATS_RESUME_UPLOAD_CHUNK_BYTES=100)
+    def test_size_and_type_limits(self):
+        self.assertEqual(self.start('cv.exe', 10).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('filename', self.start('cv.pdf', 1001).data)
+        url = self.start('cv.pdf', 200)['Location']
+        self.assertEqual(self.send(url, 0, b'%PDF-' + b'x' * 150).status_code, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        self.assertEqual(self.client.post(url + 'finalize/').status_code, status.HTTP_409_CONFLICT)
+        self.send(url, 0, b'<html>' + b'x' * 94)
+        self.send(url, 100, b'x' * 100)
+        response = self.client.post(url + 'finalize/')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['detail'], 'The file is not a PDF document.')
+
+        # Single-request uploads get the same checks
+        response = self.client.patch(
+            reverse('ats:api_applicant_detail', kwargs={'pk': self.applicant.pk}),
+            {'resume_file': SimpleUploadedFile('cv.docx', b'not a zip')}, format='multipart',
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('resume_file', response.data)
+
+    def test_stale_requests_to_a_finalized_upload_get_404(self):
+        url = self.start()['Location']
+        self.send(url, 0, self.content)
+        stale = ResumeUpload.objects.get()
+        self.assertEqual(self.client.post(url + 'finalize/').status_code, status.HTTP_200_OK)
+        # A request that loaded the upload before the finalize above committed
+        with self.assertRaises(UploadNotFound):
+            finalize_upload(stale)
+        with self.assertRaises(UploadNotFound):
+            append_chunk(stale, len(self.content), BytesIO(b''), 0)
+
+    def test_failed_finalize_leaves_the_file_to_blob_pruning(self):
+        url = self.start()['Location']
+        self.send(url, 0, self.content)
+        with mock.patch.object(Applicant, 'save', side_effect=DatabaseError('deadlock')):
+            with self.assertRaises(DatabaseError):
+                finalize_upload(ResumeUpload.objects.get())
+        digest = hashlib.sha256(self.content).hexdigest()
+        blob = ResumeBlob.objects.get(name=f'resumes/{digest[:2]}/{digest}.docx')
+        self.assertEqual(blob.references, 0)
+        self.assertFalse(ResumeUpload.objects.exists())
+        self.assertEqual(prune_resume_blobs(grace=datetime.timedelta(0)), (1, len(self.content)))
+        self.assertFalse(resume_storage.exists(blob.name))
+
+    def test_cancelled_and_abandoned_uploads_are_deleted(self):
+        cancelled = self.client.get(self.start()['Location']).data['id']
+        partial = ResumeUpload.objects.get(pk=cancelled).partial
+        self.assertTrue(resume_storage.exists(partial))
+        response = self.client.delete(reverse('ats:api_resume_upload_detail', kwargs={'pk': cancelled}))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(resume_storage.exists(partial))
+
+        self.start()
+        abandoned = ResumeUpload.objects.get()
+        ResumeUpload.objects.filter(pk=abandoned.pk).update(updated_at=timezone.now() - datetime.timedelta(days=2))
+        out = StringIO()
+        call_command('dedupe_resumes', stdout=out)
+        self.assertIn('Deleted 1 abandoned uploads.', out.getvalue())
+        self.assertFalse(resume_storage.exists(abandoned.partial))
+
+
+import asyncio
+import httpx
+from asgiref.sync import iscoroutinefunction
+from django.test import AsyncClient
+from django.urls import resolve
+from . import agent
+
+class AsyncViewTests(TestCase):
+    def setUp(self):
+        self.position = JobPosition.objects.create(title="SRE", description="Runs things.", requirements="Linux")
+        self.applicant = Applicant.objects.create(
+            name="Async Ada", email="ada@example.com", source="Other", tags="python", job_position=self.position,
+        )
+        self.detail_url = reverse('ats:api_applicant_detail', kwargs={'pk': self.applicant.pk})
+
+    def test_views_are_async(self):
+        urls = [
+            reverse('ats:api_applicant_list'), self.detail_url, reverse('ats:api_applicant_tag_counts'),
+            reverse('ats:api_applicant_facets'), reverse('ats:api_analytics'),
+            reverse('ats:job_position_detail', kwargs={'pk': self.position.pk}),
+        ]
+        for url in urls:
+            self.assertTrue(iscoroutinefunction(resolve(url).func), url)
+
+    async def test_api_reads_and_writes(self):
+        client = AsyncClient()
+        response = await client.get(self.detail_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['name'], 'Async Ada')
+        response = await client.get(self.detail_url, headers={'if-none-match': response['ETag']})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual((await client.get(self.detail_url + '0/')).status_code, 404)
+
+        response = await client.patch(self.detail_url, {'current_stage': 'Interview Stage'}, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        response = await client.get(reverse('ats:api_applicant_list'), {'stage': 'Interview Stage'})
+        self.assertEqual([row['id'] for row in response.json()['results']], [self.applicant.pk])
+        response = await client.get(reverse('ats:api_applicant_tag_counts'))
+        self.assertEqual(response.json(), [{'name': 'python', 'count': 1}])
+        response = await client.get(reverse('ats:api_applicant_facets'))
+        self.assertEqual(response.json()['count'], 1)
+
+    def test_job_position_detail_requests_summaries_concurrently(self):
+        applicants = [self.applicant] + [
+            Applicant.objects.create(name=f"Match {i}", email=f"match{i}@example.com", source="Other") for i in range(2)
+        ]
+        in_flight = []
+        most = 0
+
+        async def summary(job, applicant, client=None):
+            nonlocal most
+            in_flight.append(applicant)
+            most = max(most, len(in_flight))
+            await asyncio.sleep(0.05)
+            in_flight.remove(applicant)
+            return f'Summary of {applicant.name}'
+
+        async def top(job_id, top_n=10):
+            return applicants
+
+        with mock.patch('ats.views.afind_top_applicants_for_job', top), \
+                mock.patch.object(agent, 'aget_ai_match_summary', summary):
+            response = self.client.get(reverse('ats:job_position_detail', kwargs={'pk': self.position.pk}))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(most, 3)
+        self.assertEqual([a.ai_summary for a in response.context['top_applicants']], [
+            'Summary of Async Ada', 'Summary of Match 0', 'Summary of Match 1',
+        ])
+        self.assertEqual(list(response.context['applicants']), [self.applicant])
+
+    async def test_async_summary_request(self):
+        def handler(request):
+            if b'Broken' in request.content:
+                return httpx.Response(500)
+            return httpx.Response(200, json={'choices': [{'message': {'content': 'Strong match.'}}]})
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            self.assertEqual(await agent.aget_ai_match_summary(self.position, self.applicant, client), 'Strong match.')
+            broken = Applicant(name="Broken", resume_text="Broken")
+            summary = await agent.aget_ai_match_summary(self.position, broken, client)
+        self.assertTrue(summary.startswith('Error communicating with AI agent: '))
+
+
+from asgiref.sync import async_to_sync
+from django.test.utils import CaptureQueriesContext
+from . import metrics
+
+class RequestMetricsTests(TestCase):
+    def observed(self, histogram, **labels):
+        counts, total = histogram.values.get(histogram.label_key(labels), ([0], 0))
+        return sum(counts), total
+
+    def test_request_latency_and_queries_are_exposed(self):
+        Applicant.objects.create(name="Metric Mo", email="mo@example.com", source="Other")
+        view = 'ats:api_applicant_list'
+        before = self.observed(metrics.request_queries, view=view)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(reverse(view)).status_code, 200)
+        count, total = self.observed(metrics.request_queries, view=view)
+        self.assertEqual((count - before[0], total - before[1]), (1, len(queries)))
+
+        response = self.client.get('/metrics')
+        self.assertEqual(response['Content-Type'], 'text/plain; version=0.0.4; charset=utf-8')
+        body = response.content.decode()
+        self.assertIn('# TYPE hirehub_http_request_duration_seconds histogram', body)
+        self.assertIn('hirehub_http_request_duration_seconds_bucket{view="ats:api_applicant_list",method="GET",status="200",le="+Inf"}', body)
+        self.assertIn('hirehub_http_request_db_queries_count{view="ats:api_applicant_list"}', body)
+
+    @override_settings(ATS_SLOW_REQUEST_SECONDS=0)
+    def test_slow_requests_are_logged(self):
+        with self.assertLogs('ats.middleware', 'WARNING') as logs:
+            self.client.get(reverse('ats:api_applicant_list'), {'search': 'secret@example.com'})
+        self.assertIn('Slow request: GET /ats/api/applicants/ (ats:api_applicant_list)', logs.output[0])
+        self.assertNotIn('secret', logs.output[0])
+
+    def test_embedding_and_llm_metrics(self):
+        batches = self.observed(metrics.embedding_batch_size)
+        Applicant.objects.create(name="Emb Em", email="em@example.com", source="Other", resume_text="Go, Rust")
+        self.assertEqual(self.observed(metrics.embedding_batch_size)[0], batches[0] + 1)
+
+        def handler(request):
+            return httpx.Response(200, json={
+                'choices': [{'message': {'content': 'Fine.'}}], 'usage': {'prompt_tokens': 120, 'completion_tokens': 30},
+            })
+
+        async def summarize():
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                return await agent.aget_ai_match_summary(JobPosition(title="Dev"), Applicant(name="A"), client)
+
+        prompt_tokens = metrics.llm_tokens.values.get(('prompt',), 0)
+        calls = self.observed(metrics.llm_seconds, outcome='ok')[0]
+        self.assertEqual(async_to_sync(summarize)(), 'Fine.')
+        self.assertEqual(metrics.llm_tokens.values[('prompt',)], prompt_tokens + 120)
+        self.assertEqual(self.observed(metrics.llm_seconds, outcome='ok')[0], calls + 1)
+
+    def test_label_values_are_escaped(self):
+        self.assertEqual(metrics.format_labels([('view', 'a"b\\c\nd')]), '{view="a\\"b\\\\c\\nd"}')
+
+
+import pstats
+from django.contrib.auth import get_user_model
+from .profiling import load_report, report_ids
+
+class RequestProfilingTests(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        override = override_settings(ATS_PROFILE_DIR=self.tmpdir.name, ATS_PROFILE_MAX_REPORTS=2)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.staff = get_user_model().objects.create_user('ops', password='pw', is_staff=True)
+        Applicant.objects.create(name="Profiled Pat", email="pat@example.com", source="Other")
+        self.url = reverse('ats:dashboard')
+
+    def test_only_staff_requests_that_ask_are_profiled(self):
+        self.assertNotIn('X-Profile-Report', self.client.get(self.url, {'profile': '1'}))
+        self.client.force_login(get_user_model().objects.create_user('recruiter', password='pw'))
+        self.assertNotIn('X-Profile-Report', self.client.get(self.url, {'profile': '1'}))
+        self.client.force_login(self.staff)
+        self.assertNotIn('X-Profile-Report', self.client.get(self.url))
+        with override_settings(ATS_PROFILE_SAMPLE_RATE=0):
+            self.assertNotIn('X-Profile-Report', self.client.get(self.url, headers={'x-profile': '1'}))
+        self.assertEqual(report_ids(), [])
+
+    def test_report_is_stored_browsable_and_rotated(self):
+        self.client.force_login(self.staff)
+        response = self.client.get(self.url, headers={'x-profile': '1'})
+        self.assertEqual(response.status_code, 200)
+        report = load_report(response['X-Profile-Report'])
+        self.assertEqual((report['view'], report['user'], report['status']), ('ats:dashboard', 'ops', 200))
+        self.assertGreater(report['query_count'], 0)
+        self.assertEqual(len(report['queries']), report['query_count'])
+        self.assertIn('ats_applicant', ' '.join(query['sql'] for query in report['queries']))
+        self.assertIn('dashboard', report['functions'])
+
+        self.assertContains(self.client.get(reverse('profile_report_list')), report['id'])
+        detail_url = reverse('profile_report_detail', args=[report['id']])
+        self.assertContains(self.client.get(detail_url), 'ats_applicant')
+        download = self.client.get(reverse('profile_report_download', args=[report['id']]))
+        with tempfile.NamedTemporaryFile(suffix='.prof') as handle:
+            handle.write(b''.join(download.streaming_content))
+            handle.flush()
+            self.assertGreater(pstats.Stats(handle.name).total_calls, 0)
+        self.assertEqual(self.client.get(reverse('profile_report_detail', args=['..secret'])).status_code, 404)
+
+        newer = [self.client.get(self.url, {'profile': '1'})['X-Profile-Report'] for _ in range(2)]
+        self.assertEqual(report_ids(), newer[::-1])
+
+        self.client.logout()
+        self.assertEqual(self.client.get(detail_url).status_code, 302)
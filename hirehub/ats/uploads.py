@@ -0,0 +1,193 @@
+# ats/uploads.py
+# Resume upload limits, and chunked resumable uploads: a ResumeUpload is created for
+# an applicant with the file's name and size, its bytes are appended in order by as
+# many requests as the client needs, straight into a temporary file beside their
+# final place in resume_storage, and finalizing renames the file to its content-
+# addressed name. A request holds one read buffer however large the file is.
+import datetime
+import os
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from .models import Applicant, ResumeUpload
+from .resumes import keep_unreferenced_resume
+from .storage import resume_storage
+
+# Bytes read from the request per write
+READ_SIZE = 64 * 1024
+
+# Leading bytes every file of a type starts with; plain text only must not be binary
+RESUME_SIGNATURES = {
+    '.pdf': (b'%PDF-',),
+    '.docx': (b'PK\x03\x04',),
+    '.doc': (b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1',),
+}
+SIGNATURE_BYTES = 1024
+
+
+class UploadError(Exception):
+    status_code = 400
+
+
+class UploadTooLarge(UploadError):
+    status_code = 413
+
+
+class UploadNotFound(UploadError):
+    """The upload was finalized or cancelled, e.g. by a concurrent request."""
+    status_code = 404
+
+
+class UploadOffsetMismatch(UploadError):
+    """The chunk does not start where the stored bytes end; `received` says where that is."""
+    status_code = 409
+
+    def __init__(self, message, received):
+        super().__init__(message)
+        self.received = received
+
+
+def upload_limits():
+    return {
+        'max_bytes': getattr(settings, 'ATS_RESUME_MAX_BYTES', 10 * 1024 * 1024),
+        'max_chunk_bytes': getattr(settings, 'ATS_RESUME_UPLOAD_CHUNK_BYTES', 1024 * 1024),
+        'extensions': getattr(settings, 'ATS_RESUME_UPLOAD_EXTENSIONS', ['.pdf', '.doc', '.docx', '.txt']),
+    }
+
+
+def check_resume_name(filename, size):
+    """Raises UploadError unless a resume of this name and size may be stored; returns the extension."""
+    limits = upload_limits()
+    extension = os.path.splitext(filename or '')[1].lower()
+    if extension not in limits['extensions']:
+        raise UploadError(f"Resumes must be one of: {', '.join(limits['extensions'])}.")
+    if size > limits['max_bytes']:
+        raise UploadTooLarge(f"Resumes may be at most {limits['max_bytes']} bytes.")
+    return extension
+
+
+def check_resume_content(extension, head):
+    """Raises UploadError when the first bytes of a file do not match its extension."""
+    signatures = RESUME_SIGNATURES.get(extension)
+    if signatures is None:
+        if b'\x00' in head:
+            raise UploadError('The file is not plain text.')
+    elif not head.startswith(signatures):
+        raise UploadError(f'The file is not a {extension[1:].upper()} document.')
+
+
+def check_uploaded_resume(uploaded_file):
+    """check_resume_name() and check_resume_content() for a file uploaded in one request."""
+    extension = check_resume_name(uploaded_file.name, uploaded_file.size)
+    uploaded_file.seek(0)
+    check_resume_content(extension, uploaded_file.read(SIGNATURE_BYTES))
+    uploaded_file.seek(0)
+
+
+def create_upload(applicant, filename, size):
+    """Starts a chunked upload of a `size` byte resume for `applicant`; the file is created empty."""
+    check_resume_name(filename, size)
+    name = Applicant._meta.get_field('resume_file').generate_filename(applicant, filename)
+    partial = resume_storage.temporary_name(name)
+    path = resume_storage.path(partial)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, 'xb').close()
+    return ResumeUpload.objects.create(
+        applicant=applicant, filename=os.path.basename(name), partial=partial, size=size,
+    )
+
+
+def lock_upload(pk):
+    """The ResumeUpload `pk`, locked until the current transaction ends; concurrent requests queue here."""
+    try:
+        return ResumeUpload.objects.select_for_update().get(pk=pk)
+    except ResumeUpload.DoesNotExist:
+        raise UploadNotFound('The upload has been finalized or cancelled.')
+
+
+def append_chunk(upload, offset, stream, length):
+    """
+    Writes the `length` bytes read from `stream` to the upload at `offset`, which must
+    be where the stored bytes end. The upload is locked while it is written, so a
+    concurrent chunk or finalize waits and then sees the new end. Bytes that arrived
+    before the connection dropped are kept, so the client resumes from `received`
+    either way.
+    """
+    if length > upload_limits()['max_chunk_bytes']:
+        raise UploadTooLarge(f"Chunks may be at most {upload_limits()['max_chunk_bytes']} bytes.")
+    dropped = None
+    with transaction.atomic():
+        upload = lock_upload(upload.pk)
+        if offset != upload.received:
+            raise UploadOffsetMismatch(f'The upload continues at byte {upload.received}.', upload.received)
+        if offset + length > upload.size:
+            raise UploadError(f'The chunk goes past the declared size of {upload.size} bytes.')
+
+        written = 0
+        with open(resume_storage.path(upload.partial), 'r+b') as handle:
+            handle.seek(offset)
+            try:
+                while written < length:
+                    data = stream.read(min(READ_SIZE, length - written))
+                    if not data:
+                        break
+                    handle.write(data)
+                    written += len(data)
+            except OSError as exc:  # the client went away; keep what was written
+                dropped = exc
+        upload.received = offset + written
+        upload.updated_at = timezone.now()
+        upload.save(update_fields=['received', 'updated_at'])
+    if dropped is not None:
+        raise dropped
+    if written < length:
+        raise UploadError(f'The chunk ended after {written} of {length} bytes.')
+    return upload
+
+
+def finalize_upload(upload):
+    """
+    Checks that every byte arrived and that the content matches the file type, moves
+    the file to its content-addressed name and makes it the applicant's resume_file;
+    ats.signals then counts the reference and queues the text extraction.
+
+    The upload stays locked throughout, so of two concurrent finalizes the second
+    gets UploadNotFound. Should the transaction fail once the file has moved, the
+    upload, whose bytes now exist only there, is deleted and the file is left to
+    prune_resume_blobs().
+    """
+    name = None
+    try:
+        with transaction.atomic():
+            upload = lock_upload(upload.pk)
+            if upload.received != upload.size:
+                raise UploadOffsetMismatch(
+                    f'Only {upload.received} of {upload.size} bytes have been uploaded.', upload.received
+                )
+            try:
+                with open(resume_storage.path(upload.partial), 'rb') as handle:
+                    head = handle.read(SIGNATURE_BYTES)
+            except FileNotFoundError:  # moved by a finalize the lock did not hold off (SQLite)
+                raise UploadNotFound('The upload has been finalized or cancelled.')
+            check_resume_content(os.path.splitext(upload.partial)[1], head)
+
+            name = resume_storage.store_temporary(upload.partial)
+            applicant = Applicant.objects.select_for_update().get(pk=upload.applicant_id)
+            applicant.resume_file = name
+            applicant.save(update_fields=['resume_file', 'updated_at'])
+            upload.delete()
+    except Exception:
+        if name is not None:
+            keep_unreferenced_resume(name)
+            ResumeUpload.objects.filter(pk=upload.pk).delete()
+        raise
+    return applicant
+
+
+def prune_resume_uploads(max_age=datetime.timedelta(hours=24)):
+    """
+    Deletes the uploads nobody has written to for `max_age`; ats.signals deletes their
+    partial files. Returns the number deleted.
+    """
+    deleted, _ = ResumeUpload.objects.filter(updated_at__lt=timezone.now() - max_age).delete()
+    return deleted
@@ -18,6 +18,16 @@ urlpatterns = [
     # API Endpoints
     path('api/applicants/', views.ApplicantListCreateAPIView.as_view(), name='api_applicant_list'),
     path('api/applicants/<int:pk>/', views.ApplicantDetailAPIView.as_view(), name='api_applicant_detail'),
+    path('api/applicants/tags/', views.ApplicantTagCountsAPIView.as_view(), name='api_applicant_tag_counts'),
+    path('api/applicants/facets/', views.ApplicantFacetsAPIView.as_view(), name='api_applicant_facets'),
+    path('api/applicants/bulk/', views.ApplicantBulkAPIView.as_view(), name='api_applicant_bulk'),
+    path('api/applicants/transition/', views.ApplicantTransitionAPIView.as_view(), name='api_applicant_transition'),
+    path('api/applicants/export.csv', views.ApplicantExportAPIView.as_view(export_format='csv'), name='api_applicant_export_csv'),
+    path('api/applicants/export.ndjson', views.ApplicantExportAPIView.as_view(export_format='ndjson'), name='api_applicant_export_ndjson'),
+    path('api/uploads/', views.ResumeUploadCreateAPIView.as_view(), name='api_resume_upload_list'),
+    path('api/uploads/<uuid:pk>/', views.ResumeUploadDetailAPIView.as_view(), name='api_resume_upload_detail'),
+    path('api/uploads/<uuid:pk>/finalize/', views.ResumeUploadFinalizeAPIView.as_view(), name='api_resume_upload_finalize'),
+    path('api/analytics/', views.PipelineAnalyticsAPIView.as_view(), name='api_analytics'),
     path('api/positions/', views.JobPositionListCreateAPIView.as_view(), name='api_job_position_list'),
     path('api/positions/<int:pk>/', views.JobPositionDetailAPIView.as_view(), name='api_job_position_detail'),
 ]
\ No newline at end of file
@@ -1,65 +1,99 @@
 # ats/views.py
-import json
-import logging # Added for logging
-from django.core.serializers.json import DjangoJSONEncoder
-from django.shortcuts import render, get_object_or_404, redirect
-from django.db.models import Q
-from rest_framework import generics
-from .models import Applicant, JobPosition
-from .serializers import ApplicantSerializer, JobPositionSerializer
+import datetime
+import hashlib
+from calendar import timegm
+from contextlib import nullcontext
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import transaction
+from django.http import HttpResponse, StreamingHttpResponse
+from django.db.models import Count, Max
+from django.shortcuts import render, aget_object_or_404, get_object_or_404, redirect
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.dateparse import parse_date
+from django.utils.http import http_date, quote_etag
+from rest_framework import generics, status
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework.exceptions import ValidationError
+from .models import Applicant, JobPosition, ResumeUpload, RollupRefresh
+from .serializers import (
+    DEFAULT_EMBEDDING_DTYPE, EMBEDDING_DTYPES,
+    ApplicantSerializer, ApplicantSummarySerializer, ApplicantTransitionSerializer, JobPositionSerializer,
+    ResumeUploadSerializer, model_field_paths,
+)
 from .forms import ApplicantForm, JobPositionForm
+from .filters import (
+    APPLICANT_CURSOR_ORDERING_FIELDS, APPLICANT_ORDERING_FIELDS, DEFAULT_APPLICANT_ORDERING,
+    RELEVANCE_ORDERING, filter_applicants, rank_applicant_search, resolve_applicant_ordering,
+)
+from .export import resolve_export_columns, stream_export
+from .analytics import apipeline_analytics
+from .bulk import transition_applicants
+from .facets import aget_applicant_facets
+from .metrics import render_metrics
+from .parsers import NDJSONParser, ORJSONParser
+from .renderers import render_json
+from .tags import applicant_tag_counts
+from .uploads import UploadError, UploadOffsetMismatch, append_chunk, create_upload, finalize_upload, upload_limits
+from .pagination import (
+    ApplicantChangesPagination, ApplicantCursorPagination, ApplicantPagination, clamp_page_size,
+)
 
 # Template Views (serve the HTML pages)
 def dashboard(request):
     """
-    Displays the main dashboard with a list of applicants.
-    Supports filtering by stage and source, and searching by name, email, or tags.
+    Displays the main dashboard with one page of applicants.
+    Supports filtering by stage, source and job position, searching by name, email, or tags,
+    sorting by a whitelisted field, and paging. Only the current page is rendered; further
+    filtering, sorting and paging is done by dashboard.js through the applicant list API.
     """
-    queryset = Applicant.objects.all() # Start with all applicants
-
     # Get filter parameters from the request's query string
     stage = request.GET.get('stage')
     source = request.GET.get('source')
     search_query = request.GET.get('search_query')
     job_position_id = request.GET.get('job_position')
+    tags = request.GET.getlist('tag')
 
-    # Apply stage filter if 'stage' parameter is present
-    if stage:
-        queryset = queryset.filter(current_stage=stage)
-
-    # Apply source filter if 'source' parameter is present
-    if source:
-        queryset = queryset.filter(source=source)
-
-    if job_position_id:
-        queryset = queryset.filter(job_position_id=job_position_id)
+    queryset = filter_applicants(
+        Applicant.objects.all(),
+        stage=stage,
+        source=source,
+        job_position_id=job_position_id,
+        search=search_query,
+        tags=tags,
+    )
 
-    # Apply search query if 'search_query' parameter is present
-    if search_query:
-        # Use Q objects for OR queries: search in name, email, or tags
-        queryset = queryset.filter(
-            Q(name__icontains=search_query) |
-            Q(email__icontains=search_query) |
-            Q(tags__icontains=search_query)
-        )
-
-    # Prepare context for the template
-    # Add temporary logging
-    logger = logging.getLogger(__name__)
-    logger.error(f"Number of applicants in queryset: {len(queryset)}")
+    # Fall back to the default ordering instead of failing on unknown sort keys
+    ordering = request.GET.get('ordering') or DEFAULT_APPLICANT_ORDERING
+    try:
+        order_by = resolve_applicant_ordering(ordering)
+    except ValueError:
+        ordering = DEFAULT_APPLICANT_ORDERING
+        order_by = resolve_applicant_ordering(ordering)
+    queryset = queryset.order_by(*order_by).only(*ApplicantSummarySerializer.ONLY_FIELDS)
 
-    # Serialize the applicants queryset to JSON for client-side rendering
-    serializer = ApplicantSerializer(queryset, many=True)
-    serialized_data = serializer.data # Store serialized data before dumping to json
-    logger.error(f"Serialized data (first 2 items): {serialized_data[:2]}")
+    page_size = clamp_page_size(request.GET.get('page_size'))
+    page = Paginator(queryset, page_size).get_page(request.GET.get('page'))
 
-    applicants_json = json.dumps(serialized_data, cls=DjangoJSONEncoder)
-    logger.error(f"Applicants JSON (first 300 chars): {applicants_json[:300]}")
+    # Serialize only the slim rows of the current page for client-side rendering
+    applicants_json = render_json(ApplicantSummarySerializer(page.object_list, many=True).data)
+    pagination_json = render_json({
+        'count': page.paginator.count,
+        'page': page.number,
+        'page_size': page_size,
+        'num_pages': page.paginator.num_pages,
+        'ordering': ordering,
+    })
 
-    job_positions = JobPosition.objects.filter(is_active=True)
+    job_positions = JobPosition.objects.filter(is_active=True).only('id', 'title')
     context = {
-        # 'applicants': queryset, # No longer passing the queryset directly for table rendering
-        'applicants_json': applicants_json, # Pass JSON data for JS
+        'applicants_json': applicants_json, # Current page of slim rows for JS
+        'pagination_json': pagination_json, # Page metadata for JS pagination controls
         'stage_choices': Applicant.STAGE_CHOICES, # For filter dropdowns
         'source_choices': Applicant.SOURCE_CHOICES, # For filter dropdowns
         'job_positions': job_positions,
@@ -75,7 +109,7 @@ def applicant_detail(request, applicant_id):
     Displays the detailed page for a specific applicant.
     Fetches the applicant by ID or returns a 404 error if not found.
     """
-    applicant = get_object_or_404(Applicant, pk=applicant_id)
+    applicant = get_object_or_404(Applicant.objects.select_related('profile').defer('profile__embedding'), pk=applicant_id)
     context = {
         'applicant': applicant
     }
@@ -108,26 +142,31 @@ def new_applicant(request):
 
 
 def job_position_list(request):
-    job_positions = JobPosition.objects.filter(is_active=True)
+    job_positions = JobPosition.objects.filter(is_active=True).defer('embedding')
     return render(request, 'ats/job_position_list.html', {'job_positions': job_positions})
 
-from .matching import find_top_applicants_for_job
-from .agent import get_ai_match_summary
+from .matching import afind_top_applicants_for_job
+from .agent import aget_ai_match_summaries
 
-def job_position_detail(request, pk):
-    job_position = get_object_or_404(JobPosition, pk=pk)
+async def job_position_detail(request, pk):
+    """
+    Displays a job position, its applicants and the top matching applicants with an
+    AI summary each. An async view: the summaries are requested concurrently and,
+    under ASGI, the worker serves other requests while the chat API answers.
+    """
+    job_position = await aget_object_or_404(JobPosition, pk=pk)
 
-    # Existing logic to get all applicants for the position
-    applicants = job_position.applicants.all()
+    # Existing logic to get all applicants for the position; loaded here, as the
+    # template cannot query the database from the event loop
+    applicants = [applicant async for applicant in job_position.applicants.all()]
 
     # New logic to find top matching applicants
-    top_applicants = find_top_applicants_for_job(job_position.id, top_n=5) # Find top 5 for performance
+    top_applicants = await afind_top_applicants_for_job(job_position.id, top_n=5) # Find top 5 for performance
 
     # Get AI summary for each top applicant
-    # Note: This can be slow as it makes an API call for each applicant.
-    # In a production environment, this should be handled asynchronously.
-    for applicant in top_applicants:
-        applicant.ai_summary = get_ai_match_summary(job_position, applicant)
+    summaries = await aget_ai_match_summaries(job_position, top_applicants)
+    for applicant, summary in zip(top_applicants, summaries):
+        applicant.ai_summary = summary
 
     context = {
         'job_position': job_position,
@@ -159,7 +198,306 @@ def edit_job_position(request, pk):
 
 
 # API Views (handle data operations)
-class ApplicantListCreateAPIView(generics.ListCreateAPIView):
+class IncludeEmbeddingAPIMixin:
+    """
+    Embeddings are left out of API responses and deferred in the query unless the
+    client asks for them with ?include=embedding. The optional ?embedding_dtype=
+    (float32 or float16) selects the packed encoding used by EmbeddingField.
+    """
+
+    def get_includes(self):
+        return parse_csv_param(self.request.query_params.get('include'))
+
+    def include_embedding(self):
+        return 'embedding' in self.get_includes()
+
+    # The model path of the embedding; applicants keep theirs on ApplicantProfile
+    embedding_path = 'embedding'
+
+    def defer_embedding(self, queryset):
+        if self.include_embedding():
+            return queryset
+        return queryset.defer(self.embedding_path)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['include'] = self.get_includes()
+        dtype = self.request.query_params.get('embedding_dtype', DEFAULT_EMBEDDING_DTYPE)
+        if dtype not in EMBEDDING_DTYPES:
+            raise ValidationError({'embedding_dtype': [f"Must be one of: {', '.join(EMBEDDING_DTYPES)}."]})
+        context['embedding_dtype'] = dtype
+        return context
+
+def parse_csv_param(value):
+    return {item.strip() for item in (value or '').split(',') if item.strip()}
+
+class SparseFieldsetAPIMixin:
+    """
+    Supports ?fields=a,b,c and ?exclude=x,y on reads. The serializer drops the other
+    fields and the queryset is narrowed with only() to the columns those fields read,
+    so fewer bytes leave the database, fewer attributes are hydrated and less JSON is
+    rendered. Writes always use the full serializer.
+    """
+
+    def get_sparse_fieldset(self):
+        if self.request.method not in SAFE_METHODS:
+            return set(), set()
+        params = self.request.query_params
+        return parse_csv_param(params.get('fields')), parse_csv_param(params.get('exclude'))
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['fields'], context['exclude'] = self.get_sparse_fieldset()
+        return context
+
+    def apply_sparse_fieldset(self, queryset):
+        requested, excluded = self.get_sparse_fieldset()
+        if not requested and not excluded:
+            return queryset
+
+        paths = model_field_paths(self.get_serializer().fields)
+        paths.add('pk')
+        # Keep sort keys loaded; cursor pagination reads them from the last row
+        paths |= {
+            field.lstrip('-') for field in queryset.query.order_by
+            if field.lstrip('-') not in queryset.query.annotations
+        }
+
+        # Drop joins whose relation is no longer rendered
+        if isinstance(queryset.query.select_related, dict):
+            related = [
+                name for name in queryset.query.select_related
+                if any(path == name or path.startswith(name + '__') for path in paths)
+            ]
+            queryset = queryset.select_related(None)
+            if related:
+                queryset = queryset.select_related(*related)
+
+        return queryset.only(*paths)
+
+class AsyncAPIViewMixin:
+    """
+    Runs a DRF view as an async Django view, so under ASGI its `async def` handlers
+    await the async ORM on the event loop instead of holding a thread. DRF's own
+    dispatch is synchronous: here authentication, permission and throttle checks,
+    which may read the session and user, and the handlers that stay synchronous
+    (the writes) run in the ORM's thread with sync_to_async.
+    """
+    # Django insists that a view's handlers be all sync or all async; dispatch() mixes them
+    view_is_async = True
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+            if iscoroutinefunction(handler):
+                response = await handler(request, *args, **kwargs)
+            else:
+                response = await sync_to_async(handler)(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+class ConditionalAPIMixin:
+    """
+    Conditional requests. Responses carry ETag and Last-Modified validators and
+    `Cache-Control: no-cache`, so browsers revalidate instead of refetching. A
+    matching If-None-Match / If-Modified-Since is answered with 304 before the
+    rows are loaded or serialized; If-Match / If-Unmodified-Since that no longer
+    match on a write are answered with 412 Precondition Failed.
+    """
+
+    def make_etag(self, *parts):
+        # The accepted media type is part of the tag: the browsable API and JSON
+        # are different representations of the same URL
+        key = ':'.join(str(part) for part in (self.request.accepted_media_type, *parts))
+        return quote_etag(hashlib.sha1(key.encode('utf-8')).hexdigest())
+
+    def check_preconditions(self, etag, last_modified):
+        """Returns the 304/412 response for the request's conditional headers, or None."""
+        # Compression weakens the ETag (W/"..."). The tag is computed from the rows rather
+        # than the encoded bytes, so a client echoing the weak form still names this version
+        if_match = self.request.META.get('HTTP_IF_MATCH')
+        if if_match and 'W/' + etag in if_match:
+            self.request.META['HTTP_IF_MATCH'] = if_match.replace('W/' + etag, etag)
+        timestamp = last_modified and timegm(last_modified.utctimetuple())
+        response = get_conditional_response(self.request, etag=etag, last_modified=timestamp)
+        if response is not None and response.status_code == 304:
+            self.set_validators(response, etag, last_modified)
+        return response
+
+    def set_validators(self, response, etag, last_modified):
+        response['ETag'] = etag
+        if last_modified:
+            response['Last-Modified'] = http_date(timegm(last_modified.utctimetuple()))
+        patch_cache_control(response, private=True, no_cache=True)
+
+class ConditionalListAPIMixin(ConditionalAPIMixin):
+    """
+    A filtered list is validated by its row count and latest updated_at, and those of
+    the related rows in `validator_related_fields`, read in one aggregate.
+    """
+
+    # updated_at lookups of related rows nested in the payload, e.g. 'job_position__updated_at'
+    validator_related_fields = ()
+    # Set by alist() once it has read them
+    list_validators = None
+
+    def use_list_validators(self):
+        return True
+
+    def list_validator_aggregates(self):
+        aggregates = {'count': Count('pk'), 'updated_at': Max('updated_at')}
+        for i, lookup in enumerate(self.validator_related_fields):
+            aggregates[f'related_{i}'] = Max(lookup)
+            # A relation cleared by SET_NULL moves no updated_at, but changes this count
+            aggregates[f'related_{i}_count'] = Count(lookup.rsplit('__', 1)[0])
+        return aggregates
+
+    def list_validators_from(self, stats):
+        """(count, last modified, ETag parts) from the aggregate."""
+        last_modified = max(
+            (value for name, value in stats.items() if name != 'count' and not name.endswith('_count') and value),
+            default=None,
+        )
+        return stats['count'], last_modified, [stats[name] for name in sorted(stats)]
+
+    def get_list_validators(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        return self.list_validators_from(queryset.order_by().aggregate(**self.list_validator_aggregates()))
+
+    async def aget_list_validators(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        return self.list_validators_from(await queryset.order_by().aaggregate(**self.list_validator_aggregates()))
+
+    def list(self, request, *args, **kwargs):
+        if not self.use_list_validators():
+            return super().list(request, *args, **kwargs)
+        count, last_modified, parts = self.list_validators or self.get_list_validators()
+        etag = self.make_etag(*parts)
+        response = self.check_preconditions(etag, last_modified)
+        if response is not None:
+            return response
+        # Page-number pagination reuses the count instead of issuing its own
+        if hasattr(self.paginator, 'known_count'):
+            self.paginator.known_count = count
+        response = super().list(request, *args, **kwargs)
+        self.set_validators(response, etag, last_modified)
+        return response
+
+    async def alist(self, request, *args, **kwargs):
+        """
+        list() for an async handler. The validators are awaited; the page is read by
+        the paginator, which is synchronous, in the ORM's thread.
+        """
+        if self.use_list_validators():
+            self.list_validators = await self.aget_list_validators()
+        return await sync_to_async(self.list)(request, *args, **kwargs)
+
+class ConditionalObjectAPIMixin(ConditionalAPIMixin):
+    """
+    A single object is validated by its updated_at and those of the related rows in
+    `validator_related_fields`, read without loading the row.
+    """
+
+    # updated_at lookups of related rows nested in the payload, e.g. 'job_position__updated_at'
+    validator_related_fields = ()
+
+    def object_validators_queryset(self, lock=False):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset()).filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        if lock:
+            # Only the object's row; the joined related rows may be NULL
+            queryset = queryset.select_for_update(of=('self',))
+        return queryset.values_list('pk', 'updated_at', *self.validator_related_fields)
+
+    def object_validators_from(self, row):
+        if row is None:
+            return None, None
+        return self.make_etag(*row), max(value for value in row[1:] if value is not None)
+
+    def get_object_validators(self, lock=False):
+        return self.object_validators_from(self.object_validators_queryset(lock).first())
+
+    async def aget_object_validators(self):
+        return self.object_validators_from(await self.object_validators_queryset().afirst())
+
+    async def aget_object(self):
+        """get_object() for async handlers."""
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset())
+        instance = await aget_object_or_404(queryset, **{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        self.check_object_permissions(self.request, instance)
+        return instance
+
+    def conditional(self, handler, request, *args, **kwargs):
+        # A write locks the row from its If-Match check until it commits, so of two
+        # writers sending the same ETag the second waits and then gets 412
+        writing = request.method not in SAFE_METHODS
+        with transaction.atomic() if writing else nullcontext():
+            etag, last_modified = self.get_object_validators(lock=writing)
+            if etag is not None:
+                response = self.check_preconditions(etag, last_modified)
+                if response is not None:
+                    return response
+            # get_object() inside the handler raises the 404 for a missing object
+            response = handler(request, *args, **kwargs)
+            if request.method in ('PUT', 'PATCH'):
+                etag, last_modified = self.get_object_validators()
+        if request.method != 'DELETE':
+            self.set_validators(response, etag, last_modified)
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional(super().retrieve, request, *args, **kwargs)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        """retrieve() for async handlers; the validator row and the object are awaited."""
+        etag, last_modified = await self.aget_object_validators()
+        if etag is not None:
+            response = self.check_preconditions(etag, last_modified)
+            if response is not None:
+                return response
+        instance = await self.aget_object()
+        response = Response(self.get_serializer(instance).data)
+        self.set_validators(response, etag, last_modified)
+        return response
+
+    def update(self, request, *args, **kwargs):
+        return self.conditional(super().update, request, *args, **kwargs)
+
+    def destroy(self, request, *args, **kwargs):
+        return self.conditional(super().destroy, request, *args, **kwargs)
+
+def applicant_filter_kwargs(params):
+    """Maps the applicant API query parameters onto filter_applicants() arguments."""
+    return {
+        'stage': params.get('stage'),
+        'source': params.get('source'),
+        'job_position_id': params.get('job_position'),
+        'search': params.get('search'),
+        'tags': params.getlist('tag'),
+    }
+
+def applicant_api_queryset():
+    """
+    Applicants with their job position and profile joined in; the nested position
+    never needs its vector. Sparse fieldsets drop the joins they do not render.
+    """
+    return Applicant.objects.select_related('job_position', 'profile').defer('job_position__embedding')
+
+class ApplicantListCreateAPIView(AsyncAPIViewMixin, ConditionalListAPIMixin, SparseFieldsetAPIMixin, IncludeEmbeddingAPIMixin, generics.ListCreateAPIView):
     """
     API endpoint for listing and creating Applicants.
 
@@ -169,64 +507,111 @@ class ApplicantListCreateAPIView(generics.ListCreateAPIView):
             - `search`: Search by name, email, or tags (e.g., ?search=John Doe)
             - `stage`: Filter by current stage (e.g., ?stage=Interview Stage)
             - `source`: Filter by source (e.g., ?source=LinkedIn)
+            - `job_position`: Filter by job position ID (e.g., ?job_position=3)
+            - `tag`: Exact tag match, repeatable; all given tags must be present (e.g., ?tag=python&tag=remote)
         Supports ordering via query parameter:
             - `ordering`: Field to order by (e.g., ?ordering=name or ?ordering=-created_at)
-                         Defaults to '-created_at'.
+                         Defaults to '-created_at'. Must be one of APPLICANT_ORDERING_FIELDS,
+                         otherwise 400 Bad Request is returned.
+            - `ordering=relevance` together with `search` sorts by search similarity
+        Supports paging via `page` and `page_size` (capped at 100).
+        Supports keyset paging via `pagination=cursor`: the response has no `count` and
+        a `next` link carrying an opaque `cursor`. Only orderings on id, created_at,
+        updated_at and name are allowed in this mode.
+        Supports delta sync via `updated_since` (ISO 8601): returns applicants
+        changed since then, oldest change first, the ids of applicants `deleted`
+        since then, a `next` cursor link and an `updated_until` timestamp to pass
+        as `updated_since` on the following sync. Filters apply to `results` only.
+        Embeddings are omitted unless requested with `include=embedding`.
+        Supports sparse fieldsets via `fields` and `exclude` (e.g., ?fields=id,name,email).
+        Returns ETag / Last-Modified (from the count and latest `updated_at` of the
+        filtered applicants and of their job positions) and 304 Not Modified on a
+        matching If-None-Match.
 
     POST /api/applicants/:
         Creates a new applicant.
         Expects data according to ApplicantSerializer.
         Returns 201 Created on success with applicant data.
         Returns 400 Bad Request on validation errors.
+
+    GET is an async handler (see AsyncAPIViewMixin); POST runs in the ORM's thread.
     """
     queryset = Applicant.objects.all()
     serializer_class = ApplicantSerializer
-    
+    pagination_class = ApplicantPagination
+    embedding_path = 'profile__embedding'
+    validator_related_fields = ('job_position__updated_at',)
+
+    async def get(self, request, *args, **kwargs):
+        return await self.alist(request, *args, **kwargs)
+
+    def use_changes_feed(self):
+        return ApplicantChangesPagination.since_query_param in self.request.query_params
+
+    def use_cursor_pagination(self):
+        params = self.request.query_params
+        return params.get('pagination') == 'cursor' or 'cursor' in params
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            if self.use_changes_feed():
+                self._paginator = ApplicantChangesPagination()
+            elif self.use_cursor_pagination():
+                self._paginator = ApplicantCursorPagination()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
+
+    def use_list_validators(self):
+        # The changes feed is already proportional to the changes; skip the validators
+        return not self.use_changes_feed()
+
     def get_queryset(self):
-        queryset = Applicant.objects.all() # Start with all applicants
-        
         # Retrieve query parameters for search, filtering, and ordering
-        search = self.request.query_params.get('search', None)
-        stage = self.request.query_params.get('stage', None)
-        source = self.request.query_params.get('source', None)
-        job_position_id = self.request.query_params.get('job_position')
-        ordering = self.request.query_params.get('ordering', '-created_at') # Default ordering
-
-        # Apply search filter if 'search' parameter is present
-        if search:
-            # Use Q objects for OR queries: search in name, email, or tags
-            queryset = queryset.filter(
-                Q(name__icontains=search) |
-                Q(email__icontains=search) |
-                Q(tags__icontains=search)
-            )
-        
-        # Apply stage filter if 'stage' parameter is present
-        if stage:
-            queryset = queryset.filter(current_stage=stage)
-            
-        # Apply source filter if 'source' parameter is present
-        if source:
-            queryset = queryset.filter(source=source)
-
-        # Apply job_position filter if 'job_position' parameter is present
-        if job_position_id:
-            queryset = queryset.filter(job_position_id=job_position_id)
-        
-        # Apply ordering
-        queryset = queryset.order_by(ordering)
-        
-        return queryset
-
-class JobPositionListCreateAPIView(generics.ListCreateAPIView):
+        params = self.request.query_params
+        queryset = filter_applicants(
+            self.defer_embedding(applicant_api_queryset()), **applicant_filter_kwargs(params)
+        )
+
+        # Delta sync walks the (updated_at, id) index; the ordering is fixed
+        if self.use_changes_feed():
+            if 'ordering' in params:
+                raise ValidationError({'ordering': ['Ordering cannot be combined with updated_since.']})
+            return self.apply_sparse_fieldset(queryset.order_by(*ApplicantChangesPagination.ordering))
+
+        # Rank search results by similarity when asked to (page-number mode only)
+        ordering = params.get('ordering', DEFAULT_APPLICANT_ORDERING)
+        if ordering == RELEVANCE_ORDERING and params.get('search') and not self.use_cursor_pagination():
+            queryset = rank_applicant_search(queryset, params['search'])
+            return self.apply_sparse_fieldset(queryset.order_by('-search_rank', '-created_at', '-id'))
+
+        # Apply ordering; only whitelisted sort keys are accepted
+        allowed_fields = APPLICANT_ORDERING_FIELDS
+        if self.use_cursor_pagination():
+            allowed_fields = APPLICANT_CURSOR_ORDERING_FIELDS
+        try:
+            order_by = resolve_applicant_ordering(ordering, allowed_fields)
+        except ValueError as exc:
+            raise ValidationError({'ordering': [str(exc)]})
+
+        return self.apply_sparse_fieldset(queryset.order_by(*order_by))
+
+class JobPositionListCreateAPIView(ConditionalListAPIMixin, SparseFieldsetAPIMixin, IncludeEmbeddingAPIMixin, generics.ListCreateAPIView):
     queryset = JobPosition.objects.all()
     serializer_class = JobPositionSerializer
 
-class JobPositionDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
+    def get_queryset(self):
+        return self.apply_sparse_fieldset(self.defer_embedding(JobPosition.objects.all()))
+
+class JobPositionDetailAPIView(ConditionalObjectAPIMixin, SparseFieldsetAPIMixin, IncludeEmbeddingAPIMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = JobPosition.objects.all()
     serializer_class = JobPositionSerializer
 
-class ApplicantDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
+    def get_queryset(self):
+        return self.apply_sparse_fieldset(self.defer_embedding(JobPosition.objects.all()))
+
+class ApplicantDetailAPIView(AsyncAPIViewMixin, ConditionalObjectAPIMixin, SparseFieldsetAPIMixin, IncludeEmbeddingAPIMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     API endpoint for retrieving, updating, and deleting a single Applicant.
 
@@ -234,6 +619,10 @@ class ApplicantDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
         Retrieves a specific applicant by their ID.
         Returns 200 OK with applicant data.
         Returns 404 Not Found if the applicant does not exist.
+        The embedding is omitted unless requested with `?include=embedding`.
+        Supports sparse fieldsets via `?fields=` and `?exclude=`.
+        Returns ETag / Last-Modified from its and its job position's `updated_at`, and
+        304 Not Modified on a matching If-None-Match or If-Modified-Since.
 
     PUT /api/applicants/{id}/:
         Updates an existing applicant.
@@ -249,13 +638,366 @@ class ApplicantDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
         Returns 400 Bad Request on validation errors.
         Returns 404 Not Found if the applicant does not exist.
 
+    PUT and PATCH honour If-Match: 412 Precondition Failed if the applicant changed.
+
     DELETE /api/applicants/{id}/:
         Deletes an existing applicant.
         Returns 204 No Content on successful deletion.
         Returns 404 Not Found if the applicant does not exist.
+
+    GET is an async handler (see AsyncAPIViewMixin); the writes run in the ORM's thread.
     """
     queryset = Applicant.objects.all()
     serializer_class = ApplicantSerializer
+    embedding_path = 'profile__embedding'
+    validator_related_fields = ('job_position__updated_at',)
+
+    async def get(self, request, *args, **kwargs):
+        return await self.aretrieve(request, *args, **kwargs)
+
+    def get_queryset(self):
+        return self.apply_sparse_fieldset(self.defer_embedding(applicant_api_queryset()))
+
+class ApplicantTagCountsAPIView(AsyncAPIViewMixin, APIView):
+    """
+    API endpoint for tag usage counts.
+
+    GET /api/applicants/tags/:
+        Returns [{"name": ..., "count": ...}] for the applicants matching the same
+        `search`, `stage`, `source`, `job_position` and `tag` filters as the list API.
+        Counted with one grouped query over the applicant/tag join table.
+    """
+
+    async def get(self, request):
+        applicants = filter_applicants(Applicant.objects.all(), **applicant_filter_kwargs(request.query_params))
+        return Response([row async for row in applicant_tag_counts(applicants)])
+
+class ApplicantFacetsAPIView(AsyncAPIViewMixin, APIView):
+    """
+    API endpoint for the dashboard filter counts.
+
+    GET /api/applicants/facets/:
+        Returns the total `count` plus per-value counts for `stage`, `source`,
+        `job_position` and `tag`, for the applicants matching the same filters as
+        the list API. Computed with one grouped query and cached briefly.
+    """
+
+    async def get(self, request):
+        filters = applicant_filter_kwargs(request.query_params)
+        applicants = filter_applicants(Applicant.objects.all(), **filters)
+        return Response(await aget_applicant_facets(applicants, filters))
+
+class ApplicantExportAPIView(APIView):
+    """
+    API endpoint for full exports.
+
+    GET /api/applicants/export.csv and /api/applicants/export.ndjson:
+        Streams every applicant matching the same `search`, `stage`, `source`,
+        `job_position` and `tag` filters as the list API, in id order, as CSV (with
+        a header row) or NDJSON. `fields` selects and orders the columns
+        (e.g., ?fields=id,name,email). Rows are read with values_list() in chunks and
+        written without serializers, so memory stays flat however many rows match.
+        CSV text starting with =, +, -, @, tab or carriage return is prefixed with '
+        so spreadsheets do not evaluate it as a formula.
+    """
+    export_format = 'csv'
+
+    def perform_content_negotiation(self, request, force=False):
+        # The body is CSV/NDJSON whatever the Accept header says; renderers only format errors
+        return super().perform_content_negotiation(request, force=True)
+
+    def get(self, request):
+        params = request.query_params
+        try:
+            columns = resolve_export_columns(
+                [field.strip() for field in params.get('fields', '').split(',') if field.strip()]
+            )
+        except ValueError as exc:
+            raise ValidationError({'fields': [str(exc)]})
+
+        applicants = filter_applicants(Applicant.objects.all(), **applicant_filter_kwargs(params))
+        chunks, content_type = stream_export(applicants, columns, self.export_format)
+        response = StreamingHttpResponse(chunks, content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="applicants.{self.export_format}"'
+        return response
+
+class ApplicantBulkAPIView(generics.GenericAPIView):
+    """
+    API endpoint for bulk applicant writes, e.g. job-board imports.
+
+    POST /api/applicants/bulk/:
+        Creates applicants from a JSON array of ApplicantSerializer objects, or from
+        NDJSON (one object per line) sent as `application/x-ndjson`.
+
+    POST /api/applicants/bulk/?upsert=true:
+        Idempotent ingest: rows matching an existing applicant on (email, job_position)
+        update it, overwriting only the fields that differ; identical rows are left
+        untouched and reported as "unchanged", so replays and retries write nothing.
+
+    PATCH /api/applicants/bulk/:
+        Partially updates applicants; every row carries the `id` of its target.
+
+    At most ATS_BULK_MAX_ROWS rows per request. Rows are validated independently and
+    the valid ones are written with bulk_create / bulk_update in chunks; embeddings
+    for the batch are computed with one encode call. The response has a result per
+    input row, e.g.
+        {"created": 1, "updated": 0, "unchanged": 0, "errors": 1, "results": [
+            {"index": 0, "status": "created", "id": 7},
+            {"index": 1, "status": "error", "errors": {"email": [...]}}]}
+    Returns 201 Created / 200 OK when every row was written, 207 Multi-Status when
+    some rows were rejected and 400 Bad Request when none were written.
+    """
+    queryset = Applicant.objects.all()
+    serializer_class = ApplicantSerializer
+    parser_classes = [ORJSONParser, NDJSONParser]
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['upsert'] = self.request.method == 'POST' and self.request.query_params.get('upsert') in ('1', 'true')
+        return context
+
+    def post(self, request, *args, **kwargs):
+        return self.bulk_write(request, status.HTTP_201_CREATED)
+
+    def patch(self, request, *args, **kwargs):
+        rows = request.data if isinstance(request.data, list) else []
+        ids = [row.get('id') for row in rows if isinstance(row, dict)]
+        ids = [int(pk) for pk in ids if isinstance(pk, int) or (isinstance(pk, str) and pk.isdigit())]
+        applicants = Applicant.objects.select_related('profile').defer('profile__embedding').in_bulk(ids)
+        return self.bulk_write(request, status.HTTP_200_OK, instance=applicants, partial=True)
+
+    def bulk_write(self, request, success_status, **kwargs):
+        max_rows = getattr(settings, 'ATS_BULK_MAX_ROWS', 1000)
+        serializer = self.get_serializer(data=request.data, many=True, max_length=max_rows, **kwargs)
+        serializer.is_valid(raise_exception=True) # Only a malformed request as a whole is raised
+        applicants = serializer.save()
+
+        results = [
+            {'index': index, 'status': outcome, 'id': applicant.pk}
+            for index, applicant, outcome in zip(serializer.row_indexes, applicants, serializer.row_outcomes)
+        ]
+        results += [
+            {'index': index, 'status': 'error', 'errors': errors}
+            for index, errors in serializer.row_errors.items()
+        ]
+        results.sort(key=lambda result: result['index'])
+
+        if not serializer.row_errors:
+            response_status = success_status
+        elif applicants:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+        counts = {outcome: serializer.row_outcomes.count(outcome) for outcome in ('created', 'updated', 'unchanged')}
+        return Response({**counts, 'errors': len(serializer.row_errors), 'results': results}, status=response_status)
+
+class ApplicantTransitionAPIView(generics.GenericAPIView):
+    """
+    API endpoint for bulk stage changes, e.g. rejecting everyone left once an offer is accepted.
+
+    POST /api/applicants/transition/:
+        Moves a selection of applicants to `current_stage` with a single UPDATE. The
+        selection is either explicit `ids` (at most ATS_BULK_MAX_ROWS) or a `filter`
+        object with the list API's `stage`, `source`, `job_position`, `search` and
+        `tag` parameters, e.g.
+            {"filter": {"job_position": 3}, "current_stage": "Rejected"}
+        Only applicants whose stage allows the move (Applicant.STAGE_TRANSITIONS) are
+        changed; the others are counted by stage. With "dry_run": true nothing is
+        written. The response reports the counts, e.g.
+            {"current_stage": "Rejected", "dry_run": false, "matched": 12, "updated": 9,
+             "unchanged": 2, "not_allowed": {"Hired": 1}, "not_found": 0}
+        `not_found` counts requested ids with no applicant (always 0 for a filter).
+    """
+    serializer_class = ApplicantTransitionSerializer
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        if 'ids' in data:
+            queryset = Applicant.objects.filter(pk__in=data['ids'])
+        else:
+            selection = data['filter']
+            queryset = filter_applicants(
+                Applicant.objects.all(),
+                stage=selection.get('stage'),
+                source=selection.get('source'),
+                job_position_id=selection.get('job_position'),
+                search=selection.get('search'),
+                tags=selection.get('tag'),
+            )
+        counts = transition_applicants(queryset, data['current_stage'], dry_run=data['dry_run'])
+        not_found = len(data['ids']) - counts['matched'] if 'ids' in data else 0
+        return Response({
+            'current_stage': data['current_stage'], 'dry_run': data['dry_run'], **counts, 'not_found': not_found,
+        })
+
+class PipelineAnalyticsAPIView(AsyncAPIViewMixin, ConditionalAPIMixin, APIView):
+    """
+    API endpoint for pipeline reporting.
+
+    GET /api/analytics/:
+        Returns, for the applicants who applied between `start` and `end` (ISO dates,
+        inclusive; the last 12 weeks by default), optionally narrowed to one
+        `job_position` and/or `source`:
+        - `funnel`: applicants who reached at least each pipeline stage, with the
+          conversion from the first stage and from the previous one
+        - `time_to_hire`: number of hires and the median whole days from applying
+          to the first move to Hired
+        - `sources`: applicants, interviewed, offered and hired per source, with the
+          hire rate and median days to hire
+        - `positions`: applicants per position per week (weeks start on Monday)
+        Everything is read from the daily rollups kept by `manage.py refresh_rollups`,
+        so figures are as of `refreshed_at`; the response is revalidated against the
+        latest refresh with ETag / Last-Modified.
+    """
+    DEFAULT_DAYS = 84
+
+    def get_params(self):
+        params = self.request.query_params
+        errors = {}
+        dates = {}
+        for name in ('start', 'end'):
+            value = params.get(name)
+            try:
+                dates[name] = parse_date(value) if value else None
+            except ValueError:  # well-formed but impossible, e.g. 2024-02-30
+                dates[name] = None
+            if value and dates[name] is None:
+                errors[name] = ['Enter a date in YYYY-MM-DD format.']
+        source = params.get('source') or None
+        if source and source not in dict(Applicant.SOURCE_CHOICES):
+            errors['source'] = [f'"{source}" is not a valid source.']
+        job_position = params.get('job_position') or None
+        if job_position and not job_position.isdigit():
+            errors['job_position'] = ['A valid integer is required.']
+        if errors:
+            raise ValidationError(errors)
+
+        end = dates['end'] or timezone.localdate()
+        start = dates['start'] or end - datetime.timedelta(days=self.DEFAULT_DAYS - 1)
+        if start > end:
+            raise ValidationError({'start': ['Must not be after end.']})
+        return start, end, int(job_position) if job_position else None, source
+
+    async def get(self, request):
+        start, end, job_position, source = self.get_params()
+        refresh = await RollupRefresh.objects.afirst()
+        etag = last_modified = None
+        if refresh is not None:
+            etag, last_modified = self.make_etag(refresh.pk, start, end, job_position, source), refresh.finished_at
+            response = self.check_preconditions(etag, last_modified)
+            if response is not None:
+                return response
+
+        data = await apipeline_analytics(start, end, job_position_id=job_position, source=source)
+        data['refreshed_at'] = last_modified
+        response = Response(data)
+        if etag is not None:
+            self.set_validators(response, etag, last_modified)
+        return response
+
+class ResumeUploadAPIMixin:
+    """Upload errors as {"detail": ...} responses; offset mismatches also say where to resume."""
+
+    def upload_response(self, upload, response_status=status.HTTP_200_OK):
+        response = Response(ResumeUploadSerializer(upload).data, status=response_status)
+        response['Upload-Offset'] = str(upload.received)
+        return response
+
+    def handle_exception(self, exc):
+        if isinstance(exc, UploadError):
+            data = {'detail': str(exc)}
+            response = Response(data, status=exc.status_code)
+            if isinstance(exc, UploadOffsetMismatch):
+                data['received'] = exc.received
+                response['Upload-Offset'] = str(exc.received)
+            return response
+        return super().handle_exception(exc)
+
+class ResumeUploadCreateAPIView(ResumeUploadAPIMixin, generics.CreateAPIView):
+    """
+    API endpoint starting a chunked, resumable resume upload.
+
+    POST /api/uploads/:
+        Declares the upload: {"applicant": 7, "filename": "cv.pdf", "size": 7340032}.
+        The type (ATS_RESUME_UPLOAD_EXTENSIONS) and size (ATS_RESUME_MAX_BYTES) are
+        checked here, before any byte is sent. Returns 201 Created with the upload's
+        `id`, `received` (0) and `max_chunk_bytes`, and its URL in Location.
+    Then PATCH the chunks to /api/uploads/{id}/ and POST /api/uploads/{id}/finalize/.
+    """
+    serializer_class = ResumeUploadSerializer
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        upload = create_upload(data['applicant'], data['filename'], data['size'])
+        response = self.upload_response(upload, status.HTTP_201_CREATED)
+        response.data['max_chunk_bytes'] = upload_limits()['max_chunk_bytes']
+        response['Location'] = reverse('ats:api_resume_upload_detail', kwargs={'pk': upload.pk})
+        return response
+
+class ResumeUploadDetailAPIView(ResumeUploadAPIMixin, APIView):
+    """
+    API endpoint for the chunks of a resume upload.
+
+    GET /api/uploads/{id}/:
+        The upload's state; `received` (also the Upload-Offset header) is where the
+        next chunk starts, e.g. after a dropped connection.
+
+    PATCH /api/uploads/{id}/:
+        Appends the raw request body (any content type, at most
+        ATS_RESUME_UPLOAD_CHUNK_BYTES) at the byte given by the Upload-Offset header,
+        which must equal `received`; otherwise 409 Conflict with the right offset.
+        The body is streamed to disk, never held in memory. Returns the new state.
+
+    DELETE /api/uploads/{id}/:
+        Cancels the upload and deletes the bytes received so far.
+    """
+
+    def get(self, request, pk):
+        return self.upload_response(get_object_or_404(ResumeUpload, pk=pk))
+
+    def patch(self, request, pk):
+        upload = get_object_or_404(ResumeUpload, pk=pk)
+        offset = request.headers.get('Upload-Offset', '')
+        if not offset.isdigit():
+            raise ValidationError({'Upload-Offset': ['The header must give the byte the chunk starts at.']})
+        length = request.headers.get('Content-Length', '')
+        if not length.isdigit():
+            return Response({'detail': 'Content-Length is required.'}, status=status.HTTP_411_LENGTH_REQUIRED)
+        # The raw stream: request.data is never read, so no parser buffers the body
+        upload = append_chunk(upload, int(offset), request.stream, int(length))
+        return self.upload_response(upload)
+
+    def delete(self, request, pk):
+        get_object_or_404(ResumeUpload, pk=pk).delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+class ResumeUploadFinalizeAPIView(ResumeUploadAPIMixin, APIView):
+    """
+    API endpoint completing a resume upload.
+
+    POST /api/uploads/{id}/finalize/:
+        Once `received` equals `size`, checks the content against the declared type,
+        stores the file under its content hash and makes it the applicant's
+        resume_file (queuing its text extraction). Returns the applicant id and the
+        stored name; 409 Conflict with `received` while bytes are missing.
+    """
+
+    def post(self, request, pk):
+        upload = get_object_or_404(ResumeUpload, pk=pk)
+        applicant = finalize_upload(upload)
+        return Response({'applicant': applicant.pk, 'resume_file': applicant.resume_file.name, 'size': upload.size})
+
+def metrics(request):
+    """
+    GET /metrics: this process's request, database, embedding, vector search and
+    chat API metrics in the Prometheus text format; see ats.metrics.
+    """
+    return HttpResponse(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
 
 # Custom Error Views
 from django.shortcuts import render # Already imported, but good for clarity if moving
@@ -47,11 +47,14 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'ats.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'ats.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'ats.middleware.ProfilingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -113,6 +116,29 @@ else:
         }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/ref/settings/#caches
+# The dashboard facet counts (ats.facets) are invalidated on applicant writes by
+# bumping a version key in this cache, so every worker process must share it: set
+# REDIS_URL wherever more than one process serves requests. The fallback is a
+# per-process memory cache, in which another process's write only shows once the
+# entries expire (ATS_FACETS_CACHE_TIMEOUT).
+
+if os.environ.get('REDIS_URL') and not ('test' in sys.argv or os.environ.get('CI') == 'true'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -168,5 +194,62 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.AllowAny',  # We should change this for production
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
-    'PAGE_SIZE': 20
-}
\ No newline at end of file
+    'PAGE_SIZE': 20,
+    # orjson-backed JSON when orjson is installed; plain json otherwise
+    'DEFAULT_RENDERER_CLASSES': [
+        'ats.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'ats.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+}
+
+# Seconds the dashboard facet counts stay cached; applicant writes also invalidate them
+ATS_FACETS_CACHE_TIMEOUT = 30
+
+# Bulk applicant API: rows accepted per request, and rows per INSERT/UPDATE statement
+ATS_BULK_MAX_ROWS = 1000
+ATS_BULK_CHUNK_SIZE = 500
+
+# Rows fetched per database round trip by the streaming applicant export
+ATS_EXPORT_CHUNK_SIZE = 2000
+
+# Seconds behind now that a delta sync's updated_until is held, so writes committing
+# later than their updated_at are picked up by the next sync instead of skipped
+ATS_DELTA_SYNC_LAG = 30
+
+# Smallest JSON/HTML response body, in bytes, that CompressionMiddleware compresses
+ATS_COMPRESSION_MIN_SIZE = 1024
+
+# Resume text extraction (ats.resumes): worker processes (0 extracts in the saving
+# thread), and the per-file size, PDF page, text length and time limits
+ATS_RESUME_EXTRACTION_WORKERS = 2
+ATS_RESUME_MAX_BYTES = 10 * 1024 * 1024
+ATS_RESUME_MAX_PAGES = 20
+ATS_RESUME_MAX_CHARS = 100000
+ATS_RESUME_EXTRACTION_TIMEOUT = 30
+
+# Resume uploads (ats.uploads): accepted file types, checked by extension and leading
+# bytes, and the largest chunk of the chunked upload API; ATS_RESUME_MAX_BYTES above
+# caps every upload. Unfinished chunked uploads are deleted by dedupe_resumes after
+# ATS_RESUME_UPLOAD_EXPIRY_HOURS without a chunk.
+ATS_RESUME_UPLOAD_EXTENSIONS = ['.pdf', '.doc', '.docx', '.txt']
+ATS_RESUME_UPLOAD_CHUNK_BYTES = 1024 * 1024
+ATS_RESUME_UPLOAD_EXPIRY_HOURS = 24
+
+# Seconds to wait for the chat API behind the AI match summaries (ats.agent)
+ATS_AI_SUMMARY_TIMEOUT = 60
+
+# Requests taking at least this many seconds are logged by RequestMetricsMiddleware
+# (None turns the log off); every request is counted on /metrics either way
+ATS_SLOW_REQUEST_SECONDS = 1.0
+
+# Opt-in request profiling (ats.profiling): the share of staff requests sending an
+# X-Profile header or ?profile= that are profiled, where the reports are written,
+# and how many of the newest are kept; browse them at /admin/profiles/
+ATS_PROFILE_SAMPLE_RATE = 1.0
+ATS_PROFILE_DIR = BASE_DIR / 'profiles'
+ATS_PROFILE_MAX_REPORTS = 100
@@ -20,10 +20,18 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 
-# from ats import views as ats_views # No longer needed for handlers if using string paths
+from ats import admin as ats_admin, views as ats_views
 
 urlpatterns = [
+    # Request profiles; staff only, like the rest of the admin
+    path('admin/profiles/', admin.site.admin_view(ats_admin.profile_report_list), name='profile_report_list'),
+    path('admin/profiles/<str:report_id>/', admin.site.admin_view(ats_admin.profile_report_detail), name='profile_report_detail'),
+    path(
+        'admin/profiles/<str:report_id>/download/', admin.site.admin_view(ats_admin.profile_report_download),
+        name='profile_report_download',
+    ),
     path('admin/', admin.site.urls),
+    path('metrics', ats_views.metrics, name='metrics'),  # Prometheus scrape target
     path('ats/', include('ats.urls')),  # Include URLs from the ATS application
 ]
 if settings.DEBUG:
@@ -1,6 +1,7 @@
 // Global variables
 let applicantId = null;
 let applicantData = null;
+let applicantEtag = null; // Version of applicantData, sent back as If-Match on updates
 
 // API Configuration
 const API_BASE_URL = '/api/applicants/';
@@ -29,6 +30,7 @@ async function loadApplicantDetails() {
             throw new Error(`HTTP error! status: ${response.status}`);
         }
         
+        applicantEtag = response.headers.get('ETag');
         applicantData = await response.json();
         populateApplicantDetails();
         
@@ -137,21 +139,33 @@ async function updateApplicant(event) {
         comments_evaluation: formData.get('comments_evaluation')
     };
     
+    const headers = {
+        'Content-Type': 'application/json',
+        'X-CSRFToken': getCsrfToken()
+    };
+    if (applicantEtag) {
+        headers['If-Match'] = applicantEtag;
+    }
+
     try {
         const response = await fetch(`${API_BASE_URL}${applicantId}/`, {
             method: 'PATCH',
-            headers: {
-                'Content-Type': 'application/json',
-                'X-CSRFToken': getCsrfToken()
-            },
+            headers: headers,
             body: JSON.stringify(updateData)
         });
         
+        if (response.status === 412) {
+            // Someone else saved the applicant since it was loaded
+            loadApplicantDetails();
+            throw new Error('the applicant was changed by someone else; the latest version has been reloaded');
+        }
+
         if (!response.ok) {
             const errorData = await response.json();
             throw new Error(errorData.detail || `HTTP error! status: ${response.status}`);
         }
         
+        applicantEtag = response.headers.get('ETag');
         const updatedData = await response.json();
         applicantData = updatedData;
         
@@ -1,62 +1,64 @@
 // Global variables
-let applicantsData = [];
-let filteredData = [];
+let pageData = [];
+let pagination = { count: 0, page: 1, page_size: 20, num_pages: 1, ordering: '-created_at' };
 let currentSort = { field: null, direction: 'asc' };
 let currentPage = 1;
-const itemsPerPage = 20;
+let itemsPerPage = 20;
 
-// API Configuration
-const API_BASE_URL = '/api/applicants/';
+// API Configuration (API_BASE_URL is normally provided by the dashboard template)
+const APPLICANTS_API_URL = (typeof API_BASE_URL !== 'undefined') ? API_BASE_URL : '/ats/api/applicants/';
+
+// Only the columns the table renders are requested from the API
+const LIST_FIELDS = ['id', 'name', 'email', 'current_stage', 'source', 'last_status_update'];
+
+// Table columns map onto these API sort keys
+const SORT_KEYS = {
+    applicant_id: 'id',
+    name: 'name',
+    email: 'email',
+    current_stage: 'current_stage',
+    source: 'source',
+    last_status_update: 'last_status_update',
+};
 
 // Initialize dashboard
 document.addEventListener('DOMContentLoaded', function() {
-    console.log('DOMContentLoaded event fired.');
-    let localInitialApplicantsData = []; // Use a local variable, then assign to global if valid
-
-    // Safely parse initialApplicantsData from rawJsonData (defined in HTML script tag)
+    // The server renders the first page; parse it together with its page metadata
     if (typeof rawJsonData !== 'undefined' && rawJsonData) {
         try {
-            localInitialApplicantsData = JSON.parse(rawJsonData);
+            pageData = JSON.parse(rawJsonData);
         } catch (e) {
-            console.error("Error parsing rawJsonData:", e, "Raw data was:", rawJsonData);
-            // localInitialApplicantsData remains []
+            console.error('Error parsing rawJsonData:', e);
+            pageData = [];
         }
     }
-
-    console.log('Checking parsed initialApplicantsData within DOMContentLoaded:');
-    // Check localInitialApplicantsData instead of the global one that might not be set yet
-    if (localInitialApplicantsData && typeof localInitialApplicantsData.slice === 'function') { // Check if it's array-like
-        console.log('Parsed initialApplicantsData (first 2 items) in JS:', localInitialApplicantsData.slice(0, 2));
-        console.log('Type of parsed initialApplicantsData in JS:', typeof localInitialApplicantsData);
-        console.log('Is parsed initialApplicantsData an Array in JS?', Array.isArray(localInitialApplicantsData));
-        console.log('Length of parsed initialApplicantsData in JS:', localInitialApplicantsData.length);
-    } else {
-        console.error('Parsed initialApplicantsData is not an array or is undefined in dashboard.js DOMContentLoaded!');
+    if (typeof rawPaginationData !== 'undefined' && rawPaginationData) {
+        try {
+            pagination = JSON.parse(rawPaginationData);
+        } catch (e) {
+            console.error('Error parsing rawPaginationData:', e);
+        }
     }
 
-    // Try to load data from Django context first
-    // Use the locally parsed and validated localInitialApplicantsData
-    if (Array.isArray(localInitialApplicantsData) && localInitialApplicantsData.length > 0) {
-        console.log("Loading data from successfully parsed Django context");
-        applicantsData = localInitialApplicantsData; // Assign to global
-        filteredData = [...applicantsData]; // Assign to global
-
-        // Apply initial filters from server-rendered values
-        if (typeof initialFilters !== 'undefined') {
-            document.getElementById('searchInput').value = initialFilters.search || '';
-            document.getElementById('stageFilter').value = initialFilters.stage || '';
-            document.getElementById('sourceFilter').value = initialFilters.source || '';
-            document.getElementById('jobPositionFilter').value = initialFilters.job_position || '';
-            applyFilters(initialFilters.search);
-        } else {
-            applyFilters();
-        }
+    currentPage = pagination.page || 1;
+    itemsPerPage = pagination.page_size || itemsPerPage;
+    currentSort = parseOrdering(pagination.ordering);
+
+    // Apply initial filters from server-rendered values
+    if (typeof initialFilters !== 'undefined') {
+        document.getElementById('searchInput').value = initialFilters.search || '';
+        document.getElementById('stageFilter').value = initialFilters.stage || '';
+        document.getElementById('sourceFilter').value = initialFilters.source || '';
+        document.getElementById('jobPositionFilter').value = initialFilters.job_position || '';
+    }
 
+    if (Array.isArray(pageData)) {
         renderTable();
         renderPagination();
+        updateSortArrows();
         showLoading(false);
+        loadFacets();
     } else {
-        console.log('Parsed initialApplicantsData is empty or invalid. Falling back to loadApplicants().');
         loadApplicants();
     }
 
@@ -71,47 +73,61 @@ document.addEventListener('DOMContentLoaded', function() {
     }
 });
 
-// Load applicants from API (used as fallback or for refresh functionality if added later)
+// Build the API query string from the current filters only
+function buildFilterParams() {
+    const params = new URLSearchParams();
+    const search = document.getElementById('searchInput').value.trim();
+    const stage = document.getElementById('stageFilter').value;
+    const source = document.getElementById('sourceFilter').value;
+    const jobPosition = document.getElementById('jobPositionFilter').value;
+
+    if (search) params.set('search', search);
+    if (stage) params.set('stage', stage);
+    if (source) params.set('source', source);
+    if (jobPosition) params.set('job_position', jobPosition);
+    return params;
+}
+
+// Build the API query string from the current filters, sort and page
+function buildQueryParams() {
+    const params = buildFilterParams();
+    if (currentSort.field) {
+        const key = SORT_KEYS[currentSort.field] || currentSort.field;
+        params.set('ordering', currentSort.direction === 'desc' ? `-${key}` : key);
+    }
+    params.set('page', currentPage);
+    params.set('page_size', itemsPerPage);
+    params.set('fields', LIST_FIELDS.join(','));
+    return params;
+}
+
+// Load one page of applicants from the API; filtering, sorting and paging happen server-side
 async function loadApplicants() {
     showLoading(true);
     hideError();
-    
+
     try {
-        const response = await fetch(API_BASE_URL); // Fetches all applicants
+        const response = await fetch(`${APPLICANTS_API_URL}?${buildQueryParams().toString()}`);
         if (!response.ok) {
             throw new Error(`HTTP error! status: ${response.status}`);
         }
-        
+
         const data = await response.json();
-        let rawData = []; // Initialize as empty array
-
-        if (data && typeof data === 'object') {
-            if (Array.isArray(data.results)) {
-                rawData = data.results; // Handle DRF paginated response
-            } else if (Array.isArray(data)) {
-                rawData = data; // Handle non-paginated list response
-            } else {
-                // Log if the structure is an object but not as expected
-                console.error('API response is an object but not in expected format (array or {results: array}):', data);
-            }
-        } else {
-            // Log if the response is not even an object (e.g., null, string, number)
-            console.error('API response is not a valid object or array:', data);
-        }
+        pageData = (data && Array.isArray(data.results)) ? data.results : [];
+        pagination.count = (data && typeof data.count === 'number') ? data.count : pageData.length;
+        pagination.num_pages = Math.max(1, Math.ceil(pagination.count / itemsPerPage));
 
-        applicantsData = rawData; // Ensure applicantsData is always at least []
-        filteredData = [...applicantsData]; // Create a new array for filtering
-        
-        // Apply filters that might be set in the UI (e.g., if user types before API loads)
-        // This ensures consistency if API load is slow and user interacts with filters.
-        const currentSearchTerm = document.getElementById('searchInput').value;
-        applyFilters(currentSearchTerm); // This will also call renderTable and renderPagination
+        renderTable();
+        renderPagination();
+        updateSortArrows();
+        loadFacets();
 
     } catch (error) {
         console.error('Error loading applicants from API:', error);
         showError('Failed to load applicants. Please try again.');
-        applicantsData = []; // Ensure data is empty on error
-        filteredData = [];
+        pageData = [];
+        pagination.count = 0;
+        pagination.num_pages = 1;
         renderTable(); // Render empty table
         renderPagination(); // Render empty pagination
     } finally {
@@ -119,23 +135,48 @@ async function loadApplicants() {
     }
 }
 
+// Load per-stage/source/position counts for the current filters and show them in the dropdowns
+async function loadFacets() {
+    if (typeof FACETS_API_URL === 'undefined') return;
+
+    try {
+        const response = await fetch(`${FACETS_API_URL}?${buildFilterParams().toString()}`);
+        if (!response.ok) {
+            throw new Error(`HTTP error! status: ${response.status}`);
+        }
+        const facets = await response.json();
+        renderFacetCounts('stageFilter', facets.stage);
+        renderFacetCounts('sourceFilter', facets.source);
+        renderFacetCounts('jobPositionFilter', facets.job_position);
+    } catch (error) {
+        // Counts are informational only; the table still works without them
+        console.error('Error loading facet counts:', error);
+    }
+}
+
+function renderFacetCounts(selectId, buckets) {
+    const select = document.getElementById(selectId);
+    if (!select || !Array.isArray(buckets)) return;
+
+    const counts = {};
+    buckets.forEach(bucket => { counts[String(bucket.value)] = bucket.count; });
+
+    Array.from(select.options).forEach(option => {
+        if (!option.value) return; // "All ..." option
+        if (!option.dataset.label) option.dataset.label = option.textContent;
+        option.textContent = `${option.dataset.label} (${counts[option.value] || 0})`;
+    });
+}
+
 // Render applicants table
 function renderTable() {
     const tbody = document.getElementById('applicantsTableBody');
-    const startIndex = (currentPage - 1) * itemsPerPage;
-    const endIndex = startIndex + itemsPerPage;
-    const pageData = filteredData.slice(startIndex, endIndex);
-
-    console.log('renderTable called. Page data (first 2 items):', pageData.slice(0,2));
-    console.log('filteredData length:', filteredData.length);
-    console.log('currentPage:', currentPage);
-    console.log('itemsPerPage:', itemsPerPage);
-    
+
     if (pageData.length === 0) {
         tbody.innerHTML = '<tr><td colspan="7" style="text-align: center; padding: 40px;">No applicants found</td></tr>';
         return;
     }
-    
+
     tbody.innerHTML = pageData.map(applicant => `
         <tr>
             <td>${applicant.applicant_id || applicant.id}</td>
@@ -155,19 +196,19 @@ function renderTable() {
 
 // Render pagination
 function renderPagination() {
-    const pagination = document.getElementById('pagination');
-    const totalPages = Math.ceil(filteredData.length / itemsPerPage);
-    
+    const container = document.getElementById('pagination');
+    const totalPages = pagination.num_pages || 1;
+
     if (totalPages <= 1) {
-        pagination.innerHTML = '';
+        container.innerHTML = '';
         return;
     }
-    
+
     let paginationHTML = '';
-    
+
     // Previous button
     paginationHTML += `<button onclick="changePage(${currentPage - 1})" ${currentPage === 1 ? 'disabled' : ''}>Previous</button>`;
-    
+
     // Page numbers
     for (let i = 1; i <= totalPages; i++) {
         if (i === 1 || i === totalPages || (i >= currentPage - 2 && i <= currentPage + 2)) {
@@ -176,20 +217,18 @@ function renderPagination() {
             paginationHTML += '<span>...</span>';
         }
     }
-    
+
     // Next button
     paginationHTML += `<button onclick="changePage(${currentPage + 1})" ${currentPage === totalPages ? 'disabled' : ''}>Next</button>`;
-    
-    pagination.innerHTML = paginationHTML;
+
+    container.innerHTML = paginationHTML;
 }
 
 // Change page
 function changePage(page) {
-    const totalPages = Math.ceil(filteredData.length / itemsPerPage);
-    if (page >= 1 && page <= totalPages) {
+    if (page >= 1 && page <= (pagination.num_pages || 1)) {
         currentPage = page;
-        renderTable();
-        renderPagination();
+        loadApplicants();
     }
 }
 
@@ -201,32 +240,18 @@ function sortTable(field) {
         currentSort.field = field;
         currentSort.direction = 'asc';
     }
-    
-    filteredData.sort((a, b) => {
-        let aVal = a[field] || '';
-        let bVal = b[field] || '';
-        
-        // Handle different data types
-        if (field === 'applicant_id' || field === 'id') {
-            aVal = parseInt(aVal) || 0;
-            bVal = parseInt(bVal) || 0;
-        } else if (field === 'last_status_update' || field === 'updated_at') {
-            aVal = new Date(aVal);
-            bVal = new Date(bVal);
-        } else {
-            aVal = aVal.toString().toLowerCase();
-            bVal = bVal.toString().toLowerCase();
-        }
-        
-        if (aVal < bVal) return currentSort.direction === 'asc' ? -1 : 1;
-        if (aVal > bVal) return currentSort.direction === 'asc' ? 1 : -1;
-        return 0;
-    });
-    
+
     currentPage = 1;
-    renderTable();
-    renderPagination();
-    updateSortArrows();
+    loadApplicants();
+}
+
+// Map an API ordering string (e.g. '-created_at') back onto a table column
+function parseOrdering(ordering) {
+    if (!ordering) return { field: null, direction: 'asc' };
+    const direction = ordering.startsWith('-') ? 'desc' : 'asc';
+    const key = ordering.replace(/^-/, '');
+    const field = Object.keys(SORT_KEYS).find(column => SORT_KEYS[column] === key) || null;
+    return { field: field, direction: direction };
 }
 
 // Update sort arrows
@@ -234,7 +259,7 @@ function updateSortArrows() {
     document.querySelectorAll('.sort-arrow').forEach(arrow => {
         arrow.textContent = '↕';
     });
-    
+
     if (currentSort.field) {
         const header = document.querySelector(`th[onclick="sortTable('${currentSort.field}')"] .sort-arrow`);
         if (header) {
@@ -245,38 +270,14 @@ function updateSortArrows() {
 
 // Search applicants
 function searchApplicants() {
-    const searchTerm = document.getElementById('searchInput').value.toLowerCase();
-    applyFilters(searchTerm);
+    currentPage = 1;
+    loadApplicants();
 }
 
 // Filter applicants
 function filterApplicants() {
-    const searchTerm = document.getElementById('searchInput').value.toLowerCase();
-    applyFilters(searchTerm);
-}
-
-// Apply all filters
-function applyFilters(searchTerm = '') {
-    const stageFilter = document.getElementById('stageFilter').value;
-    const sourceFilter = document.getElementById('sourceFilter').value;
-    const jobPositionFilter = document.getElementById('jobPositionFilter').value;
-    
-    filteredData = applicantsData.filter(applicant => {
-        const matchesSearch = !searchTerm || 
-            applicant.name.toLowerCase().includes(searchTerm) ||
-            applicant.email.toLowerCase().includes(searchTerm) ||
-            (applicant.tags && applicant.tags.toLowerCase().includes(searchTerm));
-        
-        const matchesStage = !stageFilter || applicant.current_stage === stageFilter;
-        const matchesSource = !sourceFilter || applicant.source === sourceFilter;
-        const matchesJobPosition = !jobPositionFilter || (applicant.job_position && applicant.job_position.toString() === jobPositionFilter);
-        
-        return matchesSearch && matchesStage && matchesSource && matchesJobPosition;
-    });
-    
     currentPage = 1;
-    renderTable();
-    renderPagination();
+    loadApplicants();
 }
 
 // Clear filters
@@ -285,10 +286,8 @@ function clearFilters() {
     document.getElementById('stageFilter').value = '';
     document.getElementById('sourceFilter').value = '';
     document.getElementById('jobPositionFilter').value = '';
-    filteredData = [...applicantsData];
     currentPage = 1;
-    renderTable();
-    renderPagination();
+    loadApplicants();
 }
 
 // View applicant details
@@ -333,6 +332,3 @@ function hideError() {
     const errorDiv = document.getElementById('errorMessage');
     errorDiv.classList.add('hidden');
 }
-
-// Note: The DOMContentLoaded listener for search input was moved to the main DOMContentLoaded
-// to avoid re-registering if this script is somehow loaded multiple times or for cleaner organization.